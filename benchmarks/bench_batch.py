@@ -0,0 +1,73 @@
+"""
+Measures how fast the headless batch mode replays recorded days.
+
+A JSON Lines file with `--days` synthetic days (start, stops with inserts and removes,
+situation, report, end) is generated and replayed with `core.batch.run_files`.
+
+Usage:
+    python benchmarks/bench_batch.py [--days 1000] [--stops 10] [--packages 20] [--reports]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.batch import run_files  # noqa: E402
+
+
+def synthetic_day(rng: random.Random, stops: int, packages: int) -> list:
+    """
+    Returns the operations of one synthetic day.
+    """
+    operations = [{"op": "start_day", "volume": 10, "weight": 100_000}]
+    for _ in range(stops):
+        for _ in range(packages):
+            operations.append({
+                "op": "insert",
+                "weight": rng.randint(1, 150),
+                "value": round(rng.uniform(10, 500), 2),
+            })
+        operations.append({"op": "remove", "count": rng.randint(1, packages)})
+        operations.append({"op": "end_stop"})
+        operations.append({"op": "situation"})
+    operations.append({"op": "report"})
+    operations.append({"op": "end_day"})
+    return operations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--stops", type=int, default=10)
+    parser.add_argument("--packages", type=int, default=20)
+    parser.add_argument("--reports", action="store_true", help="escreve os relatórios HTML")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dias.jsonl")
+        operations = 0
+        with open(path, "w") as f:
+            for _ in range(args.days):
+                for operation in synthetic_day(rng, args.stops, args.packages):
+                    f.write(json.dumps(operation) + "\n")
+                    operations += 1
+
+        output = io.StringIO()
+        start = time.perf_counter()
+        failures = run_files([path], output, directory, write_reports=args.reports)
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.days} dias, {operations} operações em {elapsed:.2f} s "
+          f"({operations / elapsed:,.0f} operações/s, {args.days / elapsed:,.0f} dias/s, "
+          f"{failures} falhas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares the bulk ingestion API with one `insert_package`/`remove_package` call per package.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py [--size 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.store import ColumnarStore  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def per_item(truck: Truck, manifest: list) -> None:
+    for packge in manifest:
+        truck.insert_package(packge)
+    for _ in manifest:
+        truck.remove_package()
+
+
+def bulk(truck: Truck, manifest: list) -> None:
+    truck.insert_packages(manifest)
+    truck.remove_packages(len(manifest))
+
+
+def throughput(func, factory, manifest: list) -> float:
+    """
+    Returns the packages per second of inserting and then removing `manifest`.
+    """
+    truck = Truck(load_list=factory())
+    truck.start_day(100, 10 ** 9)
+    start = time.perf_counter()
+    func(truck, manifest)
+    elapsed = time.perf_counter() - start
+    truck.verify_totals()
+    return 2 * len(manifest) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    manifest = [
+        Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)) for _ in range(args.size)
+    ]
+
+    print(f"{'layout':<15} {'modo':<10} {'pacotes/s':>14}")
+    for name, factory in {"list[Packge]": list, "ColumnarStore": ColumnarStore}.items():
+        for mode, func in {"por item": per_item, "em lote": bulk}.items():
+            print(f"{name:<15} {mode:<10} {throughput(func, factory, manifest):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures how fleet report generation scales with the number of worker processes.
+
+Usage:
+    python benchmarks/bench_fleet.py [--trucks 64] [--packages 20000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.fleet import Fleet  # noqa: E402
+from core.truck import Packge  # noqa: E402
+
+
+def build_fleet(trucks: int, packages: int, seed: int = 42) -> Fleet:
+    """
+    Builds a fleet whose trucks have started the day and loaded `packages` packages each.
+    """
+    rng = random.Random(seed)
+    fleet = Fleet()
+    for number in range(trucks):
+        truck = fleet.add_truck(f"T{number:04d}")
+        truck.start_day(100, 10 ** 9)
+        truck.insert_packages(
+            Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)) for _ in range(packages))
+        truck.close_stop(packages)
+    return fleet
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trucks", type=int, default=64)
+    parser.add_argument("--packages", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    fleet = build_fleet(args.trucks, args.packages)
+    start = time.perf_counter()
+    fleet.situations()
+    print(f"situations de {args.trucks} caminhões: "
+          f"{(time.perf_counter() - start) * 1000:.3f} ms\n")
+
+    print(f"{'workers':>8} {'tempo (s)':>10} {'relatórios/s':>13} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            fleet.generate_reports(directory, workers=workers)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {args.trucks / elapsed:>13.1f} "
+              f"{baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
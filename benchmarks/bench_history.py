@@ -0,0 +1,94 @@
+"""
+Measures the SQLite history store at one year of data for a fleet.
+
+Each simulated day writes every truck of the fleet in one `record_days` transaction. The bulk
+insert rate is reported, followed by the latency of the analytics queries.
+
+Usage:
+    python benchmarks/bench_history.py [--trucks 200] [--days 365] [--packages 20] [--stops 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.history import HistoryStore  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def sample_trucks(count: int, packages: int, stops: int, seed: int = 42) -> list:
+    """
+    Builds `count` finished truck days used as the data of the simulated fleet.
+    """
+    rng = random.Random(seed)
+    trucks = []
+    for _ in range(count):
+        truck = Truck()
+        truck.start_day(rng.randint(5, 20), 5000)
+        truck.insert_packages(
+            Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)) for _ in range(packages))
+        for _ in range(stops):
+            truck.close_stop(rng.randint(0, packages))
+        truck.finish_day()
+        trucks.append(truck)
+    return trucks
+
+
+def timed(func, *args, repeat: int = 5) -> float:
+    """
+    Returns the best time, in milliseconds, of `func(*args)`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trucks", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--packages", type=int, default=20)
+    parser.add_argument("--stops", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = sample_trucks(97, args.packages, args.stops)
+    truck_ids = [f"T{number:03d}" for number in range(args.trucks)]
+    first_day = date(2025, 1, 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = HistoryStore(os.path.join(directory, "historico.db"))
+        start = time.perf_counter()
+        for offset in range(args.days):
+            day = first_day + timedelta(days=offset)
+            history.record_days(
+                (truck_id, samples[(offset + number) % len(samples)], day)
+                for number, truck_id in enumerate(truck_ids)
+            )
+        elapsed = time.perf_counter() - start
+        rows = args.days * args.trucks * (1 + args.packages + args.stops)
+        print(f"{args.days * args.trucks:,} dias de caminhão ({rows:,} linhas) em {elapsed:.1f} s "
+              f"({rows / elapsed:,.0f} linhas/s)")
+
+        queries = {
+            "peso semanal da frota": (history.weekly_weight_totals,),
+            "peso semanal de um caminhão": (history.weekly_weight_totals, truck_ids[0]),
+            "média por parada da frota": (history.stop_averages,),
+            "média por parada de um caminhão": (history.stop_averages, truck_ids[0]),
+            "10 cargas mais pesadas": (history.heaviest_loads, 10),
+        }
+        print(f"\n{'consulta':<34} {'latência (ms)':>14}")
+        for label, (query, *query_args) in queries.items():
+            print(f"{label:<34} {timed(query, *query_args):>14.2f}")
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measures journal append throughput and recovery time.
+
+A journaled truck receives `--events` mutations (mostly package inserts, with removals and
+stop closes mixed in). The append rate is reported for several fsync batch sizes, then the
+truck is recovered from the journal alone and from a mid-way snapshot plus journal.
+
+Usage:
+    python benchmarks/bench_journal.py [--events 1000000] [--sync-every 10 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.journal import Journal, recover, truck_state  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def journaled_day(path: str, events: int, sync_every: int, snapshot_every=None) -> Truck:
+    """
+    Applies `events` journaled mutations to a new truck and returns it.
+    """
+    rng = random.Random(42)
+    journal = Journal(path, sync_every=sync_every, snapshot_every=snapshot_every)
+    truck = journal.attach(Truck())
+    truck.start_day(100, 10 ** 9)
+    at_stop = 0
+    for event in range(events - 1):
+        if event % 100 == 99:
+            truck.close_stop(at_stop)
+            at_stop = 0
+        elif event % 10 == 9:
+            truck.remove_package()
+        else:
+            truck.insert_package(Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)))
+            at_stop += 1
+    journal.close()
+    return truck
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--sync-every", type=int, nargs="+", default=[10, 1000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'fsync a cada':>13} {'eventos/s':>12}")
+        for sync_every in args.sync_every:
+            path = os.path.join(directory, f"sync{sync_every}.journal")
+            start = time.perf_counter()
+            truck = journaled_day(path, args.events, sync_every)
+            elapsed = time.perf_counter() - start
+            print(f"{sync_every:>13} {args.events / elapsed:>12,.0f}")
+
+        size = os.path.getsize(path) / 1024 / 1024
+        start = time.perf_counter()
+        recovered = recover(path, attach=False)
+        elapsed = time.perf_counter() - start
+        assert truck_state(recovered) == truck_state(truck)
+        print(f"\nrecuperação de {args.events:,} eventos ({size:.1f} MiB): {elapsed:.2f} s")
+
+        path = os.path.join(directory, "snapshot.journal")
+        truck = journaled_day(path, args.events, args.sync_every[-1], args.events // 2)
+        start = time.perf_counter()
+        recovered = recover(path, attach=False)
+        elapsed = time.perf_counter() - start
+        assert truck_state(recovered) == truck_state(truck)
+        print(f"recuperação com snapshot a cada {args.events // 2:,} eventos: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measures the time and peak memory of loading a truck day from a manifest, a CSV or a JSON file.
+
+The same packages are written in the three formats. Each load runs in a fresh interpreter and
+rebuilds a `Truck` with its running totals and indexes: the CSV and JSON loaders parse every
+record into a shared `Packge`, while the binary manifest is memory-mapped and no package is
+created. The peak resident set size includes the interpreter (about 10 MiB).
+
+Usage:
+    python benchmarks/bench_manifest.py [--records 10000000]
+"""
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.manifest import load_manifest, write_manifest  # noqa: E402
+from core.truck import Truck, packge_cache  # noqa: E402
+from manifests import manifest_rows  # noqa: E402
+
+VOLUME = 10
+MAX_WEIGHT = 10 ** 12
+CHUNK = 100_000
+
+
+def write_files(directory: str, records: int) -> dict:
+    """
+    Writes the same packages as a manifest, a CSV and a JSON file and returns their paths.
+    """
+    weights = array("i")
+    values = array("d")
+    for weight, value in manifest_rows(records):
+        weights.append(weight)
+        values.append(value)
+    paths = {
+        "manifest": os.path.join(directory, "dia.manifest"),
+        "csv": os.path.join(directory, "dia.csv"),
+        "json": os.path.join(directory, "dia.json"),
+    }
+    write_manifest(paths["manifest"], weights, values, VOLUME, MAX_WEIGHT, True)
+    with open(paths["csv"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("weight", "value"))
+        writer.writerows(zip(weights, values))
+    with open(paths["json"], "w") as f:
+        f.write(f'{{"volume": {VOLUME}, "max_weight": {MAX_WEIGHT}, "packages": [')
+        for start in range(0, records, CHUNK):
+            if start:
+                f.write(", ")
+            chunk = zip(weights[start:start + CHUNK], values[start:start + CHUNK])
+            f.write(", ".join(f"[{weight}, {value!r}]" for weight, value in chunk))
+        f.write("]}")
+    return paths
+
+
+def truck_with(packges: list, volume: int, max_weight: int) -> Truck:
+    truck = Truck(
+        max_weight_setted=max_weight, volume=volume, current_day=True, load_list=packges)
+    truck.current_capacity = truck.total_weight
+    return truck
+
+
+def load_csv(path: str) -> Truck:
+    get = packge_cache.get
+    with open(path, newline="") as f:
+        rows = csv.reader(f)
+        next(rows)
+        packges = [get(int(weight), float(value)) for weight, value in rows]
+    return truck_with(packges, VOLUME, MAX_WEIGHT)
+
+
+def load_json(path: str) -> Truck:
+    get = packge_cache.get
+    with open(path) as f:
+        day = json.load(f)
+    packges = [get(weight, value) for weight, value in day["packages"]]
+    return truck_with(packges, day["volume"], day["max_weight"])
+
+
+LOADERS = {"manifest": load_manifest, "csv": load_csv, "json": load_json}
+
+
+def load(format: str, path: str) -> None:
+    """
+    Loads one file in this interpreter and prints the elapsed time and the peak RSS in KiB.
+    """
+    start = time.perf_counter()
+    truck = LOADERS[format](path)
+    elapsed = time.perf_counter() - start
+    truck.verify_totals()
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=10_000_000)
+    parser.add_argument("--load", nargs=2, metavar=("FORMATO", "ARQUIVO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.load:
+        load(*args.load)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, args.records)
+        print(f"{args.records:,} pacotes")
+        print(f"{'formato':>9} {'arquivo (MiB)':>14} {'carga (s)':>10} {'pico RSS (MiB)':>15}")
+        for format, path in paths.items():
+            output = subprocess.run(
+                [sys.executable, __file__, "--load", format, path],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            elapsed, rss = float(output[0]), int(output[1]) / 1024
+            size = os.path.getsize(path) / 2 ** 20
+            print(f"{format:>9} {size:>14.1f} {elapsed:>10.2f} {rss:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
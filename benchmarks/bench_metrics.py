@@ -0,0 +1,60 @@
+"""
+Measures the overhead of the instrumentation decorator on `Truck.situation` and
+`Truck.insert_package`.
+
+Each operation is timed with the metrics registry disabled and enabled, next to the same
+operation called through `__wrapped__`, without the instrumentation layer.
+
+Usage:
+    python benchmarks/bench_metrics.py [--repeat 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.metrics import metrics  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def per_call(call, repeat: int) -> float:
+    """
+    Returns the mean latency of `call()`, in nanoseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200_000)
+    args = parser.parse_args()
+
+    truck = Truck()
+    truck.start_day(100, 10 ** 12)
+    packge = Packge(10, 100.0)
+    situation = Truck.situation.fget
+    insert_package = Truck.insert_package
+    operations = [
+        ("situation", lambda: situation(truck), lambda: situation.__wrapped__(truck)),
+        ("insert_package", lambda: insert_package(truck, packge),
+         lambda: insert_package.__wrapped__(truck, packge)),
+    ]
+    print(f"{'operação':>16} {'sem camada (ns)':>16} {'desligado (ns)':>15} {'ligado (ns)':>12}")
+    for name, call, bare in operations:
+        metrics.disable()
+        bare_latency = per_call(bare, args.repeat)
+        disabled_latency = per_call(call, args.repeat)
+        metrics.enable()
+        enabled_latency = per_call(call, args.repeat)
+        metrics.disable()
+        print(f"{name:>16} {bare_latency:>16.0f} {disabled_latency:>15.0f} "
+              f"{enabled_latency:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
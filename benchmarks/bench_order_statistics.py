@@ -0,0 +1,81 @@
+"""
+Compares the streaming order-statistics indexes with scanning `load_list`.
+
+For each load size it times the report statistics (smallest/largest weight, largest transport
+cost and p50/p95/p99 weight) read from `Truck.weight_index` and `Truck.transport_cost_index`
+against `min`/`max` over the list plus a full sort for the percentiles.
+
+Usage:
+    python benchmarks/bench_order_statistics.py [--sizes 1000 100000 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from math import ceil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def scan_statistics(truck: Truck) -> tuple:
+    """
+    Computes the report statistics by scanning and sorting `load_list`.
+    """
+    weights = sorted(packge.weight for packge in truck.load_list)
+    percentiles = tuple(
+        weights[max(1, ceil(p / 100 * len(weights))) - 1] for p in (50, 95, 99))
+    return (
+        min(packge.weight for packge in truck.load_list),
+        max(packge.weight for packge in truck.load_list),
+        max(packge.transport_cost for packge in truck.load_list),
+    ) + percentiles
+
+
+def index_statistics(truck: Truck) -> tuple:
+    """
+    Reads the report statistics from the truck indexes.
+    """
+    return (
+        truck.weight_index.min,
+        truck.weight_index.max,
+        truck.transport_cost_index.max,
+        truck.weight_index.percentile(50),
+        truck.weight_index.percentile(95),
+        truck.weight_index.percentile(99),
+    )
+
+
+def best_time(func, truck: Truck, repeat: int = 3) -> float:
+    """
+    Returns the best time, in milliseconds, of `func(truck)`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(truck)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'pacotes':>10} {'scan (ms)':>12} {'índice (ms)':>12}")
+    for size in args.sizes:
+        truck = Truck()
+        truck.start_day(100, 10 ** 9)
+        for _ in range(size):
+            truck.insert_package(Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)))
+        assert scan_statistics(truck) == index_statistics(truck)
+        print(f"{size:>10} {best_time(scan_statistics, truck):>12.3f} "
+              f"{best_time(index_statistics, truck):>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
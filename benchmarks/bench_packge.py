@@ -0,0 +1,88 @@
+"""
+Measures the memory held per package by a large load.
+
+A load of packages drawn from a handful of standard weights and values is built three ways:
+with a dict-backed dataclass (the previous `Packge`), with the slotted `Packge` and with shared
+packages from `PackgeCache`. The bytes per package are measured with `tracemalloc` and include
+the load list itself. The cost of reading `Truck.packages` is reported as well.
+
+Usage:
+    python benchmarks/bench_packge.py [--packages 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import Packge, PackgeCache, Truck  # noqa: E402
+
+
+@dataclass
+class DictPackge:
+    """
+    A package with a per-instance `__dict__`, like `Packge` before it was slotted.
+    """
+
+    weight: int
+    value: float
+
+
+def bytes_per_package(build, rows: list) -> float:
+    """
+    Returns the memory allocated by `build(rows)` divided by the number of rows.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    load = build(rows)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del load
+    return allocated / len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    weights = [1, 2, 5, 10, 20, 30]
+    values = [25.0, 50.0, 100.0, 250.0]
+    rows = [(rng.choice(weights), rng.choice(values)) for _ in range(args.packages)]
+
+    builders = [
+        ("dataclass", lambda rows: [DictPackge(weight, value) for weight, value in rows]),
+        ("slots", lambda rows: [Packge(weight, value) for weight, value in rows]),
+        ("compartilhado", cached),
+    ]
+    print(f"{args.packages} pacotes")
+    print(f"{'pacote':>14} {'bytes/pacote':>14}")
+    for name, build in builders:
+        print(f"{name:>14} {bytes_per_package(build, rows):>14.1f}")
+
+    truck = Truck()
+    truck.start_day(100, 10 ** 9)
+    truck.insert_packages(Packge(weight, value) for weight, value in rows)
+    start = time.perf_counter()
+    packages = truck.packages
+    print(f"leitura de Truck.packages: {(time.perf_counter() - start) * 1_000_000:.1f}us")
+    start = time.perf_counter()
+    labels = list(packages)
+    print(f"{len(labels)} rótulos formatados em {time.perf_counter() - start:.3f}s")
+
+
+def cached(rows: list) -> list:
+    """
+    Builds the load with one shared package per distinct weight/value pair.
+    """
+    cache = PackgeCache()
+    return [cache.get(weight, value) for weight, value in rows]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures the latency of the package selection solver as the manifest grows.
+
+For each manifest size the remaining capacity is set to a fraction of the total weight, and
+the solver is run with a fixed time budget. The value of the chosen subset is compared with
+the plain greedy-by-density fill and with the fractional upper bound.
+
+Usage:
+    python benchmarks/bench_packing.py [--sizes 100 1000 5000 20000] [--budget 0.05]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.packing import select_packages  # noqa: E402
+from core.truck import Packge  # noqa: E402
+
+
+def greedy_value(candidates: list, capacity: int) -> float:
+    """
+    Returns the value of the greedy fill by value per kg.
+    """
+    value = 0.0
+    for packge in sorted(candidates, key=lambda p: p.value / p.weight, reverse=True):
+        if packge.weight <= capacity:
+            capacity -= packge.weight
+            value += packge.value
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--budget", type=float, default=0.05)
+    parser.add_argument("--fill", type=float, default=0.3, help="capacidade / peso total")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'pacotes':>8} {'latência (ms)':>14} {'valor':>12} {'guloso':>12}")
+    for size in args.sizes:
+        candidates = [
+            Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)) for _ in range(size)]
+        capacity = int(sum(packge.weight for packge in candidates) * args.fill)
+        start = time.perf_counter()
+        chosen = select_packages(candidates, capacity, args.budget)
+        elapsed = (time.perf_counter() - start) * 1000
+        assert sum(candidates[index].weight for index in chosen) <= capacity
+        value = sum(candidates[index].value for index in chosen)
+        print(f"{size:>8} {elapsed:>14.2f} {value:>12.2f} "
+              f"{greedy_value(candidates, capacity):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
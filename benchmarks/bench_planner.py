@@ -0,0 +1,70 @@
+"""
+Measures the quality and runtime of the fleet planner on a large manifest.
+
+A random manifest is distributed across a fleet of trucks with random volumes and capacities,
+first with first-fit decreasing alone and then with the local-search improver. For each plan
+the number of trucks used, the insurance surcharge and the unassigned packages are reported,
+along with the lower bound on the number of trucks given by the total weight.
+
+Usage:
+    python benchmarks/bench_planner.py [--packages 100000] [--trucks 500] [--workers 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.planner import FleetPlanner  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def lower_bound(total_weight: int, capacities: list) -> int:
+    """
+    Returns the fewest trucks whose capacities add up to `total_weight`.
+    """
+    count = 0
+    for capacity in sorted(capacities, reverse=True):
+        if total_weight <= 0:
+            break
+        total_weight -= capacity
+        count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=100_000)
+    parser.add_argument("--trucks", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    packges = [
+        Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)) for _ in range(args.packages)]
+    trucks = [
+        Truck(max_weight_setted=rng.randint(4000, 12000), volume=rng.randint(2, 8))
+        for _ in range(args.trucks)]
+    total_weight = sum(packge.weight for packge in packges)
+    bound = lower_bound(total_weight, [truck.max_weight_setted for truck in trucks])
+    print(f"{args.packages} pacotes, {args.trucks} caminhões, mínimo de {bound} caminhões")
+
+    print(f"{'planejador':>12} {'tempo (s)':>10} {'caminhões':>10} {'seguro':>12} {'sobras':>8}")
+    planners = [
+        ("ffd", FleetPlanner()),
+        ("busca local", FleetPlanner(improve=True, workers=args.workers,
+                                     time_budget=args.budget)),
+    ]
+    for name, planner in planners:
+        start = time.perf_counter()
+        plan = planner.plan(packges, trucks)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12} {elapsed:>10.2f} {plan.trucks_used:>10} "
+              f"{plan.insurance_cost:>12.2f} {len(plan.unassigned):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares batch pricing with the scalar `Packge` properties.
+
+For each manifest size it prices the packages one at a time through `Packge.transport_cost`
+and `Packge.extra_insurance_cost`, with the pure-Python batch fallback and, when installed,
+with NumPy. The batch results are checked against the scalar formulas first.
+
+Usage:
+    python benchmarks/bench_pricing.py [--max-exponent 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core import pricing  # noqa: E402
+from core.truck import Packge  # noqa: E402
+
+TRUCK_VOLUME = 4
+
+
+def scalar(weights, values) -> None:
+    for weight, value in zip(weights, values):
+        packge = Packge(weight, value)
+        packge.transport_cost
+        packge.extra_insurance_cost(TRUCK_VOLUME)
+
+
+def elapsed(func, *args) -> float:
+    """
+    Returns the time, in milliseconds, of `func(*args)`.
+    """
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def check(weights, values) -> None:
+    """
+    Checks that every batch implementation matches the scalar formulas exactly.
+    """
+    expected_transport = [Packge(w, v).transport_cost for w, v in zip(weights, values)]
+    expected_insurance = [
+        Packge(w, v).extra_insurance_cost(TRUCK_VOLUME) for w, v in zip(weights, values)]
+    for use_numpy in (False, True) if pricing.np is not None else (False,):
+        result = pricing.price_packages(weights, values, TRUCK_VOLUME, use_numpy)
+        assert list(result.transport_cost) == expected_transport
+        assert list(result.insurance_cost) == expected_insurance
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-exponent", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'pacotes':>10} {'escalar (ms)':>13} {'python (ms)':>13} {'numpy (ms)':>13}")
+    for exponent in range(3, args.max_exponent + 1):
+        size = 10 ** exponent
+        weights = array("i", (rng.randint(1, 80) for _ in range(size)))
+        values = array("d", (round(rng.uniform(10, 500), 2) for _ in range(size)))
+        if exponent <= 5:
+            check(weights, values)
+        row = [
+            elapsed(scalar, weights, values),
+            elapsed(pricing.price_packages, weights, values, TRUCK_VOLUME, False),
+        ]
+        if pricing.np is not None:
+            row.append(elapsed(pricing.price_packages, weights, values, TRUCK_VOLUME, True))
+        cells = " ".join(f"{value:>13.1f}" for value in row)
+        print(f"{size:>10} {cells}{'' if pricing.np is not None else '   (sem numpy)'}")
+
+
+if __name__ == "__main__":
+    main()
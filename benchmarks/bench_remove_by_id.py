@@ -0,0 +1,116 @@
+"""
+Measures a mixed workload of loads, removals by ID and lookups by ID on a large load.
+
+The truck starts with `--initial` packages. Each operation then loads a package, unloads a
+random package still in the truck or looks one up, so any parcel can leave at any stop. The
+`Truck` slot index (swap-remove) is compared with a naive load kept in order, where a removal
+scans the list of IDs (`list.index`) and shifts the tail; the naive load is only run over
+`--naive-operations` operations, as each of its removals costs O(n).
+
+Usage:
+    python benchmarks/bench_remove_by_id.py [--operations 1000000] [--initial 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import PACKAGE_NOT_FOUND_MESSAGE, Truck, packge_cache  # noqa: E402
+from manifests import manifest_rows  # noqa: E402
+
+SHARES = (("insert", 0.5), ("remove", 0.4), ("find", 0.1))
+
+
+def workload(operations: int, initial: int, seed: int = 42):
+    """
+    Yields ("insert", packge), ("remove", id) or ("find", id) operations on IDs that are
+    loaded at that point, starting after `initial` loaded packages.
+    """
+    rng = random.Random(seed)
+    rows = manifest_rows(operations + initial, seed)
+    live = list(range(1, initial + 1))
+    next_id = initial + 1
+    kinds = [kind for kind, _ in SHARES]
+    weights = [share for _, share in SHARES]
+    for _ in range(operations):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "insert" or not live:
+            yield "insert", packge_cache.get(*next(rows))
+            live.append(next_id)
+            next_id += 1
+            continue
+        index = rng.randrange(len(live))
+        packge_id = live[index]
+        if kind == "remove":
+            live[index] = live[-1]
+            live.pop()
+        yield kind, packge_id
+
+
+def loaded_truck(initial: int) -> Truck:
+    truck = Truck()
+    truck.start_day(10, 10 ** 12)
+    truck.insert_packages(packge_cache.get(*row) for row in manifest_rows(initial, 7))
+    return truck
+
+
+def run_truck(operations: list, initial: int) -> float:
+    truck = loaded_truck(initial)
+    start = time.perf_counter()
+    for kind, payload in operations:
+        if kind == "insert":
+            truck.insert_package(payload)
+        elif kind == "remove":
+            assert truck.remove_package_by_id(payload) != PACKAGE_NOT_FOUND_MESSAGE
+        else:
+            assert truck.find_package(payload) is not None
+    elapsed = time.perf_counter() - start
+    truck.verify_totals()
+    return elapsed
+
+
+def run_naive(operations: list, initial: int) -> float:
+    """
+    Applies the workload to a load kept in order, with the IDs in a parallel list.
+    """
+    load = [packge_cache.get(*row) for row in manifest_rows(initial, 7)]
+    ids = list(range(1, initial + 1))
+    next_id = initial + 1
+    total_weight = sum(packge.weight for packge in load)
+    start = time.perf_counter()
+    for kind, payload in operations:
+        if kind == "insert":
+            load.append(payload)
+            ids.append(next_id)
+            next_id += 1
+            total_weight += payload.weight
+        elif kind == "remove":
+            index = ids.index(payload)
+            del ids[index]
+            total_weight -= load.pop(index).weight
+        else:
+            load[ids.index(payload)]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--initial", type=int, default=100_000)
+    parser.add_argument("--naive-operations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{args.initial:,} pacotes iniciais, 50% cargas, 40% remoções e 10% buscas por ID")
+    print(f"{'carga':>16} {'operações':>10} {'tempo (s)':>10} {'por operação (us)':>18}")
+    cases = (("lista ordenada", run_naive, args.naive_operations),
+             ("Truck (índice)", run_truck, args.operations))
+    for name, run, operations in cases:
+        elapsed = run(list(workload(operations, args.initial)), args.initial)
+        print(f"{name:>16} {operations:>10,} {elapsed:>10.2f} {elapsed / operations * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
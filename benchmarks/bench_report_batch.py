@@ -0,0 +1,75 @@
+"""
+Measures month-end report rendering throughput as the worker count changes.
+
+A month of archived days is written as truck journals, then every report is rendered with
+`core.report_batch.render_days` in process and thread pools of increasing size. The mean
+per-report latency (loading the journal and writing the report) and the total throughput are
+reported for each configuration.
+
+Usage:
+    python benchmarks/bench_report_batch.py [--days 200] [--packages 5000] [--max-workers 8]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.journal import Journal  # noqa: E402
+from core.report_batch import render_days  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def write_days(directory: str, days: int, packages: int) -> list:
+    """
+    Writes `days` truck journals with random loads and returns their paths.
+    """
+    rng = random.Random(42)
+    paths = []
+    for day in range(1, days + 1):
+        path = os.path.join(directory, f"dia_{day:03d}.journal")
+        journal = Journal(path, sync_every=10 ** 9)
+        truck = journal.attach(Truck())
+        truck.start_day(rng.randint(2, 8), 10 ** 9)
+        for _ in range(10):
+            truck.begin_stop()
+            truck.insert_packages(
+                Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2))
+                for _ in range(packages // 10))
+            truck.close_stop()
+        journal.snapshot()
+        journal.close()
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--packages", type=int, default=5000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    paths = write_days(directory, args.days, args.packages)
+    output_dir = os.path.join(directory, "relatorios")
+    os.makedirs(output_dir)
+
+    print(f"{args.days} dias de {args.packages} pacotes")
+    print(f"{'pool':>8} {'workers':>8} {'latência (ms)':>14} {'relatórios/s':>13}")
+    workers = 1
+    while workers <= args.max_workers:
+        for pool, threads in (("process", False), ("thread", True)):
+            start = time.perf_counter()
+            reports = list(render_days(paths, output_dir, workers, threads))
+            elapsed = time.perf_counter() - start
+            latency = sum(report.seconds for report in reports) / len(reports) * 1000
+            print(f"{pool:>8} {workers:>8} {latency:>14.1f} {len(reports) / elapsed:>13.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
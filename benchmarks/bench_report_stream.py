@@ -0,0 +1,85 @@
+"""
+Measures the peak memory and time of writing a report for a very large load.
+
+The previous writer, which formats the chart series with `str(list)` and writes the whole
+document at once, is compared with the streaming writer in HTML, CSV and JSON Lines, and with
+the chart series downsampled. Peak memory is measured with `tracemalloc` and does not include
+the snapshot itself.
+
+Usage:
+    python benchmarks/bench_report_stream.py [--packages 500000] [--max-points 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.report import REPORT_TEMPLATE, render_stop_rows, write_report  # noqa: E402
+from core.template import load_template  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def write_whole_report(snapshot, path: str) -> str:
+    """
+    Writes the report the way it was written before streaming: one string, one write.
+    """
+    parameters = dict(snapshot.parameters)
+    parameters["labels"] = snapshot.labels.tolist()
+    parameters["data"] = snapshot.data.tolist()
+    parameters["stop_rows"] = render_stop_rows(snapshot.stops)
+    html = load_template(REPORT_TEMPLATE).render(parameters)
+    with open(path, "w") as f:
+        f.write(html)
+    return path
+
+
+def measure(write, *args, **kwargs):
+    """
+    Returns the time, in seconds, and the peak traced memory, in MiB, of one call.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    path = write(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(path) / 2 ** 20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=500_000)
+    parser.add_argument("--max-points", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    truck = Truck()
+    truck.start_day(100, 10 ** 9)
+    truck.insert_packages(
+        Packge(rng.randint(1, 60), rng.uniform(10, 500)) for _ in range(args.packages))
+    snapshot = truck.report_snapshot()
+    load_template(REPORT_TEMPLATE)
+
+    directory = tempfile.mkdtemp()
+    cases = [
+        ("anterior", write_whole_report, (os.path.join(directory, "anterior.html"),), {}),
+        ("html", write_report, (os.path.join(directory, "r.html"),), {}),
+        ("csv", write_report, (os.path.join(directory, "r.csv"),), {}),
+        ("jsonl", write_report, (os.path.join(directory, "r.jsonl"),), {}),
+        ("html reduzido", write_report, (os.path.join(directory, "reduzido.html"),),
+         {"max_points": args.max_points}),
+    ]
+    print(f"{args.packages} pacotes")
+    print(f"{'escritor':>14} {'tempo (s)':>10} {'pico (MiB)':>11} {'arquivo (MiB)':>14}")
+    for name, write, write_args, write_kwargs in cases:
+        elapsed, peak, size = measure(write, snapshot, *write_args, **write_kwargs)
+        print(f"{name:>14} {elapsed:>10.3f} {peak:>11.1f} {size:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
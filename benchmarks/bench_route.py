@@ -0,0 +1,74 @@
+"""
+Measures the time and the route length of `plan_route` on random stops.
+
+For each number of stops it plans a closed route from the depot with the pure-Python distance
+matrix and, when installed, with NumPy, and compares the length with the nearest-neighbour route
+the search starts from. Every plan is checked to visit each stop exactly once, and the last size
+is also loaded into a truck with `load_route` to check that each stop unloads its own packages.
+
+Usage:
+    python benchmarks/bench_route.py [--stops 250 500 1000 2000] [--time-budget 0.25]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core import route  # noqa: E402
+from core.truck import Truck, packge_cache  # noqa: E402
+
+AREA = 100.0
+
+
+def check_unloading(stops: int, plan: route.RoutePlan, rng: random.Random) -> None:
+    """
+    Loads a few packages per stop with `load_route` and checks that every stop of the route
+    unloads exactly its own packages.
+    """
+    packages_by_stop = [
+        [packge_cache.get(rng.randint(1, 30), float(stop)) for _ in range(rng.randint(1, 4))]
+        for stop in range(stops)
+    ]
+    truck = Truck()
+    truck.start_day(10, 10 ** 9)
+    route.load_route(truck, plan, packages_by_stop)
+    for stop in plan.order:
+        expected = packages_by_stop[stop]
+        unloaded = truck.load_list[-len(expected):]
+        assert [packge.value for packge in unloaded] == [float(stop)] * len(expected)
+        truck.remove_packages(len(expected))
+    assert not truck.load_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stops", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--time-budget", type=float, default=0.25)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    modes = (False, True) if route.np is not None else (False,)
+    print(f"{'paradas':>8} {'modo':>7} {'vizinho (km)':>13} {'rota (km)':>10} "
+          f"{'ganho (%)':>10} {'tempo (s)':>10}")
+    for stops in args.stops:
+        locations = [(rng.uniform(0, AREA), rng.uniform(0, AREA)) for _ in range(stops)]
+        for use_numpy in modes:
+            start = time.perf_counter()
+            plan = route.plan_route(
+                locations, (AREA / 2, AREA / 2), args.time_budget, use_numpy=use_numpy)
+            elapsed = time.perf_counter() - start
+            assert sorted(plan.order) == list(range(stops))
+            gain = 100 * (1 - plan.distance / plan.initial_distance)
+            print(f"{stops:>8} {'numpy' if use_numpy else 'python':>7} "
+                  f"{plan.initial_distance:>13.1f} {plan.distance:>10.1f} "
+                  f"{gain:>10.1f} {elapsed:>10.3f}")
+    check_unloading(stops, plan, rng)
+    if route.np is None:
+        print("(sem numpy)")
+
+
+if __name__ == "__main__":
+    main()
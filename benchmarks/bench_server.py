@@ -0,0 +1,111 @@
+"""
+Load-tests the depot server with many simulated scanners on localhost.
+
+The server is started in a separate process (`python src/main.py --serve`). Each scanner opens
+its own connection, starts the day of its truck and then sends inserts with a status check
+after every stop. Requests/sec and latency percentiles are reported.
+
+Usage:
+    python benchmarks/bench_server.py [--scanners 300] [--trucks 100] [--requests 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int, timeout: float = 10) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def scanner(port: int, number: int, trucks: int, requests: int, latencies: list) -> None:
+    """
+    Simulates one scanner sending `requests` requests for its truck.
+    """
+    rng = random.Random(number)
+    truck = f"T{number % trucks:03d}"
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for index in range(requests):
+        if index == 0:
+            request = {"op": "start_day", "volume": 10, "weight": 100_000}
+        elif index % 10 == 0:
+            request = {"op": "end_stop"}
+        elif index % 10 == 5:
+            request = {"op": "situation"}
+        else:
+            request = {"op": "insert", "weight": rng.randint(1, 60),
+                       "value": round(rng.uniform(10, 500), 2)}
+        request.update(id=index, truck=truck)
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load_test(port: int, scanners: int, trucks: int, requests: int) -> tuple:
+    latencies: list = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        scanner(port, number, trucks, requests, latencies) for number in range(scanners)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def percentile(values: list, percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scanners", type=int, default=300)
+    parser.add_argument("--trucks", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(SRC, "main.py"), "--serve", f"127.0.0.1:{port}",
+             "--report-dir", directory])
+        try:
+            asyncio.run(wait_for_server(port))
+            elapsed, latencies = asyncio.run(
+                load_test(port, args.scanners, args.trucks, args.requests))
+        finally:
+            server.terminate()
+            server.wait()
+
+    total = len(latencies)
+    print(f"{args.scanners} scanners, {args.trucks} caminhões, {total:,} requisições "
+          f"em {elapsed:.2f} s")
+    print(f"requisições/s: {total / elapsed:,.0f}")
+    for percent in (50, 95, 99):
+        print(f"p{percent}: {percentile(latencies, percent) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
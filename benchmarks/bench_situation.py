@@ -0,0 +1,52 @@
+"""
+Measures `Truck.situation` latency as the load grows.
+
+With the running aggregates the status latency should stay flat from 10^2 to 10^6
+packages. The `--check` flag enables `check_consistency` to show the cost of the
+from-scratch verification mode.
+
+Usage:
+    python benchmarks/bench_situation.py [--max-exponent 6] [--check]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def situation_latency(truck: Truck, repeat: int = 1000) -> float:
+    """
+    Returns the mean latency, in microseconds, of reading `truck.situation`.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        truck.situation
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-exponent", type=int, default=6)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    truck = Truck(check_consistency=args.check)
+    truck.start_day(100, 10 ** 9)
+    repeat = 10 if args.check else 1000
+
+    print(f"{'pacotes':>10} {'situation (µs)':>16}")
+    for exponent in range(2, args.max_exponent + 1):
+        while len(truck.load_list) < 10 ** exponent:
+            truck.insert_package(Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)))
+        print(f"{10 ** exponent:>10} {situation_latency(truck, repeat):>16.2f}")
+    truck.verify_totals()
+
+
+if __name__ == "__main__":
+    main()
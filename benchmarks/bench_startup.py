@@ -0,0 +1,59 @@
+"""
+Measures the import time of the main entry point against a startup budget.
+
+`python -X importtime -c "import main"` is run several times in fresh interpreters; the median
+cumulative import time of `main` and of the slowest modules it pulls in are reported. The
+script exits with status 1 when the median exceeds `--budget-ms`, so it can gate a release.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 15] [--budget-ms 35] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def import_times() -> dict:
+    """
+    Returns the cumulative import time, in microseconds, of every module imported by `main`.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC, capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=35.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    modules = set().union(*runs)
+    medians = {
+        module: statistics.median(run.get(module, 0) for run in runs) for module in modules}
+    total = medians["main"] / 1000
+
+    print(f"{'módulo':>24} {'acumulado (ms)':>15}")
+    for module in sorted(medians, key=medians.get, reverse=True)[:args.top]:
+        print(f"{module:>24} {medians[module] / 1000:>15.2f}")
+    print(f"importação de main: {total:.2f}ms (orçamento {args.budget_ms:.2f}ms)")
+    if total > args.budget_ms:
+        print("[!] Orçamento de inicialização excedido")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
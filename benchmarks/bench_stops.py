@@ -0,0 +1,63 @@
+"""
+Measures the memory and query cost of the per-stop records on a day with many stops.
+
+A day with thousands of stops is simulated, each loading a few packages and sometimes
+unloading some. The memory held by the `Stop` records and the latency of reading the packages
+of one stop are reported; the query latency should not grow with the number of stops.
+
+Usage:
+    python benchmarks/bench_stops.py [--stops 10000] [--per-stop 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def stop_memory(truck: Truck) -> int:
+    """
+    Returns the bytes held by the stop records and their ID columns.
+    """
+    return sum(
+        sys.getsizeof(stop) + sys.getsizeof(stop.added) + sys.getsizeof(stop.removed)
+        for stop in truck.stop_records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stops", type=int, default=10_000)
+    parser.add_argument("--per-stop", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    truck = Truck()
+    truck.start_day(100, 10 ** 9)
+    print(f"{'paradas':>10} {'memória (KiB)':>14} {'consulta (us)':>14}")
+    checkpoint = 10
+    start = time.perf_counter()
+    for index in range(1, args.stops + 1):
+        truck.begin_stop()
+        truck.insert_packages(
+            Packge(rng.randint(1, 60), rng.uniform(10, 500)) for _ in range(args.per_stop))
+        if rng.random() < 0.3:
+            truck.remove_packages(rng.randint(1, args.per_stop // 2))
+        truck.close_stop()
+        if index == checkpoint or index == args.stops:
+            queried = [rng.randint(1, index) for _ in range(args.repeat)]
+            query_start = time.perf_counter()
+            for number in queried:
+                truck.stop_packages(number)
+            latency = (time.perf_counter() - query_start) / args.repeat * 1_000_000
+            print(f"{index:>10} {stop_memory(truck) / 1024:>14.1f} {latency:>14.2f}")
+            checkpoint *= 10
+    print(f"tempo total: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
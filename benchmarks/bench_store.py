@@ -0,0 +1,76 @@
+"""
+Compares the default list-of-dataclasses `load_list` with the `ColumnarStore`.
+
+For each load size it reports the memory used per package (measured with `tracemalloc`)
+and the latency of the aggregates used by `Truck.situation` and `Truck.generate_report`.
+
+Usage:
+    python benchmarks/bench_store.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.store import ColumnarStore  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def build_truck(load_list, size: int, seed: int = 42) -> Truck:
+    """
+    Builds a started truck and loads `size` random packages into `load_list`.
+    """
+    rng = random.Random(seed)
+    truck = Truck(load_list=load_list)
+    truck.start_day(100, 10 ** 9)
+    for _ in range(size):
+        truck.insert_package(Packge(rng.randint(1, 60), round(rng.uniform(10, 500), 2)))
+    truck.close_stop(size)
+    return truck
+
+
+def memory_per_package(factory, size: int) -> float:
+    """
+    Returns the number of bytes allocated per package when loading `size` packages.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    truck = build_truck(factory(), size)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del truck
+    return (after - before) / size
+
+
+def aggregate_latency(truck: Truck, repeat: int = 5) -> float:
+    """
+    Returns the best time, in milliseconds, of computing the situation aggregates.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        truck.situation
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    layouts = {"list[Packge]": list, "ColumnarStore": ColumnarStore}
+    print(f"{'layout':<15} {'pacotes':>10} {'bytes/pacote':>14} {'situation (ms)':>16}")
+    for size in args.sizes:
+        for name, factory in layouts.items():
+            memory = memory_per_package(factory, size)
+            latency = aggregate_latency(build_truck(factory(), size))
+            print(f"{name:<15} {size:>10} {memory:>14.1f} {latency:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
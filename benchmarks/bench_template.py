@@ -0,0 +1,87 @@
+"""
+Compares the compiled template engine with the original read/findall/replace loop.
+
+Two synthetic templates are built from `report_template.html`: a large one (the report
+repeated many times) and one with many distinct placeholders. Each is rendered with the legacy
+loop, which rereads the file on every call, and with `load_template(...).render`.
+
+Usage:
+    python benchmarks/bench_template.py [--copies 200] [--placeholders 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.template import load_template  # noqa: E402
+from core.report import REPORT_TEMPLATE  # noqa: E402
+
+
+def legacy_render(path: str, parameters: dict) -> str:
+    """
+    Renders the template the way `generate_report` used to.
+    """
+    with open(path, "r") as f:
+        template = f.read()
+    matches = re.findall(r"%\s*(.*?)\s*%", template, re.MULTILINE)
+    for match in matches:
+        template = template.replace(f"% {match} %", str(parameters[match]))
+    return template
+
+
+def compiled_render(path: str, parameters: dict) -> str:
+    """
+    Renders the template with the cached compiled engine.
+    """
+    return load_template(path).render(parameters)
+
+
+def best_time(func, path: str, parameters: dict, repeat: int = 5) -> float:
+    """
+    Returns the best time, in milliseconds, of `func(path, parameters)`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path, parameters)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--placeholders", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(REPORT_TEMPLATE, "r") as f:
+        report = f.read()
+    names = re.findall(r"%\s*(.*?)\s*%", report, re.MULTILINE)
+    report_parameters = {name: 123.45 for name in names}
+    many_names = [f"campo_{i}" for i in range(args.placeholders)]
+
+    cases = {
+        f"grande ({args.copies} cópias)": (report * args.copies, report_parameters),
+        f"{args.placeholders} campos": (
+            "".join(f"<td>% {name} %</td>\n" for name in many_names),
+            {name: i for i, name in enumerate(many_names)},
+        ),
+    }
+
+    print(f"{'template':<22} {'legado (ms)':>12} {'compilado (ms)':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (label, (text, parameters)) in enumerate(cases.items()):
+            path = os.path.join(directory, f"template_{index}.html")
+            with open(path, "w") as f:
+                f.write(text)
+            assert legacy_render(path, parameters) == compiled_render(path, parameters)
+            print(f"{label:<22} {best_time(legacy_render, path, parameters):>12.2f} "
+                  f"{best_time(compiled_render, path, parameters):>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures the cost of rolling a stop back as the load grows.
+
+A stop that loads and unloads a fixed number of packages is opened on trucks holding 10^3 to
+10^6 packages and rolled back with `Truck.rollback`. The rollback latency should follow the
+size of the stop, not the size of the load.
+
+Usage:
+    python benchmarks/bench_transaction.py [--max-exponent 6] [--stop-size 100]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.truck import Packge, Truck  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-exponent", type=int, default=6)
+    parser.add_argument("--stop-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stop = [Packge(rng.randint(1, 60), rng.uniform(10, 500)) for _ in range(args.stop_size)]
+    print(f"{'pacotes':>10} {'rollback (us)':>14} {'undo (us)':>10}")
+    for exponent in range(3, args.max_exponent + 1):
+        truck = Truck()
+        truck.start_day(100, 10 ** 12)
+        truck.insert_packages(
+            Packge(rng.randint(1, 60), rng.uniform(10, 500)) for _ in range(10 ** exponent))
+        rollback = 0.0
+        undo = 0.0
+        for _ in range(args.repeat):
+            truck.begin_transaction()
+            truck.remove_packages(args.stop_size // 2)
+            truck.insert_packages(stop)
+            start = time.perf_counter()
+            truck.rollback()
+            rollback += time.perf_counter() - start
+
+            truck.begin_transaction()
+            truck.remove_packages(args.stop_size // 2)
+            truck.insert_packages(stop)
+            truck.commit()
+            start = time.perf_counter()
+            truck.undo_stop()
+            undo += time.perf_counter() - start
+        print(f"{10 ** exponent:>10} {rollback / args.repeat * 1e6:>14.1f} "
+              f"{undo / args.repeat * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
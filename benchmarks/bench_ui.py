@@ -0,0 +1,86 @@
+"""
+Measures operations per second of `Menu` and `RunProgram` with each UI implementation.
+
+Two workloads are timed: rendering the main menu and a scripted session (start the day,
+one stop with one package, status and package list). Output is sent to /dev/null. The
+session with `InteractiveUI` sleeps for about 15 seconds, so it only runs with `--interactive`.
+
+Usage:
+    python benchmarks/bench_ui.py [--repeat 2000] [--interactive]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.core import RunProgram  # noqa: E402
+from core.truck import Truck  # noqa: E402
+from core.ui import FastUI, InteractiveUI, NullUI  # noqa: E402
+from menu.menu import Menu  # noqa: E402
+
+MAIN_MENU = [
+    "Bem-Vindo ao Truck Manager!",
+    "1. Iniciar dia",
+    "2. Realizar parada",
+    "3. Consultar situação",
+    "4. Listar pacotes",
+    "5. Finalizar dia",
+    "6. Gerar relatório",
+    "7. Sair",
+]
+
+SESSION_INPUTS = ["10", "1000", "1", "5", "10", "s", "3"]
+
+
+def menu_renders(ui_class, repeat: int) -> float:
+    """
+    Returns the main menu renders (display plus screen clear) per second.
+    """
+    ui = ui_class()
+    menu = Menu(MAIN_MENU, ui=ui)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ui.clear()
+        menu.display()
+    return repeat / (time.perf_counter() - start)
+
+
+def sessions(ui_class, repeat: int) -> float:
+    """
+    Returns the scripted sessions per second.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        program = RunProgram(Truck(), ui_class(SESSION_INPUTS))
+        for choice in (1, 2, 3, 4):
+            program.run(choice)
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--interactive", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for ui_class in (InteractiveUI, FastUI, NullUI):
+            renders = menu_renders(ui_class, args.repeat)
+            if ui_class is InteractiveUI:
+                session = sessions(ui_class, 1) if args.interactive else None
+            else:
+                session = sessions(ui_class, args.repeat)
+            rows.append((ui_class.__name__, renders, session))
+
+    print(f"{'ui':<15} {'menus/s':>12} {'sessões/s':>12}")
+    for name, renders, session in rows:
+        session = f"{session:>12,.2f}" if session is not None else f"{'-':>12}"
+        print(f"{name:<15} {renders:>12,.0f} {session}")
+
+
+if __name__ == "__main__":
+    main()
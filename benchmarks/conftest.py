@@ -0,0 +1,59 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from manifests import loaded_truck  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+REGRESSION_THRESHOLD = "mean:25%"
+
+_trucks = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--max-exponent", type=int, default=6,
+        help="Benchmarks the loads of 10^2 up to 10^N packages (default: 6).")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Stores the baselines in `benchmarks/baselines` and, when comparing against one, fails the
+    run on a regression over `REGRESSION_THRESHOLD` unless another threshold is given.
+    """
+    option = config.option
+    if not hasattr(option, "benchmark_storage"):
+        return
+    if option.benchmark_storage == "file://./.benchmarks":
+        option.benchmark_storage = f"file://{BASELINES}"
+    if option.benchmark_compare and not option.benchmark_compare_fail:
+        from pytest_benchmark.utils import parse_compare_fail
+
+        option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        max_exponent = metafunc.config.getoption("--max-exponent")
+        sizes = [10 ** exponent for exponent in range(2, max_exponent + 1)]
+        metafunc.parametrize("size", sizes, ids=[f"10^{exponent}" for exponent in
+                                                 range(2, max_exponent + 1)])
+
+
+@pytest.fixture
+def truck(size):
+    """
+    A truck loaded with a synthetic manifest of `size` packages.
+
+    Building the larger loads takes seconds, so each size is built once per session; the
+    benchmarks that mutate the truck restore its load after each round.
+    """
+    if size not in _trucks:
+        _trucks[size] = loaded_truck(size)
+    loaded = _trucks[size]
+    assert len(loaded.load_list) == size
+    return loaded
@@ -0,0 +1,58 @@
+"""
+Synthetic manifests with realistic package weights and values, for the benchmarks.
+
+Most parcels of a depot day come in a handful of standard sizes, with a long tail of heavier
+freight; the declared value grows with the weight but varies a lot between parcels of the same
+weight. Every generator is seeded, so the same arguments always produce the same manifest.
+"""
+import random
+from typing import Iterator, List, Tuple
+
+STANDARD_WEIGHTS = (1, 2, 3, 5, 10, 15, 20, 25, 30)
+STANDARD_SHARES = (18, 16, 12, 14, 12, 8, 8, 6, 6)
+STANDARD_RATIO = 0.7
+MAX_WEIGHT = 200
+
+
+def manifest_rows(count: int, seed: int = 42) -> Iterator[Tuple[int, float]]:
+    """
+    Yields `count` (weight, value) pairs.
+
+    70% of the weights are standard parcel sizes and the rest follow a log-normal tail capped
+    at `MAX_WEIGHT` kg. The value is log-normal per kg, scaled sublinearly with the weight.
+    """
+    rng = random.Random(seed)
+    choices = rng.choices
+    for _ in range(count):
+        if rng.random() < STANDARD_RATIO:
+            weight = choices(STANDARD_WEIGHTS, STANDARD_SHARES)[0]
+        else:
+            weight = min(MAX_WEIGHT, max(1, int(rng.lognormvariate(2.3, 0.7))))
+        value = round(rng.lognormvariate(2.5, 0.8) * weight ** 0.6, 2)
+        yield weight, value
+
+
+def manifest(count: int, seed: int = 42) -> List:
+    """
+    Returns `count` packages built from `manifest_rows`.
+    """
+    from core.truck import Packge
+
+    return [Packge(weight, value) for weight, value in manifest_rows(count, seed)]
+
+
+def loaded_truck(count: int, seed: int = 42, volume: int = 10):
+    """
+    Returns a truck with a started day, no weight limit in practice and `count` packages loaded
+    over stops of about 50 packages.
+    """
+    from core.truck import Truck
+
+    truck = Truck()
+    truck.start_day(volume, 10 ** 12)
+    packges = manifest(count, seed)
+    for start in range(0, count, 50):
+        truck.begin_stop()
+        truck.insert_packages(packges[start:start + 50])
+        truck.close_stop()
+    return truck
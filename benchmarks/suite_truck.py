@@ -0,0 +1,96 @@
+"""
+pytest-benchmark suite covering the hot paths of `Truck`, `Packge` and `Menu`.
+
+Every benchmark runs on synthetic manifests (see `manifests.py`) of 10^2 to 10^6 packages,
+fully offline. Run it from the repository root, saving a baseline once and then comparing
+against it; a mean more than 25% slower than the baseline fails the run:
+
+    python -m pytest benchmarks --benchmark-save=baseline
+    python -m pytest benchmarks --benchmark-compare
+
+Baselines are stored as JSON in `benchmarks/baselines`. `--max-exponent 4` limits the loads
+to 10^4 packages for a quick check.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from core.metrics import metrics  # noqa: E402
+from core.truck import Packge, Truck  # noqa: E402
+from core.ui import NullUI  # noqa: E402
+from manifests import manifest  # noqa: E402
+from menu.menu import Menu  # noqa: E402
+
+PACKGE = Packge(12, 180.0)
+MAIN_MENU = [
+    "Bem-Vindo ao Truck Manager!",
+    "1. Iniciar dia",
+    "2. Realizar parada",
+    "3. Consultar situação",
+    "4. Listar pacotes",
+    "5. Finalizar dia",
+    "6. Gerar relatório",
+    "7. Sair",
+]
+
+
+def test_insert_package(benchmark, truck, size):
+    def restore():
+        if len(truck.load_list) > size:
+            truck.remove_package()
+
+    benchmark.pedantic(
+        truck.insert_package, args=(PACKGE,), setup=restore, rounds=2000, warmup_rounds=10)
+    restore()
+
+
+def test_remove_package(benchmark, truck, size):
+    def restore():
+        if len(truck.load_list) < size:
+            truck.insert_package(PACKGE)
+
+    benchmark.pedantic(truck.remove_package, setup=restore, rounds=2000, warmup_rounds=10)
+    restore()
+
+
+def test_situation(benchmark, truck):
+    benchmark(lambda: truck.situation)
+
+
+def test_packages(benchmark, truck):
+    benchmark(lambda: list(truck.packages))
+
+
+def test_generate_report(benchmark, truck, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    benchmark.pedantic(truck.generate_report, rounds=3, iterations=1)
+
+
+def test_packge_costs(benchmark, size):
+    packges = manifest(size)
+
+    def costs():
+        for packge in packges:
+            packge.transport_cost
+            packge.extra_insurance_cost(10)
+
+    benchmark(costs)
+
+
+def test_menu_display(benchmark):
+    menu = Menu(MAIN_MENU, ui=NullUI())
+    benchmark(menu.display, 120)
+
+
+@pytest.mark.parametrize("layer", ["bare", "gates", "instrumented"])
+def test_decorator_overhead(benchmark, layer):
+    truck = Truck()
+    truck.start_day(10, 1000)
+    situation = Truck.situation.fget
+    calls = {
+        "bare": situation.__wrapped__.__wrapped__,
+        "gates": situation.__wrapped__,
+        "instrumented": situation,
+    }
+    metrics.disable()
+    benchmark(calls[layer], truck)
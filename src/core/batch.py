@@ -0,0 +1,523 @@
+import csv
+import json
+import os
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator, Optional, Tuple, Union
+
+from core.decorators import DAY_NOT_STARTED_MESSAGE, NO_PACKAGES_MESSAGE
+from core.report import REPORT_FORMATS, report_format, write_report
+from core.truck import (
+    DAY_ALREADY_STARTED_MESSAGE,
+    NO_TRANSACTION_MESSAGE,
+    PACKAGE_NOT_FOUND_MESSAGE,
+    PACKAGE_QUEUED_MESSAGE,
+    PACKAGE_REJECTED_MESSAGE,
+    TRANSACTION_OPEN_MESSAGE,
+    Packge,
+    Truck,
+    packge_cache,
+)
+
+
+"""
+The `BatchRunner` class applies a recorded day of operations to a `Truck` without any prompt,
+animation or sleep, so thousands of days can be replayed for regression and load tests.
+
+Operations are dictionaries read from a JSON Lines file (one object per line) or a CSV file
+(one operation per row, with the columns below; empty cells are ignored):
+
+    {"op": "start_day", "volume": 10, "weight": 1000}
+    {"op": "insert", "weight": 20, "value": 150.0, "insurance": true}
+    {"op": "insert_many", "packages": [[20, 150.0], [5, 30.0]]}
+    {"op": "admit_pending", "time_budget": 0.05}
+    {"op": "remove"}
+    {"op": "remove", "count": 3}
+    {"op": "remove", "id": 42}
+    {"op": "find", "id": 42}
+    {"op": "end_stop"}
+    {"op": "begin_stop", "x": 2.0, "y": 3.5}
+    {"op": "rollback_stop"}
+    {"op": "undo_stop"}
+    {"op": "redo_stop"}
+    {"op": "situation"}
+    {"op": "packages"}
+    {"op": "end_day"}
+    {"op": "report", "path": "relatorio.html"}
+    {"op": "report", "format": "csv", "max_points": 1000}
+    {"op": "manifest", "path": "dia.manifest"}
+    {"op": "plan_route", "stops": [[2.0, 3.5], [8.1, 1.0]], "depot": [0.0, 0.0]}
+
+Each operation produces one result dictionary with the operation, its line in the file, an `ok`
+flag, the message returned by the truck and any data the operation produced. A line or row that
+cannot be parsed fails on its own and the replay carries on with the next one. Loaded packages
+get a stable ID (`id` for `insert`, `first_id` for `insert_many`, the others following in
+order), which `remove` and `find` accept to reach any package of the load. An operation that
+cannot write its file fails without stopping the day, and a `report` whose `format` does not
+match the extension of its `path` is rejected.
+
+`begin_stop` opens a stop transaction: the next `end_stop` commits it, and `rollback_stop`
+discards everything loaded and unloaded since, so a failed stop can be retried. `undo_stop` and
+`redo_stop` walk the history of committed stop transactions. `manifest` archives the loaded
+packages in a binary manifest (see `core.manifest`). `plan_route` orders the given stop
+coordinates to shorten the route (see `core.route`) and `begin_stop` accepts the coordinates of
+the stop it opens.
+
+Example Usage:
+    python src/main.py --batch day.jsonl --output results.jsonl
+"""
+
+INSURANCE_REFUSED_MESSAGE = (
+    "O custo de seguro não foi inserido. Logo você precisa diminur o peso")
+NOTHING_TO_UNDO_MESSAGE = "Nenhuma parada para desfazer"
+NOTHING_TO_REDO_MESSAGE = "Nenhuma parada para refazer"
+REPORT_FORMAT_MISMATCH_MESSAGE = "O formato do relatório não corresponde à extensão do arquivo"
+
+FAILURE_MESSAGES = frozenset({
+    DAY_NOT_STARTED_MESSAGE,
+    NO_PACKAGES_MESSAGE,
+    DAY_ALREADY_STARTED_MESSAGE,
+    INSURANCE_REFUSED_MESSAGE,
+    PACKAGE_REJECTED_MESSAGE,
+    PACKAGE_NOT_FOUND_MESSAGE,
+    NO_TRANSACTION_MESSAGE,
+    TRANSACTION_OPEN_MESSAGE,
+    NOTHING_TO_UNDO_MESSAGE,
+    NOTHING_TO_REDO_MESSAGE,
+    REPORT_FORMAT_MISMATCH_MESSAGE,
+})
+
+CSV_INTEGER_FIELDS = ("volume", "weight", "count", "id")
+CSV_FLOAT_FIELDS = ("value", "x", "y")
+
+# A JSON Lines line, or a CSV row, before it is parsed into an operation.
+Record = Union[str, dict]
+
+
+@dataclass
+class BatchRunner:
+    """
+    Applies operations to a truck with the same rules as `RunProgram`, without user interaction.
+
+    Attributes
+    ----------
+    truck : Truck
+        The truck the operations are applied to.
+    report_dir : str
+        The directory where `report` operations write their HTML files.
+    write_reports : bool
+        When disabled, `report` and `manifest` operations write no file.
+    report_prefix : str
+        The start of the default report file name.
+    confine_paths : bool
+        When enabled, only the file name of the `path` given to a `report` or `manifest`
+        operation is kept, inside `report_dir`, so a remote client cannot write anywhere else.
+    max_time_budget : Optional[float]
+        When set, the longest `time_budget`, in seconds, an `admit_pending` or `plan_route`
+        operation may ask for; larger budgets are lowered to it.
+    """
+
+    truck: Truck = field(default_factory=Truck)
+    report_dir: str = "."
+    write_reports: bool = True
+    report_prefix: str = "relatorio"
+    confine_paths: bool = False
+    max_time_budget: Optional[float] = None
+    days: int = field(default=0, init=False)
+    packages_at_stop: int = field(default=0, init=False)
+    stop_open: bool = field(default=False, init=False)
+    packages_at_savepoint: int = field(default=0, init=False)
+
+    def apply(self, operation: dict, line: Optional[int] = None) -> dict:
+        """
+        Applies one operation and returns its result.
+
+        Parameters
+        ----------
+        operation : dict
+            The operation, with its name in the `op` key.
+        line : Optional[int]
+            The line of the operation in its source file, copied to the result.
+
+        Returns
+        -------
+        dict
+            The result, with at least the `op`, `line`, `ok` and `message` keys.
+        """
+        name = operation.get("op")
+        handler = getattr(self, f"_op_{name}", None)
+        if handler is None:
+            return self._result(name, line, False, f"Operação desconhecida: {name}")
+        try:
+            message, data = handler(operation)
+        except (KeyError, TypeError, ValueError) as e:
+            return self._result(name, line, False, invalid_operation_message(e))
+        except OSError as e:
+            return self._result(name, line, False, file_error_message(e))
+        ok = message not in FAILURE_MESSAGES
+        return self._result(name, line, ok, message, data)
+
+    def run(self, operations: Iterable[dict]) -> Iterator[dict]:
+        """
+        Applies every operation in order and yields their results, numbered from 1.
+        """
+        for line, operation in enumerate(operations, start=1):
+            yield self.apply(operation, line)
+
+    def replay(self, records: Iterable[Tuple[int, Record]]) -> Iterator[dict]:
+        """
+        Parses and applies every record read by `read_records` and yields their results.
+
+        A record that cannot be parsed yields a failed result with its line number.
+        """
+        for line, record in records:
+            try:
+                operation = parse_operation(record)
+            except (TypeError, ValueError) as e:
+                name = record.get("op") if isinstance(record, dict) else None
+                yield self._result(name, line, False, invalid_operation_message(e))
+                continue
+            yield self.apply(operation, line)
+
+    def _result(self, name, line, ok, message, data=None) -> dict:
+        result = {"op": name, "line": line, "ok": ok, "message": message}
+        if data:
+            result.update(data)
+        return result
+
+    def _open_stop(self, location: Optional[Tuple[float, float]] = None) -> None:
+        if not self.stop_open:
+            self.stop_open = True
+            self.packages_at_stop = 0
+            self.truck.begin_stop(location)
+
+    def _op_start_day(self, operation: dict):
+        message = self.truck.start_day(int(operation["volume"]), int(operation["weight"]))
+        if message not in FAILURE_MESSAGES:
+            self.days += 1
+        return message, {}
+
+    def _op_insert(self, operation: dict):
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}
+        packge = Packge(int(operation["weight"]), float(operation["value"]))
+        extra_insurance = packge.extra_insurance_cost(self.truck.volume)
+        data = {"transport_cost": packge.transport_cost, "insurance_cost": extra_insurance}
+        if extra_insurance > 0:
+            if not operation.get("insurance", True):
+                return INSURANCE_REFUSED_MESSAGE, data
+            packge.value += extra_insurance
+        self._open_stop()
+        message = self.truck.insert_package(packge)
+        if message not in (PACKAGE_REJECTED_MESSAGE, PACKAGE_QUEUED_MESSAGE):
+            self.packages_at_stop += 1
+            data["id"] = self.truck.last_package_id
+        return message, data
+
+    def _op_insert_many(self, operation: dict):
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}
+        self._open_stop()
+        result = self.truck.insert_packages(
+            packge_cache.get(int(weight), float(value))
+            for weight, value in operation["packages"])
+        self.packages_at_stop += result.count
+        return result.message, {
+            "count": result.count,
+            "total_weight": result.total_weight,
+            "rejected": result.rejected,
+            "first_id": result.first_id,
+        }
+
+    def _op_remove(self, operation: dict):
+        if "id" in operation:
+            return self._remove_by_id(int(operation["id"]))
+        count = int(operation.get("count", 1))
+        if self.truck.current_day and 0 < count <= len(self.truck.load_list):
+            # Opened before unloading so the removed packages are recorded in the stop.
+            self._open_stop()
+        if count == 1:
+            return self.truck.remove_package(), {}
+        result = self.truck.remove_packages(count)
+        return result.message, {"count": result.count, "total_weight": result.total_weight}
+
+    def _remove_by_id(self, packge_id: int):
+        if self.truck.find_package(packge_id) is not None and self.truck.current_day:
+            self._open_stop()
+        return self.truck.remove_package_by_id(packge_id), {"id": packge_id}
+
+    def _op_find(self, operation: dict):
+        packge_id = int(operation["id"])
+        packge = self.truck.find_package(packge_id)
+        if packge is None:
+            return PACKAGE_NOT_FOUND_MESSAGE, {"id": packge_id}
+        return "Pacote encontrado", {
+            "id": packge_id, "weight": packge.weight, "value": packge.value}
+
+    def _op_admit_pending(self, operation: dict):
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}
+        self._open_stop()
+        result = self.truck.admit_pending(self._time_budget(operation, 0.05))
+        self.packages_at_stop += result.count
+        return result.message, {"count": result.count, "total_weight": result.total_weight}
+
+    def _op_end_stop(self, operation: dict):
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}
+        self._open_stop()
+        if self.truck.transaction is not None:
+            self.truck.commit(self.packages_at_stop)
+        else:
+            self.truck.close_stop(self.packages_at_stop)
+        self.stop_open = False
+        return "[!] Parada encerrada.", {"packages": self.packages_at_stop}
+
+    def _op_begin_stop(self, operation: dict):
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}
+        if self.truck.transaction is not None:
+            return TRANSACTION_OPEN_MESSAGE, {}
+        location = None
+        if "x" in operation and "y" in operation:
+            location = (float(operation["x"]), float(operation["y"]))
+        self._open_stop(location)
+        self.packages_at_savepoint = self.packages_at_stop
+        stop = self.truck.begin_transaction(location)
+        return "[!] Parada iniciada.", {"stop": stop.index}
+
+    def _op_rollback_stop(self, operation: dict):
+        if self.truck.transaction is None:
+            return NO_TRANSACTION_MESSAGE, {}
+        self.truck.rollback()
+        self.stop_open = self.truck.current_stop is not None
+        self.packages_at_stop = self.packages_at_savepoint if self.stop_open else 0
+        return "[!] Parada desfeita.", {}
+
+    def _op_undo_stop(self, operation: dict):
+        stop = self.truck.undo_stop()
+        if stop is None:
+            return NOTHING_TO_UNDO_MESSAGE, {}
+        self.stop_open = self.truck.current_stop is not None
+        self.packages_at_stop = 0
+        return "[!] Parada desfeita.", {"stop": stop.index}
+
+    def _op_redo_stop(self, operation: dict):
+        stop = self.truck.redo_stop()
+        if stop is None:
+            return NOTHING_TO_REDO_MESSAGE, {}
+        return "[!] Parada refeita.", {"stop": stop.index}
+
+    def _op_situation(self, operation: dict):
+        situation = self.truck.situation
+        if isinstance(situation, str):
+            return situation, {}
+        return "Situação", {"situation": situation}
+
+    def _op_packages(self, operation: dict):
+        packages = self.truck.packages
+        if isinstance(packages, str):
+            return packages, {}
+        return "Pacotes", {"packages": list(packages)}
+
+    def _op_end_day(self, operation: dict):
+        self.truck.finish_day()
+        self.stop_open = False
+        return "[!] Dia finalizado.", {}
+
+    def _op_report(self, operation: dict):
+        message, data, job = self.prepare_report(operation)
+        if job is not None:
+            data["path"] = write_report(*job)
+        return message, data
+
+    def _op_manifest(self, operation: dict):
+        from core.manifest import write_manifest
+
+        message, data, job = self.prepare_manifest(operation)
+        if job is not None:
+            data["path"] = write_manifest(*job)
+        return message, data
+
+    def _op_plan_route(self, operation: dict):
+        from core.route import plan_route
+
+        plan = plan_route(
+            [(float(x), float(y)) for x, y in operation["stops"]],
+            tuple(float(coordinate) for coordinate in operation.get("depot", (0.0, 0.0))),
+            self._time_budget(operation, 0.25),
+            bool(operation.get("closed", True)),
+        )
+        return "Rota planejada", {
+            "order": plan.order,
+            "load_order": plan.load_order(),
+            "distance": plan.distance,
+            "initial_distance": plan.initial_distance,
+        }
+
+    def _time_budget(self, operation: dict, default: float) -> float:
+        time_budget = float(operation.get("time_budget", default))
+        if self.max_time_budget is not None:
+            time_budget = min(time_budget, self.max_time_budget)
+        return time_budget
+
+    def _output_path(self, operation: dict, default_name: str) -> str:
+        """
+        Returns the file an operation writes: its `path`, or `default_name` in `report_dir`.
+        """
+        path = operation.get("path")
+        if not path:
+            return os.path.join(self.report_dir, default_name)
+        if self.confine_paths:
+            name = os.path.basename(path)
+            if name in ("", ".", ".."):
+                name = default_name
+            return os.path.join(self.report_dir, name)
+        return path
+
+    def prepare_report(self, operation: dict) -> Tuple[str, dict, Optional[tuple]]:
+        """
+        Collects the report of the current day without writing it.
+
+        Returns
+        -------
+        Tuple[str, dict, Optional[tuple]]
+            The message, the report statistics and, when reports are written, the
+            `(snapshot, path)` arguments for `write_report`.
+        """
+        if not self.truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}, None
+        if len(self.truck.load_list) == 0:
+            return NO_PACKAGES_MESSAGE, {}, None
+        format = operation.get("format")
+        if format is not None and format not in REPORT_FORMATS:
+            raise ValueError(f"Formato de relatório inválido: {format}")
+        if format is not None and operation.get("path"):
+            if report_format(operation["path"]) != format:
+                return REPORT_FORMAT_MISMATCH_MESSAGE, {}, None
+        max_points = operation.get("max_points")
+        snapshot = self.truck.report_snapshot(None if max_points is None else int(max_points))
+        data = {"report": snapshot.parameters}
+        job = None
+        if self.write_reports:
+            path = self._output_path(
+                operation, f"{self.report_prefix}_dia{self.days}_{snapshot.day}.{format or 'html'}")
+            job = (snapshot, path)
+        return "[!] Relatório gerado.", data, job
+
+    def prepare_manifest(self, operation: dict) -> Tuple[str, dict, Optional[tuple]]:
+        """
+        Copies the loaded packages for a manifest without writing it.
+
+        Returns
+        -------
+        Tuple[str, dict, Optional[tuple]]
+            The message, the number of packages and, when manifests are written, the
+            arguments for `core.manifest.write_manifest`.
+        """
+        truck = self.truck
+        if not truck.current_day:
+            return DAY_NOT_STARTED_MESSAGE, {}, None
+        data = {"packages": len(truck.load_list)}
+        job = None
+        if self.write_reports:
+            path = self._output_path(operation, f"{self.report_prefix}_dia{self.days}.manifest")
+            job = (
+                path,
+                array("i", truck._weights()),
+                array("d", truck._values()),
+                truck.volume,
+                truck.max_weight_setted,
+                truck.current_day,
+            )
+        return "[!] Manifesto gravado.", data, job
+
+
+def invalid_operation_message(error: Exception) -> str:
+    """
+    Returns the failure message of an operation with missing or malformed fields.
+    """
+    return f"Operação inválida: {error!r}"
+
+
+def file_error_message(error: OSError) -> str:
+    """
+    Returns the failure message of an operation whose file could not be written.
+    """
+    return f"Falha ao gravar o arquivo: {error!r}"
+
+
+def read_records(path: str) -> Iterator[Tuple[int, Record]]:
+    """
+    Reads the lines of a JSON Lines file, or the rows of a CSV file when `path` ends in `.csv`,
+    with their line number in the file. Blank lines are skipped.
+
+    The records are parsed by `parse_operation`, so one malformed line does not stop the others
+    from being read.
+    """
+    with open(path, "r", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for number, line in enumerate(f, start=1):
+                line = line.strip()
+                if line:
+                    yield number, line
+
+
+def parse_operation(record: Record) -> dict:
+    """
+    Parses a JSON Lines line or a CSV row into an operation.
+
+    Raises
+    ------
+    ValueError
+        If the line is not a JSON object or a numeric cell holds something else.
+    """
+    if isinstance(record, dict):
+        return _parse_csv_row(record)
+    operation = json.loads(record)
+    if not isinstance(operation, dict):
+        raise ValueError(f"a operação deve ser um objeto JSON: {record}")
+    return operation
+
+
+def _parse_csv_row(row: dict) -> dict:
+    operation = {key: value for key, value in row.items() if value not in (None, "")}
+    for key in CSV_INTEGER_FIELDS:
+        if key in operation:
+            operation[key] = int(operation[key])
+    for key in CSV_FLOAT_FIELDS:
+        if key in operation:
+            operation[key] = float(operation[key])
+    if "insurance" in operation:
+        operation["insurance"] = operation["insurance"].strip().lower() in ("s", "1", "true")
+    return operation
+
+
+def run_files(
+    paths: Iterable[str],
+    output: IO[str] = sys.stdout,
+    report_dir: str = ".",
+    write_reports: bool = True,
+) -> int:
+    """
+    Replays every file on its own truck and writes the results to `output` as JSON Lines.
+
+    Returns
+    -------
+    int
+        The number of failed operations.
+    """
+    failures = 0
+    for path in paths:
+        runner = BatchRunner(report_dir=report_dir, write_reports=write_reports)
+        for result in runner.replay(read_records(path)):
+            result["file"] = path
+            failures += not result["ok"]
+            output.write(json.dumps(result, ensure_ascii=False))
+            output.write("\n")
+    return failures
@@ -1,9 +1,9 @@
 import sys
-import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from core.truck import Packge, Truck
-from core.utils import clear
+from core.decorators import instrumented
+from core.truck import PACKAGE_QUEUED_MESSAGE, PACKAGE_REJECTED_MESSAGE, Packge, Truck
+from core.ui import UI, InteractiveUI
 from menu.menu import Menu
 
 
@@ -42,12 +42,14 @@ Methods:
 
 Fields:
 - `current_truck`: The `Truck` object representing the truck being operated on.
+- `ui`: The `UI` used for every output, prompt, pause and screen clear. `FastUI` removes the animations and pauses, `NullUI` silences the program for tests.
 """
 
 
 @dataclass
 class RunProgram:
     current_truck: Truck
+    ui: UI = field(default_factory=InteractiveUI)
 
     def animated_dots(self, duration, interval):
         """
@@ -59,14 +61,7 @@ class RunProgram:
         :type interval: float
         :return: None
         """
-        start_time = time.time()
-
-        while time.time() - start_time < duration:
-            sys.stdout.write(".")
-            sys.stdout.flush()
-            time.sleep(interval)
-
-        print()
+        self.ui.animated_dots(duration, interval)
 
     def _start_day_process(self) -> None:
         """
@@ -80,14 +75,14 @@ class RunProgram:
         Outputs:
           - None
         """
-        volume = int(input("[?] Volume de carga em m³: "))
-        weight = int(input("[?] Peso máximo da carga em kg: "))
+        volume = int(self.ui.input("[?] Volume de carga em m³: "))
+        weight = int(self.ui.input("[?] Peso máximo da carga em kg: "))
         res = self.current_truck.start_day(volume, weight)
-        print(res, end=" ")
+        self.ui.print(res, end=" ")
         self.animated_dots(3, 0.25)
-        print("Dia iniciado.")
-        time.sleep(1)
-        clear()
+        self.ui.print("Dia iniciado.")
+        self.ui.sleep(1)
+        self.ui.clear()
         return
 
     def _stop_process(self) -> None:
@@ -100,92 +95,92 @@ class RunProgram:
         Outputs:
         - None
         """
-        clear()
+        self.ui.clear()
         stop_menu = Menu(
             menu_text=[
                 "1. Inserir pacote",
                 "2. Retirar pacote",
                 "3. Encerrar parada",
-            ]
+            ],
+            ui=self.ui,
         )
         # Initialize a variable to keep track of the number of packages loaded at the current stop.
         packges_at_stop = 0
+        self.current_truck.begin_stop()
 
         while True:
-            self.current_truck.stops += 1
             opt = stop_menu.run()
             if opt == 1:
-                packge_weight = int(input("[?] Peso do pacote (em kg): "))
-                packge_value = float(input("[?] Valor da mercadoria: "))
-                print("Calculando custos", end=" ")
+                packge_weight = int(self.ui.input("[?] Peso do pacote (em kg): "))
+                packge_value = float(self.ui.input("[?] Valor da mercadoria: "))
+                self.ui.print("Calculando custos", end=" ")
                 self.animated_dots(3, 0.25)
                 pack = Packge(packge_weight, packge_value)
-                print(f"Custo do transporte: {pack.transport_cost}")
+                self.ui.print(f"Custo do transporte: {pack.transport_cost}")
                 extra_insurence = pack.extra_insurance_cost(
                     self.current_truck.volume)
-                print(f"Custo de seguro: {extra_insurence}")
+                self.ui.print(f"Custo de seguro: {extra_insurence}")
                 if extra_insurence > 0:
-                    opt_insurance = input(
+                    opt_insurance = self.ui.input(
                         "[?] Deseja inserir o custo de seguro? (s/n): ").lower()
                     if opt_insurance == "s":
-                        print(
+                        self.ui.print(
                             f"Custo total: {pack.transport_cost + extra_insurence}")
                         packge_value += extra_insurence
                         pack.value = packge_value
                     elif opt_insurance == "n":
-                        print(
+                        self.ui.print(
                             "O custo de seguro não foi inserido. Logo você precisa diminur o peso")
-                        time.sleep(3)
+                        self.ui.sleep(3)
                         continue
                     else:
-                        print("Insira um valor válido!")
-                        time.sleep(3)
+                        self.ui.print("Insira um valor válido!")
+                        self.ui.sleep(3)
                         continue
-                confirmation = input(
+                confirmation = self.ui.input(
                     "[?] Deseja inserir o pacote? (s/n): ").lower()
                 if confirmation == "s":
                     res = self.current_truck.insert_package(pack)
-                    packges_at_stop += 1
-                    print(res)
-                    time.sleep(5)
-                    clear()
+                    if res not in (PACKAGE_REJECTED_MESSAGE, PACKAGE_QUEUED_MESSAGE):
+                        packges_at_stop += 1
+                    self.ui.print(res)
+                    self.ui.sleep(5)
+                    self.ui.clear()
                     continue
                 else:
-                    print("O pacote não foi inserido.")
-                    time.sleep(1)
+                    self.ui.print("O pacote não foi inserido.")
+                    self.ui.sleep(1)
                     continue
 
             elif opt == 2:
-                print(f"""
+                self.ui.print(f"""
                 Aqui você pode retirar o seguinte pacote
                 com as seguintes informações:
                 Peso: {self.current_truck.load_list[-1].weight}
                 Valor: {self.current_truck.load_list[-1].value}
                 """)
-                confirmation = input(
+                confirmation = self.ui.input(
                     "[?] Deseja retirar o pacote? (s/n): ").lower()
 
                 if confirmation == "s":
                     res = self.current_truck.remove_package()
-                    print(res)
-                    time.sleep(2)
-                    clear()
+                    self.ui.print(res)
+                    self.ui.sleep(2)
+                    self.ui.clear()
                     continue
                 else:
-                    print("O pacote não foi retirado.")
-                    time.sleep(2)
-                    clear()
+                    self.ui.print("O pacote não foi retirado.")
+                    self.ui.sleep(2)
+                    self.ui.clear()
                     continue
 
             elif opt == 3:
-                print("[!] Parada encerrada.")
-                self.current_truck.qtd_packages_by_stop.append(
-                    packges_at_stop
-                )
-                time.sleep(2)
+                self.ui.print("[!] Parada encerrada.")
+                self.current_truck.close_stop(packges_at_stop)
+                self.ui.sleep(2)
                 break
             else:
-                print("Opção invalida. Por favor, escolha uma opção válida.")
+                self.ui.print("Opção invalida. Por favor, escolha uma opção válida.")
 
     def _check_status_process(self) -> None:
         """
@@ -211,7 +206,7 @@ class RunProgram:
         """
         situation = self.current_truck.situation
         for key, value in situation.items():
-            print(f"[!] {key}: {value}")
+            self.ui.print(f"[!] {key}: {value}")
 
     def _list_packages_process(self) -> None:
         """
@@ -240,7 +235,7 @@ class RunProgram:
         Outputs:
             - None
         """
-        print(f"""
+        self.ui.print(f"""
                    ▒
       ╔══════╦════╗▓
       ║▒▒▒▒▒▒║╦╦╦╦║▓
@@ -270,9 +265,9 @@ class RunProgram:
         ```
         """
         self.current_truck.finish_day()
-        print("[!] Dia finalizado.")
-        time.sleep(2)
-        clear()
+        self.ui.print("[!] Dia finalizado.")
+        self.ui.sleep(2)
+        self.ui.clear()
 
     def _generate_report_process(self) -> None:
         """
@@ -303,13 +298,14 @@ class RunProgram:
         Outputs:
         - None
         """
-        print("[!] Gerando relatório.")
+        self.ui.print("[!] Gerando relatório.")
         self.animated_dots(3, 0.25)
         self.current_truck.generate_report()
-        time.sleep(2)
-        print("[!] Relatório gerado.")
-        clear()
+        self.ui.sleep(2)
+        self.ui.print("[!] Relatório gerado.")
+        self.ui.clear()
 
+    @instrumented("run_program")
     def run(self, choice: int) -> None:
         """
         Executes different processes based on the user's choice.
@@ -344,8 +340,8 @@ class RunProgram:
         elif choice == 6:
             self._generate_report_process()
         elif choice == 7:
-            print("[!] Saindo do programa", end=" ")
+            self.ui.print("[!] Saindo do programa", end=" ")
             self.animated_dots(3, 0.25)
             sys.exit(1)
         else:
-            print("Opção invalida. Por favor, escolha uma opção válida.")
+            self.ui.print("Opção invalida. Por favor, escolha uma opção válida.")
@@ -1,4 +1,12 @@
 from functools import wraps
+from time import perf_counter
+
+from core.metrics import metrics
+
+
+DAY_NOT_STARTED_MESSAGE = "Você não iniciou o dia. Portanto não é possível realizar esta operação"
+NO_PACKAGES_MESSAGE = "Não há pacotes no caminhão"
+REFUSAL_MESSAGES = frozenset({DAY_NOT_STARTED_MESSAGE, NO_PACKAGES_MESSAGE})
 
 
 def day_started_required(func):
@@ -22,7 +30,7 @@ def day_started_required(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         if not self.current_day:
-            return "Você não iniciou o dia. Portanto não é possível realizar esta operação"
+            return DAY_NOT_STARTED_MESSAGE
         return func(self, *args, **kwargs)
     return wrapper
 
@@ -41,6 +49,44 @@ def are_there_packges_in_the_truck(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         if len(self.load_list) == 0:
-            return "Não há pacotes no caminhão"
+            return NO_PACKAGES_MESSAGE
         return func(self, *args, **kwargs)
     return wrapper
+
+
+def instrumented(name, refusals=REFUSAL_MESSAGES):
+    """
+    A decorator that records the calls, latency and errors of a method in `core.metrics.metrics`.
+
+    While the registry is disabled the method is called directly, after a single flag check.
+    It should be the outermost decorator, so calls refused by the other decorators are counted.
+
+    Args:
+        name (str): The operation name used in the exported metrics.
+        refusals (frozenset): Returned messages that count as errors.
+
+    Returns:
+        function: The decorator.
+
+    Example Usage:
+        @instrumented("insert_package")
+        @day_started_required
+        def insert_package(self, packge):
+            # code to insert the package
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                metrics.record(name, perf_counter() - start, True)
+                raise
+            refused = isinstance(result, str) and result in refusals
+            metrics.record(name, perf_counter() - start, refused)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+from core.decorators import DAY_NOT_STARTED_MESSAGE, NO_PACKAGES_MESSAGE
+from core.report import ReportSnapshot, write_report
+from core.truck import Truck
+
+
+def _write_report_job(job: Tuple[ReportSnapshot, str]) -> str:
+    """
+    Renders one report inside a worker process.
+    """
+    snapshot, path = job
+    return write_report(snapshot, path)
+
+
+@dataclass
+class Fleet:
+    """
+    Represents a fleet of trucks identified by ID.
+
+    Reports are rendered in parallel by a `concurrent.futures` process pool. Only each truck's
+    `ReportSnapshot` (scalar statistics plus two packed arrays) is sent to the workers, never
+    the `Truck` or its packages.
+
+    Attributes
+    ----------
+    trucks : Dict[str, Truck]
+        The trucks of the fleet, keyed by ID.
+    workers : Optional[int]
+        The number of worker processes used for reports. Defaults to the number of CPUs.
+    """
+
+    trucks: Dict[str, Truck] = field(default_factory=dict)
+    workers: Optional[int] = None
+
+    def add_truck(self, truck_id: str, truck: Optional[Truck] = None) -> Truck:
+        """
+        Adds a truck to the fleet and returns it. A new empty `Truck` is created by default.
+        """
+        if truck is None:
+            truck = Truck()
+        self.trucks[truck_id] = truck
+        return truck
+
+    def __getitem__(self, truck_id: str) -> Truck:
+        return self.trucks[truck_id]
+
+    def __len__(self) -> int:
+        return len(self.trucks)
+
+    def situations(self) -> Dict[str, Union[dict, str]]:
+        """
+        Retrieves the situation of every truck.
+
+        `Truck.situation` reads running totals, so it is computed in-process: shipping the trucks
+        to a pool would cost more than the call itself.
+
+        Returns
+        -------
+        Dict[str, Union[dict, str]]
+            The situation of each truck, or the error message when its day has not started.
+        """
+        return {truck_id: truck.situation for truck_id, truck in self.trucks.items()}
+
+    def generate_reports(
+        self, output_dir: str = ".", workers: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Generates the report of every truck in parallel.
+
+        Each report is written to `relatorio_<truck id>_<day>.html` in `output_dir`.
+
+        Parameters
+        ----------
+        output_dir : str
+            The directory where the reports are written.
+        workers : Optional[int]
+            Overrides the fleet's worker count for this call.
+
+        Returns
+        -------
+        Dict[str, str]
+            The path of each written report, or the reason why the truck was skipped or its
+            report failed. A failed report does not discard the others.
+        """
+        results: Dict[str, str] = {}
+        jobs = []
+        for truck_id, truck in self.trucks.items():
+            if not truck.current_day:
+                results[truck_id] = DAY_NOT_STARTED_MESSAGE
+            elif len(truck.load_list) == 0:
+                results[truck_id] = NO_PACKAGES_MESSAGE
+            else:
+                snapshot = truck.report_snapshot()
+                path = os.path.join(output_dir, f"relatorio_{truck_id}_{snapshot.day}.html")
+                jobs.append((truck_id, (snapshot, path)))
+
+        if jobs:
+            with ProcessPoolExecutor(max_workers=workers or self.workers) as executor:
+                futures = [
+                    (truck_id, executor.submit(_write_report_job, job)) for truck_id, job in jobs]
+                for truck_id, future in futures:
+                    try:
+                        results[truck_id] = future.result()
+                    except Exception as e:
+                        results[truck_id] = repr(e)
+        return results
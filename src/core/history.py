@@ -0,0 +1,183 @@
+import sqlite3
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from core.truck import Truck
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    id INTEGER PRIMARY KEY,
+    truck_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    volume INTEGER NOT NULL,
+    max_weight INTEGER NOT NULL,
+    packages INTEGER NOT NULL,
+    stops INTEGER NOT NULL,
+    total_weight INTEGER NOT NULL,
+    total_value REAL NOT NULL,
+    total_transport_cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS days_by_day ON days (day);
+CREATE INDEX IF NOT EXISTS days_by_truck ON days (truck_id, day);
+CREATE INDEX IF NOT EXISTS days_by_weight ON days (total_weight);
+
+CREATE TABLE IF NOT EXISTS stops (
+    day_id INTEGER NOT NULL REFERENCES days (id),
+    stop INTEGER NOT NULL,
+    packages INTEGER NOT NULL,
+    PRIMARY KEY (day_id, stop)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stops_by_stop ON stops (stop);
+
+CREATE TABLE IF NOT EXISTS packages (
+    day_id INTEGER NOT NULL REFERENCES days (id),
+    position INTEGER NOT NULL,
+    weight INTEGER NOT NULL,
+    value REAL NOT NULL,
+    transport_cost REAL NOT NULL,
+    PRIMARY KEY (day_id, position)
+) WITHOUT ROWID;
+"""
+
+
+DAY_IN_PROGRESS_MESSAGE = "O dia do caminhão ainda não terminou: {truck_id}"
+
+
+def iso_week(day: str) -> str:
+    """
+    Returns the ISO year and week (`YYYY-WNN`) of an ISO date, as in `date.isocalendar`.
+
+    Days at the start of January can belong to the last week of the previous year, and days at
+    the end of December to the first week of the next one.
+    """
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year:04d}-W{week:02d}"
+
+
+class HistoryStore:
+    """
+    An embedded SQLite history of finished days, their stops and their packages.
+
+    Days are written in bulk transactions (one `executemany` per table), and the indexes on
+    day, truck and stop let cross-day and cross-truck questions be answered with SQL.
+
+    Example Usage:
+        history = HistoryStore("historico.db")
+        history.record_day("T01", truck)
+        history.weekly_weight_totals()
+
+    Args:
+        path (str): The database file, or ":memory:".
+    """
+
+    def __init__(self, path: str = "historico.db") -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.create_function("iso_week", 1, iso_week, deterministic=True)
+
+    def record_day(self, truck_id: str, truck: Truck, day: Optional[date] = None) -> int:
+        """
+        Writes the day of one truck and returns its ID.
+        """
+        return self.record_days([(truck_id, truck, day)])[0]
+
+    def record_days(self, days: Iterable[Tuple[str, Truck, Optional[date]]]) -> List[int]:
+        """
+        Writes many truck days in a single transaction.
+
+        Only finished days are recorded: if any truck is still in its day, nothing is written.
+
+        Parameters
+        ----------
+        days : Iterable[Tuple[str, Truck, Optional[date]]]
+            The truck ID, the truck and the day (today by default) of each record.
+
+        Returns
+        -------
+        List[int]
+            The ID of each written day.
+
+        Raises
+        ------
+        ValueError
+            If a truck has not finished its day.
+        """
+        day_ids = []
+        stop_rows = []
+        package_rows = []
+        with self.connection:
+            cursor = self.connection.cursor()
+            for truck_id, truck, day in days:
+                if truck.current_day:
+                    raise ValueError(DAY_IN_PROGRESS_MESSAGE.format(truck_id=truck_id))
+                cursor.execute(
+                    "INSERT INTO days (truck_id, day, volume, max_weight, packages, stops,"
+                    " total_weight, total_value, total_transport_cost)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        truck_id,
+                        (day or date.today()).isoformat(),
+                        truck.volume,
+                        truck.max_weight_setted,
+                        len(truck.load_list),
+                        len(truck.qtd_packages_by_stop),
+                        truck.total_weight,
+                        truck.total_value,
+                        truck.total_transport_cost,
+                    ),
+                )
+                day_id = cursor.lastrowid
+                day_ids.append(day_id)
+                stop_rows.extend(
+                    (day_id, stop, packages)
+                    for stop, packages in enumerate(truck.qtd_packages_by_stop, start=1)
+                )
+                package_rows.extend(
+                    (day_id, position, weight, value, transport_cost)
+                    for position, (weight, value, transport_cost) in enumerate(zip(
+                        truck._weights(), truck._values(), truck._transport_costs()))
+                )
+            cursor.executemany("INSERT INTO stops VALUES (?, ?, ?)", stop_rows)
+            cursor.executemany("INSERT INTO packages VALUES (?, ?, ?, ?, ?)", package_rows)
+        return day_ids
+
+    def weekly_weight_totals(self, truck_id: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Returns the total weight loaded per ISO week (`YYYY-WNN`, see `iso_week`), for one truck
+        or the fleet.
+        """
+        query = "SELECT iso_week(day) AS week, SUM(total_weight) FROM days"
+        return self._query(query, truck_id, "GROUP BY week ORDER BY week")
+
+    def stop_averages(self, truck_id: Optional[str] = None) -> List[Tuple[int, float]]:
+        """
+        Returns the average number of packages loaded at each stop position.
+        """
+        query = "SELECT stop, AVG(stops.packages) FROM stops JOIN days ON days.id = stops.day_id"
+        return self._query(query, truck_id, "GROUP BY stop ORDER BY stop")
+
+    def heaviest_loads(
+        self, limit: int = 10, truck_id: Optional[str] = None
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Returns the `limit` heaviest truck days as (truck ID, day, total weight).
+        """
+        query = "SELECT truck_id, day, total_weight FROM days"
+        return self._query(query, truck_id, "ORDER BY total_weight DESC LIMIT ?", (limit,))
+
+    def _query(self, query: str, truck_id: Optional[str], suffix: str, parameters=()) -> list:
+        arguments: tuple = ()
+        if truck_id is not None:
+            query += " WHERE days.truck_id = ?"
+            arguments = (truck_id,)
+        return self.connection.execute(f"{query} {suffix}", arguments + parameters).fetchall()
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
@@ -0,0 +1,413 @@
+import json
+import os
+from array import array
+from collections import deque
+from typing import IO, Iterator, List, Optional, Tuple
+
+from core.stop import Stop
+from core.store import ColumnarStore
+from core.transaction import Savepoint
+from core.truck import Packge, Truck, packge_cache
+
+
+class Journal:
+    """
+    An append-only JSON Lines write-ahead log of the mutations of a truck.
+
+    Every mutation of an attached `Truck` (`start_day`, `insert_package`, `insert_packages`,
+    `remove_package`, `remove_packages`, `remove_package_by_id`, `begin_stop`, `close_stop`,
+    `finish_day`, the stop transactions, and the packages queued by the "queue" admission or
+    admitted by `admit_pending`) is appended as one compact JSON record with a sequence number.
+    Records are flushed and fsynced every `sync_every` appends, and every `snapshot_every`
+    appends the whole truck state, with the admission mode and its queue, is written to
+    `<path>.snapshot` and the log is truncated, which keeps recovery time bounded.
+
+    Example Usage:
+        journal = Journal("caminhao.journal")
+        truck = Truck()
+        journal.attach(truck)
+        truck.start_day(10, 1000)
+        ...
+        truck = recover("caminhao.journal")  # after a crash
+
+    Args:
+        path (str): The journal file.
+        sync_every (int): The number of appends between two fsyncs.
+        snapshot_every (Optional[int]): The number of appends between two snapshots, or None
+            to only snapshot on demand.
+        start_seq (int): The sequence number of the last record already written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_every: int = 100,
+        snapshot_every: Optional[int] = None,
+        start_seq: int = 0,
+    ) -> None:
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+        self.seq = start_seq
+        self.truck: Optional[Truck] = None
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._file: IO[str] = open(path, "a")
+
+    def attach(self, truck: Truck) -> Truck:
+        """
+        Starts journaling the mutations of `truck` and returns it.
+
+        A snapshot of the current state is taken first, so the log never depends on mutations
+        made before the truck was attached.
+        """
+        self.truck = truck
+        truck.journal = self
+        self.snapshot()
+        return truck
+
+    def append(self, op: str, **fields) -> None:
+        """
+        Appends one mutation record to the log.
+        """
+        self.seq += 1
+        record = {"seq": self.seq, "op": op}
+        record.update(fields)
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+        self._unsynced += 1
+        self._since_snapshot += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def sync(self) -> None:
+        """
+        Flushes the buffered records and forces them to disk.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def snapshot(self) -> None:
+        """
+        Writes the state of the attached truck to the snapshot file and truncates the log.
+
+        The snapshot is written to a temporary file and atomically renamed, and it records the
+        sequence number it covers, so a crash at any point leaves a recoverable pair of files.
+        """
+        if self.truck is None:
+            return
+        self.sync()
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"seq": self.seq, "state": truck_state(self.truck)}, f,
+                      separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.snapshot_path)
+        self._file.close()
+        self._file = open(self.path, "w")
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        """
+        Syncs and closes the log.
+        """
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+        if self.truck is not None and self.truck.journal is self:
+            self.truck.journal = None
+
+
+def truck_state(truck: Truck) -> dict:
+    """
+    Returns the state of `truck` as a JSON-serialisable dictionary.
+    """
+    return {
+        "max_weight_setted": truck.max_weight_setted,
+        "volume": truck.volume,
+        "admission": truck.admission,
+        "check_consistency": truck.check_consistency,
+        "pending": _packge_rows(truck.pending),
+        "current_day": truck.current_day,
+        "current_capacity": truck.current_capacity,
+        "stops": truck.stops,
+        "qtd_packages_by_stop": list(truck.qtd_packages_by_stop),
+        "columnar": isinstance(truck.load_list, ColumnarStore),
+        "weights": list(truck._weights()),
+        "values": list(truck._values()),
+        "stop_records": [stop_state(stop) for stop in truck.stop_records],
+        "current_stop": None if truck.current_stop is None else stop_state(truck.current_stop),
+        "version": truck.version,
+        "package_ids": (
+            None if truck.package_ids.ids is None else truck.package_ids.ids.tolist()),
+        "next_id": truck.package_ids.next_id,
+        "history_size": truck.history_size,
+        "transaction": (
+            None if truck.transaction is None else savepoint_state(truck.transaction)),
+        "undo_history": [savepoint_state(savepoint) for savepoint in truck.undo_history],
+        "redo_history": [savepoint_state(savepoint) for savepoint in truck.redo_history],
+    }
+
+
+def stop_state(stop: Stop) -> dict:
+    """
+    Returns the record of a stop as a JSON-serialisable dictionary.
+    """
+    return {
+        "index": stop.index,
+        "opened_at": stop.opened_at,
+        "location": stop.location,
+        "closed_at": stop.closed_at,
+        "added": stop.added.tolist(),
+        "removed": stop.removed.tolist(),
+        "weight_delta": stop.weight_delta,
+        "weight_at_close": stop.weight_at_close,
+    }
+
+
+def stop_from_state(state: dict) -> Stop:
+    """
+    Rebuilds a stop from the dictionary returned by `stop_state`.
+    """
+    stop = Stop(state["index"], state["opened_at"], _location(state))
+    stop.closed_at = state["closed_at"]
+    stop.added.extend(state["added"])
+    stop.removed.extend(state["removed"])
+    stop.weight_delta = state["weight_delta"]
+    stop.weight_at_close = state["weight_at_close"]
+    return stop
+
+
+def _packge_rows(packges) -> list:
+    return [[packge.weight, packge.value] for packge in packges]
+
+
+def _packges(rows) -> list:
+    return [packge_cache.get(weight, value) for weight, value in rows]
+
+
+def _location(record: dict) -> Optional[Tuple[float, float]]:
+    location = record.get("location")
+    return tuple(location) if location else None
+
+
+def savepoint_state(savepoint: Savepoint) -> dict:
+    """
+    Returns a stop transaction savepoint as a JSON-serialisable dictionary.
+    """
+    return {
+        "version": savepoint.version,
+        "end_version": savepoint.end_version,
+        "stop": stop_state(savepoint.stop),
+        "opened_stop": savepoint.opened_stop,
+        "stop_sizes": list(savepoint.stop_sizes),
+        "stops": savepoint.stops,
+        "mark": savepoint.mark,
+        "low": savepoint.low,
+        "removed": _packge_rows(savepoint.removed),
+        "removed_ids": list(savepoint.removed_ids),
+        "next_id": savepoint.next_id,
+        "totals": list(savepoint.totals),
+        "extremes": list(savepoint.extremes),
+        "pending": _packge_rows(savepoint.pending),
+        "operations": [
+            [kind, _packge_rows(payload) if kind == "insert" else payload]
+            for kind, payload in savepoint.operations
+        ],
+        "packages_at_stop": savepoint.packages_at_stop,
+        "pending_after": (
+            None if savepoint.pending_after is None else _packge_rows(savepoint.pending_after)),
+    }
+
+
+def savepoint_from_state(state: dict, truck: Truck) -> Savepoint:
+    """
+    Rebuilds a savepoint from the dictionary returned by `savepoint_state`.
+
+    The stop is shared with `truck` when it is its open stop or one of its closed stops.
+    """
+    index = state["stop"]["index"]
+    if truck.current_stop is not None and truck.current_stop.index == index:
+        stop = truck.current_stop
+    elif index <= len(truck.stop_records) and truck.stop_records[index - 1].index == index:
+        stop = truck.stop_records[index - 1]
+    else:
+        stop = stop_from_state(state["stop"])
+    savepoint = Savepoint(
+        state["version"],
+        stop,
+        state["opened_stop"],
+        state["stops"],
+        state["mark"],
+        state.get("next_id", state["mark"] + 1),
+        tuple(state["totals"]),
+        tuple(state["extremes"]),
+        deque(_packges(state["pending"])),
+    )
+    savepoint.end_version = state["end_version"]
+    savepoint.stop_sizes = tuple(state["stop_sizes"])
+    savepoint.low = state["low"]
+    savepoint.removed = _packges(state["removed"])
+    savepoint.removed_ids = state.get(
+        "removed_ids", list(range(savepoint.low + len(savepoint.removed), savepoint.low, -1)))
+    savepoint.operations = [
+        (kind, _packges(payload) if kind == "insert" else payload)
+        for kind, payload in state["operations"]
+    ]
+    savepoint.packages_at_stop = state["packages_at_stop"]
+    if state["pending_after"] is not None:
+        savepoint.pending_after = deque(_packges(state["pending_after"]))
+    return savepoint
+
+
+def truck_from_state(state: dict) -> Truck:
+    """
+    Rebuilds a truck from the dictionary returned by `truck_state`.
+    """
+    packges = [
+        packge_cache.get(weight, value)
+        for weight, value in zip(state["weights"], state["values"])]
+    load_list = ColumnarStore(packges) if state.get("columnar") else packges
+    truck = Truck(
+        max_weight_setted=state["max_weight_setted"],
+        volume=state["volume"],
+        current_day=state["current_day"],
+        current_capacity=state["current_capacity"],
+        load_list=load_list,
+        stops=state["stops"],
+        qtd_packages_by_stop=list(state["qtd_packages_by_stop"]),
+        history_size=state.get("history_size", 20),
+        admission=state.get("admission", "allow"),
+        check_consistency=state.get("check_consistency", False),
+    )
+    truck.pending.extend(_packges(state.get("pending", ())))
+    truck.stop_records = [stop_from_state(stop) for stop in state.get("stop_records", ())]
+    if state.get("current_stop") is not None:
+        truck.current_stop = stop_from_state(state["current_stop"])
+    truck.version = state.get("version", 0)
+    if state.get("package_ids") is not None:
+        truck.package_ids.ids = array("q", state["package_ids"])
+    truck.package_ids.next_id = state.get("next_id", truck.package_ids.next_id)
+    if state.get("transaction") is not None:
+        truck.transaction = savepoint_from_state(state["transaction"], truck)
+    truck.undo_history.extend(
+        savepoint_from_state(savepoint, truck) for savepoint in state.get("undo_history", ()))
+    truck.redo_history.extend(
+        savepoint_from_state(savepoint, truck) for savepoint in state.get("redo_history", ()))
+    return truck
+
+
+def read_records(path: str, after_seq: int = 0) -> Iterator[dict]:
+    """
+    Yields the records of a journal with a sequence number above `after_seq`.
+
+    A torn last line, left by a crash in the middle of a write, ends the log.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                return
+            if record["seq"] > after_seq:
+                yield record
+
+
+def replay(truck: Truck, records: Iterator[dict]) -> int:
+    """
+    Applies journal records to `truck` and returns the sequence number of the last one.
+
+    Consecutive `insert_package` records are applied with one `insert_packages` call.
+    """
+    seq = 0
+    pending: List[Packge] = []
+    for record in records:
+        seq = record["seq"]
+        op = record["op"]
+        if op == "insert_package":
+            pending.append(Packge(record["weight"], record["value"]))
+            continue
+        if pending:
+            truck.insert_packages(pending)
+            pending = []
+        if op == "start_day":
+            truck.start_day(record["volume"], record["weight"])
+        elif op == "insert_packages":
+            truck.insert_packages(
+                packge_cache.get(weight, value) for weight, value in record["packages"])
+        elif op == "queue_packages":
+            truck.pending.extend(_packges(record["packages"]))
+        elif op == "admit_pending":
+            admitted = set(record["indices"])
+            truck.pending = deque(
+                packge for index, packge in enumerate(truck.pending) if index not in admitted)
+        elif op == "remove_package":
+            truck.remove_package()
+        elif op == "remove_packages":
+            truck.remove_packages(record["count"])
+        elif op == "remove_package_id":
+            truck.remove_package_by_id(record["id"])
+        elif op == "begin_stop":
+            stop = truck.begin_stop(_location(record))
+            stop.opened_at = record.get("at", stop.opened_at)
+        elif op == "close_stop":
+            stop = truck.close_stop(record["packages"])
+            stop.closed_at = record.get("at", stop.closed_at)
+            truck.stops = record["stops"]
+        elif op == "begin_transaction":
+            stop = truck.begin_transaction(_location(record))
+            stop.opened_at = record.get("at", stop.opened_at)
+        elif op == "commit":
+            stop = truck.commit(record["packages"])
+            stop.closed_at = record.get("at", stop.closed_at)
+        elif op == "rollback":
+            truck.rollback()
+        elif op == "undo_stop":
+            truck.undo_stop()
+        elif op == "redo_stop":
+            truck.redo_stop()
+        elif op == "finish_day":
+            truck.finish_day()
+    if pending:
+        truck.insert_packages(pending)
+    return seq
+
+
+def recover(path: str, attach: bool = True, **journal_options) -> Truck:
+    """
+    Rebuilds a truck from its snapshot and journal.
+
+    Parameters
+    ----------
+    path : str
+        The journal file.
+    attach : bool
+        When enabled, the recovered truck keeps journaling to the same file.
+    journal_options
+        Extra arguments for the new `Journal` (`sync_every`, `snapshot_every`).
+
+    Returns
+    -------
+    Truck
+        The recovered truck.
+    """
+    truck, seq = _load_snapshot(f"{path}.snapshot")
+    seq = max(seq, replay(truck, read_records(path, seq)))
+    if attach:
+        Journal(path, start_seq=seq, **journal_options).attach(truck)
+    return truck
+
+
+def _load_snapshot(snapshot_path: str) -> Tuple[Truck, int]:
+    if not os.path.exists(snapshot_path):
+        return Truck(), 0
+    with open(snapshot_path, "r") as f:
+        snapshot = json.load(f)
+    return truck_from_state(snapshot["state"]), snapshot["seq"]
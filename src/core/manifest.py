@@ -0,0 +1,398 @@
+import os
+import struct
+import sys
+from array import array
+from mmap import ACCESS_READ, mmap
+from typing import Iterable, Iterator, Union
+
+from core.store import ColumnarStore
+from core.truck import TRANSPORT_COST_PER_KG, Packge, Truck
+
+
+"""
+A compact binary manifest of the packages of a truck day, read through a memory map.
+
+A manifest is a fixed 40-byte header followed by the packed package records, stored column by
+column: every weight as a little-endian int32, then, aligned to 8 bytes, every value as a
+little-endian float64. Opening a manifest maps the file and casts both columns to memoryviews,
+so no Python object is created per package until one is read, and the pages are loaded by the
+operating system only when they are touched. A `Manifest` keeps its file open until it is
+closed, which a `MappedStore` does once it copies its columns or is closed itself.
+
+Header layout (`HEADER`, little-endian):
+    magic       8 bytes   b"TRUCKMAN"
+    version     uint16    MANIFEST_VERSION
+    record_size uint16    RECORD_SIZE, the bytes per package (4 + 8)
+    flags       uint32    FLAG_CURRENT_DAY when the day was in progress
+    count       int64     the number of packages
+    volume      int64     the volume of the truck
+    max_weight  int64     the maximum weight set for the truck
+
+Example Usage:
+    truck.export_manifest("dia.manifest")
+    truck = Truck.from_manifest("dia.manifest")
+"""
+
+
+MANIFEST_MAGIC = b"TRUCKMAN"
+MANIFEST_VERSION = 1
+HEADER = struct.Struct("<8sHHIqqq")
+RECORD_SIZE = 12
+FLAG_CURRENT_DAY = 1
+
+Column = Union[array, memoryview]
+
+
+def values_offset(count: int) -> int:
+    """
+    Returns the offset of the value column of a manifest of `count` packages.
+    """
+    return (HEADER.size + 4 * count + 7) & ~7
+
+
+class Manifest:
+    """
+    A manifest file mapped read-only in memory.
+
+    Reading a package creates a `Packge`; the columns can also be read directly, without
+    creating any package. The file stays mapped until `close` is called, or the `with` block
+    the manifest was opened in ends.
+
+    Attributes
+    ----------
+    path : str
+        The manifest file.
+    volume : int
+        The volume of the truck.
+    max_weight : int
+        The maximum weight set for the truck.
+    current_day : bool
+        Indicates if the day was in progress when the manifest was written.
+    weights : memoryview
+        The weight of each package, in loading order.
+    values : memoryview
+        The value of each package, in loading order.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a manifest or is truncated.
+    """
+
+    __slots__ = (
+        "path", "volume", "max_weight", "current_day", "weights", "values", "_map", "_view")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"Manifesto inválido: {path}")
+            self._map = mmap(f.fileno(), 0, access=ACCESS_READ)
+        magic, version, record_size, flags, count, volume, max_weight = (
+            HEADER.unpack_from(self._map))
+        if magic != MANIFEST_MAGIC or record_size != RECORD_SIZE:
+            self._map.close()
+            raise ValueError(f"Manifesto inválido: {path}")
+        if version != MANIFEST_VERSION:
+            self._map.close()
+            raise ValueError(f"Versão de manifesto não suportada: {version}")
+        offset = values_offset(count)
+        if len(self._map) < offset + 8 * count:
+            self._map.close()
+            raise ValueError(f"Manifesto truncado: {path}")
+        self.volume = volume
+        self.max_weight = max_weight
+        self.current_day = bool(flags & FLAG_CURRENT_DAY)
+        self._view = view = memoryview(self._map)
+        self.weights = view[HEADER.size:HEADER.size + 4 * count].cast("i")
+        self.values = view[offset:offset + 8 * count].cast("d")
+        if sys.byteorder == "big":
+            self.weights = _swapped("i", self.weights)
+            self.values = _swapped("d", self.values)
+
+    @property
+    def closed(self) -> bool:
+        """
+        Indicates if the file was unmapped.
+        """
+        return self._map.closed
+
+    def close(self) -> None:
+        """
+        Releases the columns and unmaps the file. The columns cannot be read afterwards.
+
+        Raises
+        ------
+        BufferError
+            If a view of the columns, such as a slice, is still in use.
+        """
+        if self._map.closed:
+            return
+        for column in (self.weights, self.values, self._view):
+            if isinstance(column, memoryview):
+                column.release()
+        self._map.close()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def __getitem__(self, index: int) -> Packge:
+        return Packge(self.weights[index], self.values[index])
+
+    def __iter__(self) -> Iterator[Packge]:
+        for weight, value in zip(self.weights, self.values):
+            yield Packge(weight, value)
+
+    def __repr__(self) -> str:
+        return f"Manifest({self.path!r}, {len(self)} pacotes)"
+
+
+def _swapped(typecode: str, column: Column) -> array:
+    """
+    Returns a copy of a little-endian column in the native byte order of a big-endian host.
+    """
+    swapped = array(typecode)
+    swapped.frombytes(memoryview(column).cast("B"))
+    swapped.byteswap()
+    return swapped
+
+
+class TransportCostColumn:
+    """
+    The transport costs of a `MappedStore`, computed from its weight column when read.
+    """
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store: "MappedStore") -> None:
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store.weights)
+
+    def __getitem__(self, index: int) -> float:
+        return self._store.weights[index] * TRANSPORT_COST_PER_KG
+
+    def __iter__(self) -> Iterator[float]:
+        return map(TRANSPORT_COST_PER_KG.__mul__, self._store.weights)
+
+
+class MappedStore(ColumnarStore):
+    """
+    A `ColumnarStore` whose columns are read from a mapped `Manifest`.
+
+    Unloading from the end of the load only shortens the mapped columns. The columns are copied
+    into packed arrays the first time a package is loaded, replaced or removed from the middle
+    of the load, or when the store is closed; the manifest is closed then and the store behaves
+    like a regular `ColumnarStore`.
+
+    Attributes
+    ----------
+    manifest : Optional[Manifest]
+        The mapped manifest, or None once the columns were copied.
+    """
+
+    __slots__ = ("manifest",)
+
+    def __init__(self, manifest: Manifest) -> None:
+        self.manifest = manifest
+        self.weights = manifest.weights
+        self.values = manifest.values
+        self.transport_costs = TransportCostColumn(self)
+
+    @property
+    def mapped(self) -> bool:
+        """
+        Indicates if the columns are still read from the manifest.
+        """
+        return self.manifest is not None
+
+    def close(self) -> None:
+        """
+        Copies the columns still read from the manifest and closes it, releasing its file.
+        """
+        if self.mapped:
+            self._copy_columns()
+
+    def _copy_columns(self) -> None:
+        """
+        Copies the mapped columns into packed arrays and closes the manifest.
+        """
+        weights = array("i")
+        weights.frombytes(memoryview(self.weights).cast("B"))
+        values = array("d")
+        values.frombytes(memoryview(self.values).cast("B"))
+        self._release(weights, values)
+        self.transport_costs = array("d", map(TRANSPORT_COST_PER_KG.__mul__, weights))
+
+    def _release(self, weights: array, values: array) -> None:
+        """
+        Replaces the mapped columns with `weights` and `values` and closes the manifest.
+        """
+        for column in (self.weights, self.values):
+            if isinstance(column, memoryview):
+                column.release()
+        self.weights = weights
+        self.values = values
+        self.manifest.close()
+        self.manifest = None
+
+    def _truncate(self, length: int) -> None:
+        """
+        Keeps the first `length` packages of the mapped columns.
+        """
+        self.weights = self.weights[:length]
+        self.values = self.values[:length]
+
+    def append(self, packge: Packge) -> None:
+        if self.mapped:
+            self._copy_columns()
+        super().append(packge)
+
+    def extend(self, packges: Iterable[Packge]) -> None:
+        packges = list(packges)
+        if packges and self.mapped:
+            self._copy_columns()
+        super().extend(packges)
+
+    def pop(self, index: int = -1) -> Packge:
+        if self.mapped:
+            length = len(self.weights)
+            if index in (-1, length - 1) and length:
+                packge = Packge(self.weights[-1], self.values[-1])
+                self._truncate(length - 1)
+                return packge
+            self._copy_columns()
+        return super().pop(index)
+
+    def __setitem__(self, index: int, packge: Packge) -> None:
+        if self.mapped:
+            self._copy_columns()
+        super().__setitem__(index, packge)
+
+    def __delitem__(self, index) -> None:
+        if self.mapped:
+            length = len(self.weights)
+            if isinstance(index, slice) and index.step in (None, 1):
+                start, stop, _ = index.indices(length)
+                if stop == length:
+                    self._truncate(min(start, length))
+                    return
+            self._copy_columns()
+        super().__delitem__(index)
+
+    def clear(self) -> None:
+        if self.mapped:
+            self._release(array("i"), array("d"))
+        else:
+            self.weights = array("i")
+            self.values = array("d")
+        self.transport_costs = array("d")
+
+    def __repr__(self) -> str:
+        return f"MappedStore({len(self)} pacotes)"
+
+
+def _column(typecode: str, values: Iterable) -> Column:
+    """
+    Returns `values` as a packed column of `typecode`, copying it only when it is not one.
+    """
+    if isinstance(values, array) and values.typecode == typecode:
+        column = values
+    elif isinstance(values, memoryview) and values.format == typecode:
+        column = values
+    else:
+        column = array(typecode, values)
+    if sys.byteorder == "big":
+        column = _swapped(typecode, column)
+    return column
+
+
+def write_manifest(
+    path: str,
+    weights: Iterable[int],
+    values: Iterable[float],
+    volume: int = 0,
+    max_weight: int = 0,
+    current_day: bool = False,
+) -> str:
+    """
+    Writes a manifest of the packages with the given weights and values.
+
+    Packed columns (`array` or `memoryview`) are written as they are; other iterables are
+    packed first. The file is replaced atomically.
+
+    Returns
+    -------
+    str
+        The path of the written manifest.
+
+    Raises
+    ------
+    ValueError
+        If there is not one value per weight.
+    """
+    weights = _column("i", weights)
+    values = _column("d", values)
+    count = len(weights)
+    if len(values) != count:
+        raise ValueError("O manifesto precisa de um valor para cada peso")
+    flags = FLAG_CURRENT_DAY if current_day else 0
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(
+            MANIFEST_MAGIC, MANIFEST_VERSION, RECORD_SIZE, flags, count, volume, max_weight))
+        f.write(weights)
+        f.write(bytes(values_offset(count) - HEADER.size - 4 * count))
+        f.write(values)
+    os.replace(temporary, path)
+    return path
+
+
+def export_manifest(truck: Truck, path: str) -> str:
+    """
+    Writes the packages loaded in `truck`, with its volume and maximum weight, as a manifest.
+
+    A truck still mapping the manifest at `path` closes it first, so the file can be replaced.
+    """
+    store = truck.load_list
+    if (isinstance(store, MappedStore) and store.mapped
+            and os.path.abspath(store.manifest.path) == os.path.abspath(path)):
+        store.close()
+    return write_manifest(
+        path,
+        truck._weights(),
+        truck._values(),
+        truck.volume,
+        truck.max_weight_setted,
+        truck.current_day,
+    )
+
+
+def load_manifest(path: str) -> Truck:
+    """
+    Rebuilds a truck from a manifest, with the packages loaded in a `MappedStore`.
+
+    The running totals and the indexes are computed from the mapped columns, without creating
+    a package per record. The file stays open until `truck.load_list.close()` is called or the
+    truck is discarded; it is closed right away if the truck cannot be built.
+    """
+    manifest = Manifest(path)
+    try:
+        truck = Truck(
+            max_weight_setted=manifest.max_weight,
+            volume=manifest.volume,
+            current_day=manifest.current_day,
+            load_list=MappedStore(manifest),
+        )
+    except BaseException:
+        manifest.close()
+        raise
+    truck.current_capacity = truck.total_weight
+    return truck
@@ -0,0 +1,225 @@
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+
+"""
+Call counters, latency histograms and error counters for the Truck Manager operations.
+
+Operations decorated with `core.decorators.instrumented` report to the module-level `metrics`
+registry. The registry is disabled by default, and a disabled registry costs one attribute
+check per call. Once enabled, the collected metrics can be exported as a Prometheus text file
+or as a JSON snapshot, and `profile_session` captures a cProfile and tracemalloc profile of a
+whole session.
+
+Example Usage:
+    metrics.enable()
+    truck.insert_package(Packge(10, 100.0))
+    metrics.write("metricas.prom")
+"""
+
+
+LATENCY_BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005,
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    A latency histogram with fixed bucket bounds, in seconds.
+
+    Attributes
+    ----------
+    bounds : Tuple[float, ...]
+        The upper bound of each bucket; an implicit last bucket holds slower calls.
+    counts : List[int]
+        The number of observations in each bucket (not cumulative).
+    count : int
+        The number of observations.
+    total : float
+        The sum of the observations.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records one observation.
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """
+        Yields each bucket bound (ending with "+Inf") and the observations up to it.
+        """
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            yield repr(bound), running
+        yield "+Inf", self.count
+
+
+class MetricsRegistry:
+    """
+    Collects call, error and latency metrics per operation.
+
+    Attributes
+    ----------
+    enabled : bool
+        Indicates if instrumented operations are measured.
+    calls : Dict[str, int]
+        The number of calls of each operation.
+    errors : Dict[str, int]
+        The number of calls of each operation that raised or were refused.
+    latencies : Dict[str, Histogram]
+        The latency histogram of each operation.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latencies: Dict[str, Histogram] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Forgets every collected metric.
+        """
+        self.calls.clear()
+        self.errors.clear()
+        self.latencies.clear()
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        """
+        Records one call of the operation `name`.
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if error:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        histogram = self.latencies.get(name)
+        if histogram is None:
+            histogram = self.latencies[name] = Histogram()
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the collected metrics as a JSON-serialisable dictionary.
+        """
+        return {
+            name: {
+                "calls": calls,
+                "errors": self.errors.get(name, 0),
+                "seconds_total": self.latencies[name].total,
+                "buckets": dict(self.latencies[name].cumulative()),
+            }
+            for name, calls in sorted(self.calls.items())
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+        """
+        lines: List[str] = [
+            "# HELP truck_manager_calls_total Calls of each operation.",
+            "# TYPE truck_manager_calls_total counter",
+        ]
+        for name, calls in sorted(self.calls.items()):
+            lines.append(f'truck_manager_calls_total{{operation="{name}"}} {calls}')
+        lines += [
+            "# HELP truck_manager_errors_total Calls of each operation that raised or were "
+            "refused.",
+            "# TYPE truck_manager_errors_total counter",
+        ]
+        for name in sorted(self.calls):
+            lines.append(
+                f'truck_manager_errors_total{{operation="{name}"}} {self.errors.get(name, 0)}')
+        lines += [
+            "# HELP truck_manager_latency_seconds Latency of each operation.",
+            "# TYPE truck_manager_latency_seconds histogram",
+        ]
+        for name, histogram in sorted(self.latencies.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(
+                    f'truck_manager_latency_seconds_bucket{{operation="{name}",le="{bound}"}} '
+                    f"{count}")
+            lines.append(
+                f'truck_manager_latency_seconds_sum{{operation="{name}"}} {histogram.total}')
+            lines.append(
+                f'truck_manager_latency_seconds_count{{operation="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> str:
+        """
+        Writes the metrics to `path`: a JSON snapshot when it ends in `.json`, the Prometheus
+        text format otherwise. The file is replaced atomically, so a scraper never reads a
+        partial export.
+        """
+        if path.endswith(".json"):
+            import json
+
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(text)
+        os.replace(temporary, path)
+        return path
+
+
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def profile_session(prefix: str, memory: bool = True, top: int = 30) -> Iterator[None]:
+    """
+    Profiles the enclosed block with cProfile and, optionally, tracemalloc.
+
+    On exit, even through `sys.exit`, the cProfile statistics are written to `<prefix>.prof`
+    (readable with `python -m pstats`) and the `top` lines allocating the most memory to
+    `<prefix>.memory.txt`.
+
+    Example Usage:
+        with profile_session("sessao"):
+            main()
+    """
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        profiler.dump_stats(f"{prefix}.prof")
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            statistics = tracemalloc.take_snapshot().statistics("lineno")[:top]
+            tracemalloc.stop()
+            with open(f"{prefix}.memory.txt", "w") as f:
+                f.write(f"duração: {elapsed:.3f}s\n")
+                f.write(f"memória atual: {current} bytes, pico: {peak} bytes\n\n")
+                for statistic in statistics:
+                    f.write(f"{statistic}\n")
@@ -0,0 +1,88 @@
+import time
+from bisect import bisect_right
+from typing import List, Sequence
+
+from core.truck import Packge
+
+
+def select_packages(
+    candidates: Sequence[Packge], capacity: int, time_budget: float = 0.05
+) -> List[int]:
+    """
+    Picks the highest-value subset of `candidates` whose total weight fits in `capacity`.
+
+    The candidates are sorted by value per kg and explored depth-first with branch-and-bound:
+    the first dive is the classic greedy solution, and branches whose fractional (linear
+    relaxation) bound cannot beat the best subset found so far are pruned. The bound is computed
+    in O(log n) with prefix sums. When `time_budget` runs out, the best subset found so far is
+    returned, so the call stays fast even for manifests with thousands of packages.
+
+    Parameters
+    ----------
+    candidates : Sequence[Packge]
+        The pending packages.
+    capacity : int
+        The remaining weight, in kg.
+    time_budget : float
+        The maximum search time, in seconds.
+
+    Returns
+    -------
+    List[int]
+        The indices of the selected candidates, in ascending order.
+    """
+    deadline = time.perf_counter() + time_budget
+    selected = [
+        index for index, packge in enumerate(candidates)
+        if packge.weight <= 0 and packge.value > 0
+    ]
+    order = sorted(
+        (index for index, packge in enumerate(candidates)
+         if 0 < packge.weight <= capacity and packge.value > 0),
+        key=lambda index: candidates[index].value / candidates[index].weight,
+        reverse=True,
+    )
+    weights = [candidates[index].weight for index in order]
+    values = [candidates[index].value for index in order]
+    count = len(order)
+
+    prefix_weights = [0] * (count + 1)
+    prefix_values = [0.0] * (count + 1)
+    for position in range(count):
+        prefix_weights[position + 1] = prefix_weights[position] + weights[position]
+        prefix_values[position + 1] = prefix_values[position] + values[position]
+
+    def bound(position: int, remaining: int, value: float) -> float:
+        last = bisect_right(prefix_weights, prefix_weights[position] + remaining) - 1
+        bound_value = value + prefix_values[last] - prefix_values[position]
+        if last < count:
+            used = prefix_weights[last] - prefix_weights[position]
+            bound_value += (remaining - used) * values[last] / weights[last]
+        return bound_value
+
+    best_value = -1.0
+    best_path: List[int] = []
+    path: List[int] = []
+    stack = [(0, capacity, 0.0, 0)]
+    nodes = 0
+    while stack:
+        position, remaining, value, depth = stack.pop()
+        del path[depth:]
+        while position < count:
+            if bound(position, remaining, value) <= best_value:
+                break
+            if weights[position] <= remaining:
+                stack.append((position + 1, remaining, value, len(path)))
+                path.append(position)
+                remaining -= weights[position]
+                value += values[position]
+            position += 1
+        if value > best_value:
+            best_value = value
+            best_path = path.copy()
+        nodes += 1
+        if nodes % 256 == 0 and time.perf_counter() > deadline:
+            break
+
+    selected.extend(order[position] for position in best_path)
+    return sorted(selected)
@@ -0,0 +1,294 @@
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from core.truck import INSURANCE_RATE, INSURANCE_VOLUME_FACTOR, BatchResult, Packge, Truck
+
+
+def insurance_cost(weight: int, volume: int) -> float:
+    """
+    The `Packge.extra_insurance_cost` rule, on a bare weight and truck volume.
+    """
+    return (weight - volume) * INSURANCE_RATE if volume * INSURANCE_VOLUME_FACTOR < weight else 0
+
+
+@dataclass
+class FleetPlan:
+    """
+    An assignment of packages to the trucks of a fleet.
+
+    Attributes
+    ----------
+    assignments : array
+        The index of the truck of each package, or -1 when it does not fit anywhere.
+    loads : List[int]
+        The weight assigned to each truck.
+    insurance_cost : float
+        The total insurance surcharge of the plan.
+    """
+
+    assignments: array
+    loads: List[int]
+    insurance_cost: float = 0.0
+
+    @property
+    def trucks_used(self) -> int:
+        """
+        The number of trucks with at least one package.
+        """
+        return sum(1 for load in self.loads if load > 0)
+
+    @property
+    def unassigned(self) -> List[int]:
+        """
+        The indices of the packages that did not fit in any truck.
+        """
+        return [index for index, truck in enumerate(self.assignments) if truck < 0]
+
+    def score(self) -> Tuple[int, int, float]:
+        """
+        The plan quality, smaller is better: unassigned packages, trucks used, insurance.
+        """
+        return (len(self.unassigned), self.trucks_used, round(self.insurance_cost, 6))
+
+
+class _FirstFitTree:
+    """
+    A max segment tree over the remaining capacity of the trucks.
+
+    `first_fit(weight)` returns the leftmost truck with at least `weight` kg left, in O(log n).
+    Trucks with a negative remaining capacity are never returned.
+    """
+
+    def __init__(self, remaining: Sequence[int]) -> None:
+        self.size = 1
+        while self.size < len(remaining):
+            self.size *= 2
+        self.tree = [-1] * (2 * self.size)
+        self.tree[self.size:self.size + len(remaining)] = remaining
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def first_fit(self, weight: int) -> int:
+        return self._find(1, 0, self.size, weight)
+
+    def _find(self, node: int, low: int, high: int, weight: int) -> int:
+        if self.tree[node] < weight:
+            return -1
+        if high - low == 1:
+            return low
+        middle = (low + high) // 2
+        found = self._find(2 * node, low, middle, weight)
+        if found < 0:
+            found = self._find(2 * node + 1, middle, high, weight)
+        return found
+
+    def update(self, position: int, remaining: int) -> None:
+        node = position + self.size
+        self.tree[node] = remaining
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+
+def first_fit_decreasing(
+    weights: Sequence[int], volumes: Sequence[int], capacities: Sequence[int]
+) -> FleetPlan:
+    """
+    Assigns packages to trucks with first-fit decreasing.
+
+    Trucks are ordered by capacity, largest first, and packages are taken from the heaviest to
+    the lightest. Each package goes to the first truck with room where it has no insurance
+    surcharge, unless that would open a new truck while an already used truck has room. Two
+    segment trees, one over all the trucks and one over the trucks without surcharge, make each
+    placement O(log n); since the weights only decrease, trucks join the second tree once.
+    """
+    order = sorted(range(len(volumes)), key=lambda t: (capacities[t], volumes[t]), reverse=True)
+    remaining = [capacities[t] for t in order]
+    every_truck = _FirstFitTree(remaining)
+    free_trucks = _FirstFitTree([-1] * len(order))
+    by_threshold = sorted(
+        range(len(order)), key=lambda position: volumes[order[position]], reverse=True)
+    activated = 0
+
+    assignments = array("i", [-1]) * len(weights)
+    loads = [0] * len(volumes)
+    total_insurance = 0.0
+    for index in sorted(range(len(weights)), key=weights.__getitem__, reverse=True):
+        weight = weights[index]
+        while (activated < len(by_threshold)
+               and volumes[order[by_threshold[activated]]] * INSURANCE_VOLUME_FACTOR >= weight):
+            position = by_threshold[activated]
+            free_trucks.update(position, remaining[position])
+            activated += 1
+        position = every_truck.first_fit(weight)
+        if position < 0:
+            continue
+        free = free_trucks.first_fit(weight)
+        if free >= 0 and (loads[order[free]] > 0 or loads[order[position]] == 0):
+            position = free
+        truck = order[position]
+        remaining[position] -= weight
+        every_truck.update(position, remaining[position])
+        if free_trucks.tree[free_trucks.size + position] >= 0:
+            free_trucks.update(position, remaining[position])
+        assignments[index] = truck
+        loads[truck] += weight
+        total_insurance += insurance_cost(weight, volumes[truck])
+    return FleetPlan(assignments, loads, total_insurance)
+
+
+def improve_plan(
+    plan: FleetPlan,
+    weights: Sequence[int],
+    volumes: Sequence[int],
+    capacities: Sequence[int],
+    time_budget: float = 1.0,
+    seed: int = 0,
+) -> FleetPlan:
+    """
+    Improves a plan with local search until `time_budget` runs out.
+
+    Two moves are tried: relocating a package to a used truck with room where its insurance
+    surcharge is lower, and emptying a lightly loaded truck by relocating all its packages into
+    the other used trucks, preferring those where they have no surcharge. `seed` randomises the
+    order of the trucks tried, so independent runs explore different neighbourhoods.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    assignments = array("i", plan.assignments)
+    loads = list(plan.loads)
+    packages_of: List[List[int]] = [[] for _ in volumes]
+    for index, truck in enumerate(assignments):
+        if truck >= 0:
+            packages_of[truck].append(index)
+
+    def move(index: int, source: int, target: int) -> None:
+        packages_of[source].remove(index)
+        packages_of[target].append(index)
+        assignments[index] = target
+        loads[source] -= weights[index]
+        loads[target] += weights[index]
+
+    by_volume = sorted(range(len(volumes)), key=volumes.__getitem__, reverse=True)
+    for index, truck in enumerate(assignments):
+        if time.perf_counter() > deadline:
+            break
+        if truck < 0 or insurance_cost(weights[index], volumes[truck]) == 0:
+            continue
+        for target in by_volume:
+            if volumes[target] <= volumes[truck]:
+                break
+            if loads[target] > 0 and capacities[target] - loads[target] >= weights[index]:
+                move(index, truck, target)
+                break
+
+    tried = set()
+    while time.perf_counter() < deadline:
+        used = [truck for truck, load in enumerate(loads) if load > 0 and truck not in tried]
+        if not used:
+            break
+        source = min(used, key=lambda truck: (loads[truck], rng.random()))
+        tried.add(source)
+        targets = [truck for truck, load in enumerate(loads) if load > 0 and truck != source]
+        rng.shuffle(targets)
+        targets.sort(key=volumes.__getitem__, reverse=True)
+        moves = []
+        room = {truck: capacities[truck] - loads[truck] for truck in targets}
+        for index in sorted(packages_of[source], key=weights.__getitem__, reverse=True):
+            weight = weights[index]
+            target = next((
+                truck for truck in targets
+                if room[truck] >= weight and insurance_cost(weight, volumes[truck]) == 0
+            ), None)
+            if target is None:
+                target = next((truck for truck in targets if room[truck] >= weight), None)
+            if target is None:
+                break
+            room[target] -= weight
+            moves.append((index, target))
+        if len(moves) == len(packages_of[source]):
+            for index, target in moves:
+                move(index, source, target)
+            tried.clear()
+
+    total_insurance = sum(
+        insurance_cost(weights[index], volumes[truck])
+        for index, truck in enumerate(assignments) if truck >= 0)
+    return FleetPlan(assignments, loads, total_insurance)
+
+
+def _improve_job(job: tuple) -> FleetPlan:
+    return improve_plan(*job)
+
+
+@dataclass
+class FleetPlanner:
+    """
+    Distributes a manifest across the trucks of a fleet.
+
+    First-fit decreasing gives the baseline plan; with `improve`, local search runs in
+    `workers` processes with different seeds and the best plan is kept. Only the packed
+    weights, volumes and capacities are sent to the workers.
+
+    Attributes
+    ----------
+    improve : bool
+        Enables the local-search improver.
+    workers : int
+        The number of independent local searches, each in its own process.
+    time_budget : float
+        The time, in seconds, given to each local search.
+    seeds : List[int]
+        The seed of each local search. Defaults to `range(workers)`.
+    """
+
+    improve: bool = False
+    workers: int = 1
+    time_budget: float = 1.0
+    seeds: List[int] = field(default_factory=list)
+
+    def plan(self, packges: Sequence[Packge], trucks: Sequence[Truck]) -> FleetPlan:
+        """
+        Plans the assignment of `packges` to `trucks`, using each truck's `volume` and the
+        weight it can still take (`max_weight_setted` minus what it already carries).
+        """
+        weights = array("i", (packge.weight for packge in packges))
+        volumes = array("i", (truck.volume for truck in trucks))
+        capacities = array("i", (truck.remaining_weight for truck in trucks))
+        plan = first_fit_decreasing(weights, volumes, capacities)
+        if not self.improve:
+            return plan
+        seeds = self.seeds or list(range(self.workers))
+        jobs = [(plan, weights, volumes, capacities, self.time_budget, seed) for seed in seeds]
+        if self.workers <= 1:
+            candidates = [_improve_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                candidates = list(executor.map(_improve_job, jobs))
+        return min([plan] + candidates, key=FleetPlan.score)
+
+
+def apply_plan(
+    plan: FleetPlan, packges: Sequence[Packge], trucks: Sequence[Truck]
+) -> List[Optional[BatchResult]]:
+    """
+    Loads the planned packages into the trucks with one `insert_packages` call per truck.
+
+    Returns
+    -------
+    List[Optional[BatchResult]]
+        The result of each truck, or None for trucks without packages.
+    """
+    per_truck: List[List[Packge]] = [[] for _ in trucks]
+    for packge, truck in zip(packges, plan.assignments):
+        if truck >= 0:
+            per_truck[truck].append(packge)
+    return [
+        trucks[index].insert_packages(load) if load else None
+        for index, load in enumerate(per_truck)
+    ]
@@ -0,0 +1,120 @@
+from array import array
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from core.truck import (
+    INSURANCE_RATE,
+    INSURANCE_VOLUME_FACTOR,
+    TRANSPORT_COST_PER_KG,
+    Truck,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python fallback is used instead.
+    np = None
+
+
+@dataclass
+class Pricing:
+    """
+    The prices of a batch of packages, one entry per package.
+
+    The columns are NumPy arrays when NumPy is used and `array('d')` otherwise.
+
+    Attributes
+    ----------
+    transport_cost : Any
+        The transport cost of each package (`Packge.transport_cost`).
+    insurance_cost : Any
+        The insurance surcharge of each package (`Packge.extra_insurance_cost`).
+    total_cost : Any
+        The transport cost plus the insurance surcharge of each package.
+    insured_value : Any
+        The value of each package with the insurance surcharge added, as done when the
+        operator accepts the insurance in `RunProgram._stop_process`.
+    """
+
+    transport_cost: Any
+    insurance_cost: Any
+    total_cost: Any
+    insured_value: Any
+
+
+def price_packages(
+    weights: Sequence[int],
+    values: Sequence[float],
+    truck_volume: int,
+    use_numpy: Optional[bool] = None,
+) -> Pricing:
+    """
+    Prices a batch of packages with the same formulas as `Packge`.
+
+    Parameters
+    ----------
+    weights : Sequence[int]
+        The weight of each package.
+    values : Sequence[float]
+        The value of each package.
+    truck_volume : int
+        The volume of the truck the packages are loaded into.
+    use_numpy : Optional[bool]
+        Forces the NumPy (True) or the pure-Python (False) implementation. By default NumPy
+        is used when it is installed.
+
+    Returns
+    -------
+    Pricing
+        The transport cost, insurance surcharge, total cost and insured value of each package.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy não está instalado")
+        return _price_numpy(weights, values, truck_volume)
+    return _price_python(weights, values, truck_volume)
+
+
+def price_truck(truck: Truck, use_numpy: Optional[bool] = None) -> Pricing:
+    """
+    Prices every package loaded in `truck` with its current volume.
+    """
+    weights = getattr(truck.load_list, "weights", None)
+    values = getattr(truck.load_list, "values", None)
+    if weights is None or values is None:
+        weights = [packge.weight for packge in truck.load_list]
+        values = [packge.value for packge in truck.load_list]
+    return price_packages(weights, values, truck.volume, use_numpy)
+
+
+def _price_numpy(weights: Sequence[int], values: Sequence[float], truck_volume: int) -> Pricing:
+    weights = np.asarray(weights, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    transport_cost = weights * TRANSPORT_COST_PER_KG
+    insurance_cost = np.where(
+        truck_volume * INSURANCE_VOLUME_FACTOR < weights,
+        (weights - truck_volume) * INSURANCE_RATE,
+        0.0,
+    )
+    return Pricing(
+        transport_cost,
+        insurance_cost,
+        transport_cost + insurance_cost,
+        values + insurance_cost,
+    )
+
+
+def _price_python(weights: Sequence[int], values: Sequence[float], truck_volume: int) -> Pricing:
+    threshold = truck_volume * INSURANCE_VOLUME_FACTOR
+    transport_cost = array("d", [weight * TRANSPORT_COST_PER_KG for weight in weights])
+    insurance_cost = array("d", [
+        (weight - truck_volume) * INSURANCE_RATE if threshold < weight else 0.0
+        for weight in weights
+    ])
+    return Pricing(
+        transport_cost,
+        insurance_cost,
+        array("d", map(float.__add__, transport_cost, insurance_cost)),
+        array("d", [float(value) + cost for value, cost in zip(values, insurance_cost)]),
+    )
@@ -0,0 +1,204 @@
+import json
+import os
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from core.template import load_template
+
+
+REPORT_TEMPLATE = os.path.join(os.path.dirname(__file__), "report_template.html")
+REPORT_FORMATS = ("html", "csv", "jsonl")
+CHUNK_SIZE = 8192
+
+
+@dataclass
+class ReportSnapshot:
+    """
+    The compact data needed to render a truck report.
+
+    It only holds the scalar report statistics and two packed columns, so it is cheap to pickle
+    and send to a worker process.
+
+    Attributes
+    ----------
+    parameters : dict
+        The scalar placeholders of the report (day, extremes, percentiles, ...).
+    labels : array
+        The weight of each loaded package, used as the chart labels.
+    data : array
+        The transport cost of each loaded package, used as the chart series.
+    stops : List[Tuple[int, int, int, int, int]]
+        One row per closed stop: number, packages loaded, packages unloaded, weight delta and
+        weight in the truck at the close.
+    """
+
+    parameters: dict
+    labels: array
+    data: array
+    stops: List[Tuple[int, int, int, int, int]] = field(default_factory=list)
+
+    @property
+    def day(self) -> str:
+        """
+        The day of the report, formatted as used in the report file name.
+        """
+        return self.parameters["day"]
+
+
+def render_report(snapshot: ReportSnapshot, template_path: str = REPORT_TEMPLATE) -> str:
+    """
+    Renders the report HTML of a snapshot.
+    """
+    return "".join(iter_html_report(snapshot, template_path))
+
+
+def iter_html_report(
+    snapshot: ReportSnapshot, template_path: str = REPORT_TEMPLATE
+) -> Iterator[str]:
+    """
+    Yields the report HTML of a snapshot in chunks.
+
+    The chart series are formatted `CHUNK_SIZE` values at a time, so memory does not grow with
+    the number of packages.
+    """
+    parameters = dict(snapshot.parameters)
+    parameters["labels"] = iter_series(snapshot.labels)
+    parameters["data"] = iter_series(snapshot.data)
+    parameters["stop_rows"] = render_stop_rows(snapshot.stops)
+    return load_template(template_path).stream(parameters)
+
+
+def iter_series(values: Sequence, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields `values` formatted as a list literal, like `str(list(values))`, in chunks.
+    """
+    yield "["
+    for start in range(0, len(values), chunk_size):
+        if start:
+            yield ", "
+        yield ", ".join(map(str, values[start:start + chunk_size]))
+    yield "]"
+
+
+def iter_csv_report(snapshot: ReportSnapshot, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields the chart series of a snapshot as CSV, one row per package, in chunks.
+    """
+    yield "peso,custo_transporte\r\n"
+    labels, data = snapshot.labels, snapshot.data
+    for start in range(0, len(labels), chunk_size):
+        end = start + chunk_size
+        yield "".join(
+            f"{weight},{cost}\r\n" for weight, cost in zip(labels[start:end], data[start:end]))
+
+
+def iter_jsonl_report(snapshot: ReportSnapshot, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields a snapshot as JSON Lines: the statistics, then one record per stop and per package.
+    """
+    yield json.dumps({"type": "summary", **snapshot.parameters}) + "\n"
+    for stop, added, removed, weight_delta, weight_at_close in snapshot.stops:
+        yield json.dumps({
+            "type": "stop",
+            "stop": stop,
+            "added": added,
+            "removed": removed,
+            "weight_delta": weight_delta,
+            "weight_at_close": weight_at_close,
+        }) + "\n"
+    labels, data = snapshot.labels, snapshot.data
+    for start in range(0, len(labels), chunk_size):
+        end = start + chunk_size
+        yield "".join(
+            f'{{"type":"package","weight":{weight},"transport_cost":{cost}}}\n'
+            for weight, cost in zip(labels[start:end], data[start:end]))
+
+
+def downsample(labels: array, data: array, points: int) -> Tuple[array, array]:
+    """
+    Keeps at most `points` evenly spaced entries of the chart series.
+
+    The first and last entries are always kept.
+    """
+    count = len(labels)
+    if points <= 0 or count <= points:
+        return labels, data
+    if points == 1:
+        return labels[:1], data[:1]
+    step = (count - 1) / (points - 1)
+    positions = [round(index * step) for index in range(points)]
+    return (array(labels.typecode, [labels[position] for position in positions]),
+            array(data.typecode, [data[position] for position in positions]))
+
+
+def render_stop_rows(stops: List[Tuple[int, int, int, int, int]]) -> str:
+    """
+    Renders the table rows of the per-stop section of the report.
+    """
+    return "".join(
+        "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>\n" for row in stops)
+
+
+def report_format(path: str) -> str:
+    """
+    Returns the report format matching the extension of `path`, HTML by default.
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return extension if extension in REPORT_FORMATS else "html"
+
+
+def write_report(
+    snapshot: ReportSnapshot,
+    path: Optional[str] = None,
+    template_path: str = REPORT_TEMPLATE,
+    format: Optional[str] = None,
+    max_points: Optional[int] = None,
+) -> str:
+    """
+    Renders a snapshot and streams it to `path`.
+
+    The report is written chunk by chunk, so the whole document never exists in memory.
+
+    Parameters
+    ----------
+    snapshot : ReportSnapshot
+        The report data.
+    path : Optional[str]
+        The output file. Defaults to `relatorio_<day>.<format>` in the working directory.
+    template_path : str
+        The report template, used by the HTML format.
+    format : Optional[str]
+        One of `REPORT_FORMATS`. Defaults to the format matching the extension of `path`.
+    max_points : Optional[int]
+        When set, the chart series are downsampled to at most this number of points.
+
+    Returns
+    -------
+    str
+        The path of the written report.
+
+    Raises
+    ------
+    ValueError
+        If `format` is not one of `REPORT_FORMATS`.
+    """
+    if format is None:
+        format = report_format(path) if path is not None else "html"
+    if format not in REPORT_FORMATS:
+        raise ValueError(f"Formato de relatório inválido: {format}")
+    if path is None:
+        path = f"relatorio_{snapshot.day}.{format}"
+    if max_points is not None:
+        labels, data = downsample(snapshot.labels, snapshot.data, max_points)
+        snapshot = ReportSnapshot(snapshot.parameters, labels, data, snapshot.stops)
+    if format == "csv":
+        chunks = iter_csv_report(snapshot)
+    elif format == "jsonl":
+        chunks = iter_jsonl_report(snapshot)
+    else:
+        chunks = iter_html_report(snapshot, template_path)
+    with open(path, "w", newline="" if format == "csv" else None) as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return path
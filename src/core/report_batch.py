@@ -0,0 +1,216 @@
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from core.decorators import NO_PACKAGES_MESSAGE
+from core.report import REPORT_TEMPLATE, write_report
+from core.template import load_template
+from core.truck import Truck
+
+
+"""
+Renders the reports of many archived days at once, for example at month-end.
+
+Each day is either a truck journal (`*.journal`, rebuilt with `core.journal.recover`), a
+binary manifest (`*.manifest`, mapped with `core.manifest.load_manifest`) or a recorded day of
+operations in JSON Lines or CSV (replayed with `core.batch.BatchRunner`). The
+days are loaded and rendered in a process or thread pool: only the file paths are sent to the
+workers, each worker compiles the template once, and at most `max_pending` days are in flight
+so memory stays bounded however many days are given.
+
+Example Usage:
+    python src/main.py --reports arquivo/*.journal --report-dir relatorios --workers 8
+"""
+
+
+@dataclass
+class DayReport:
+    """
+    The outcome of rendering the report of one archived day.
+
+    Attributes
+    ----------
+    dataset : str
+        The journal or recorded day the report was rendered from.
+    path : Optional[str]
+        The written report, or None if the day had nothing to report.
+    message : str
+        A message describing the outcome.
+    seconds : float
+        The time spent loading the day and writing its report.
+    """
+
+    dataset: str
+    path: Optional[str]
+    message: str
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.path is not None
+
+
+def load_day(dataset: str) -> Truck:
+    """
+    Rebuilds the truck of an archived day from its journal, its manifest or its recorded
+    operations.
+    """
+    if dataset.endswith(".journal"):
+        from core.journal import recover
+
+        return recover(dataset, attach=False)
+    if dataset.endswith(".manifest"):
+        from core.manifest import load_manifest
+
+        return load_manifest(dataset)
+    from core.batch import BatchRunner, read_records
+
+    runner = BatchRunner(write_reports=False)
+    for _ in runner.replay(read_records(dataset)):
+        pass
+    return runner.truck
+
+
+def day_name(dataset: str) -> str:
+    """
+    Returns the name of an archived day: its file name without the extension.
+    """
+    return os.path.splitext(os.path.basename(dataset))[0]
+
+
+def unique_day_name(dataset: str, used: Set[str]) -> str:
+    """
+    Returns the name of an archived day that is not in `used` and adds it to `used`.
+
+    When another day already has the same file name, for example the same date archived by two
+    trucks, the names of its parent directories are prepended (`truckB_2024-05-01`), and a
+    number is appended as a last resort.
+    """
+    name = day_name(dataset)
+    directory = os.path.dirname(os.path.abspath(dataset))
+    while name in used:
+        directory, parent = os.path.split(directory)
+        if not parent:
+            break
+        name = f"{parent}_{name}"
+    base, number = name, 2
+    while name in used:
+        name = f"{base}_{number}"
+        number += 1
+    used.add(name)
+    return name
+
+
+def render_day(job: Tuple[str, str, str, str, str, Optional[int]]) -> DayReport:
+    """
+    Loads one archived day and writes its report under the name `day`. Runs inside a worker.
+    """
+    dataset, day, output_dir, template_path, format, max_points = job
+    start = time.perf_counter()
+    try:
+        truck = load_day(dataset)
+    except (OSError, ValueError, KeyError) as e:
+        return DayReport(dataset, None, str(e), time.perf_counter() - start)
+    if len(truck.load_list) == 0:
+        return DayReport(dataset, None, NO_PACKAGES_MESSAGE, time.perf_counter() - start)
+    snapshot = truck.report_snapshot(max_points)
+    snapshot.parameters["day"] = day
+    path = os.path.join(output_dir, f"relatorio_{day}.{format}")
+    try:
+        write_report(snapshot, path, template_path, format)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return DayReport(dataset, None, str(e), time.perf_counter() - start)
+    return DayReport(dataset, path, "[!] Relatório gerado.", time.perf_counter() - start)
+
+
+def _outcome(future: Future, dataset: str) -> DayReport:
+    """
+    Returns the report of a finished worker, or a failed one if the worker raised.
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        return DayReport(dataset, None, repr(e), 0.0)
+
+
+def _init_worker(template_path: str) -> None:
+    """
+    Compiles the report template once when a worker process starts.
+    """
+    load_template(template_path)
+
+
+def render_days(
+    datasets: Iterable[str],
+    output_dir: str = ".",
+    workers: Optional[int] = None,
+    threads: bool = False,
+    max_pending: Optional[int] = None,
+    template_path: str = REPORT_TEMPLATE,
+    format: str = "html",
+    max_points: Optional[int] = None,
+) -> Iterator[DayReport]:
+    """
+    Renders the report of every archived day in parallel, yielding them as they complete.
+
+    Parameters
+    ----------
+    datasets : Iterable[str]
+        The journals or recorded days. The iterable is consumed lazily.
+    output_dir : str
+        The directory where the reports are written as `relatorio_<day>.<format>`, with the
+        day named by `unique_day_name`.
+    workers : Optional[int]
+        The number of workers. Defaults to the number of CPUs.
+    threads : bool
+        When enabled, a thread pool sharing one template cache is used instead of processes.
+    max_pending : Optional[int]
+        The maximum number of days submitted and not yet completed. Defaults to twice the
+        number of workers.
+    template_path : str
+        The report template, used by the HTML format.
+    format : str
+        The report format: "html", "csv" or "jsonl".
+    max_points : Optional[int]
+        When set, the chart series are downsampled to at most this number of points.
+
+    Returns
+    -------
+    Iterator[DayReport]
+        The outcome of each day, in completion order. A day that fails to load or to render
+        yields a failed report and the other days go on.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    if threads:
+        load_template(template_path)
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(template_path,))
+    pending: Set[Future] = set()
+    datasets_of: Dict[Future, str] = {}
+    used: Set[str] = set()
+    with executor:
+        for dataset in datasets:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _outcome(future, datasets_of.pop(future))
+            day = unique_day_name(dataset, used)
+            future = executor.submit(
+                render_day, (dataset, day, output_dir, template_path, format, max_points))
+            datasets_of[future] = dataset
+            pending.add(future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _outcome(future, datasets_of.pop(future))
@@ -0,0 +1,345 @@
+import heapq
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from core.truck import BatchResult, Packge, Truck
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python fallback is used instead.
+    np = None
+
+
+"""
+Orders the stops of a day's deliveries to shorten the route.
+
+The route starts at the depot. A nearest-neighbour tour is built first, then improved with
+2-opt (reversing a stretch of the route) and Or-opt (moving one to three consecutive stops
+elsewhere, possibly reversed) until no move shortens it or the time budget runs out. Only
+moves towards the `NEIGHBOURS` nearest stops of each stop are tried, and a stop is only
+looked at again once a move touched it, so each pass costs O(n) instead of O(n²).
+
+The distances are precomputed once in a matrix, with NumPy when it is installed. The truck
+unloads from the end of its load (`Truck.remove_package`), so a route is loaded in reverse:
+`RoutePlan.load_order` and `load_route` put the packages of the first stop on top.
+
+Example Usage:
+    plan = plan_route([(2.0, 3.5), (8.1, 1.0), (4.4, 7.2)], depot=(0.0, 0.0))
+    load_route(truck, plan, packages_by_stop)
+"""
+
+
+Point = Tuple[float, float]
+
+NEIGHBOURS = 10
+SEGMENT_LENGTHS = (1, 2, 3)
+EPSILON = 1e-9
+
+
+@dataclass
+class RoutePlan:
+    """
+    The order in which the stops of a day are visited.
+
+    Attributes
+    ----------
+    order : List[int]
+        The indices of the stops, in visiting order.
+    distance : float
+        The length of the route, from the depot and, for a closed route, back to it.
+    initial_distance : float
+        The length of the nearest-neighbour route the search started from.
+    closed : bool
+        Indicates if the route returns to the depot.
+    """
+
+    order: List[int]
+    distance: float
+    initial_distance: float
+    closed: bool = True
+
+    def load_order(self) -> List[int]:
+        """
+        The stops in the order their packages are loaded: the last stop first, so the
+        packages of each stop are on top of the load when the truck gets there.
+        """
+        return self.order[::-1]
+
+
+def distance_matrix(points: Sequence[Point], use_numpy: Optional[bool] = None) -> list:
+    """
+    Returns the Euclidean distance between every pair of points.
+
+    The matrix is a NumPy array when NumPy is used and a list of rows otherwise.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy não está instalado")
+        coordinates = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = coordinates[:, 0]
+        y = coordinates[:, 1]
+        return np.hypot(x[:, None] - x, y[:, None] - y)
+    return [[math.hypot(x - other_x, y - other_y) for other_x, other_y in points]
+            for x, y in points]
+
+
+def _nearest_neighbours(matrix, count: int) -> List[List[int]]:
+    """
+    Returns the `count` nearest other nodes of every node, nearest first.
+    """
+    size = len(matrix)
+    count = min(count, size - 1)
+    if count <= 0:
+        return [[] for _ in range(size)]
+    if np is not None and isinstance(matrix, np.ndarray):
+        distances = matrix.copy()
+        np.fill_diagonal(distances, np.inf)
+        nearest = np.argpartition(distances, count - 1, axis=1)[:, :count]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+        return np.take_along_axis(nearest, order, axis=1).tolist()
+    return [
+        heapq.nsmallest(count, (other for other in range(size) if other != node),
+                        key=row.__getitem__)
+        for node, row in enumerate(matrix)
+    ]
+
+
+def _nearest_neighbour_tour(matrix) -> List[int]:
+    """
+    Returns the tour that always drives to the nearest stop not visited yet, from node 0.
+    """
+    size = len(matrix)
+    tour = [0]
+    if np is not None and isinstance(matrix, np.ndarray):
+        distances = matrix.copy()
+        distances[:, 0] = np.inf
+        current = 0
+        for _ in range(size - 1):
+            current = int(distances[current].argmin())
+            tour.append(current)
+            distances[:, current] = np.inf
+        return tour
+    unvisited = set(range(1, size))
+    current = 0
+    while unvisited:
+        row = matrix[current]
+        current = min(unvisited, key=row.__getitem__)
+        unvisited.remove(current)
+        tour.append(current)
+    return tour
+
+
+def _tour_length(tour: List[int], rows: List[List[float]]) -> float:
+    return sum(rows[a][b] for a, b in zip(tour, tour[1:] + tour[:1]))
+
+
+class _LocalSearch:
+    """
+    2-opt and Or-opt moves over a tour whose node 0, the depot, stays in position 0.
+
+    `rows[a][b]` is the cost of driving from `a` to `b`; for an open route the cost of driving
+    back to the depot is 0. Reversed stretches never contain the depot, so the other costs only
+    need to be symmetric.
+    """
+
+    def __init__(self, tour: List[int], rows: List[List[float]], neighbours: List[List[int]],
+                 deadline: float) -> None:
+        self.tour = tour
+        self.rows = rows
+        self.neighbours = neighbours
+        self.deadline = deadline
+        self.position = [0] * len(tour)
+        for index, node in enumerate(tour):
+            self.position[node] = index
+
+    def _reposition(self, start: int, end: int) -> None:
+        tour = self.tour
+        position = self.position
+        for index in range(start, end):
+            position[tour[index]] = index
+
+    def _reverse(self, i: int, j: int) -> None:
+        """
+        Reverses the stretch of the tour between positions `i + 1` and `j`.
+        """
+        self.tour[i + 1:j + 1] = self.tour[i + 1:j + 1][::-1]
+        self._reposition(i + 1, j + 1)
+
+    def _gain_2opt(self, i: int, j: int) -> float:
+        tour = self.tour
+        rows = self.rows
+        a, b = tour[i], tour[i + 1]
+        c, d = tour[j], tour[(j + 1) % len(tour)]
+        return rows[a][b] + rows[c][d] - rows[a][c] - rows[b][d]
+
+    def two_opt(self) -> bool:
+        """
+        Applies improving 2-opt moves until none is left or the deadline passes.
+        """
+        tour = self.tour
+        rows = self.rows
+        position = self.position
+        size = len(tour)
+        queue = deque(tour)
+        queued = [True] * size
+        moved = False
+        while queue:
+            if time.perf_counter() > self.deadline:
+                return moved
+            a = queue.popleft()
+            queued[a] = False
+            for c in self.neighbours[a]:
+                pa = position[a]
+                pc = position[c]
+                row = rows[a]
+                if row[c] >= row[tour[(pa + 1) % size]] and row[c] >= row[tour[pa - 1]]:
+                    break
+                low, high = (pa, pc) if pa < pc else (pc, pa)
+                candidates = [(low, high)]
+                if low > 0:
+                    candidates.append((low - 1, high - 1))
+                for i, j in candidates:
+                    if j > i + 1 and self._gain_2opt(i, j) > EPSILON:
+                        touched = (tour[i], tour[i + 1], tour[j], tour[(j + 1) % size])
+                        self._reverse(i, j)
+                        moved = True
+                        for node in touched:
+                            if not queued[node]:
+                                queued[node] = True
+                                queue.append(node)
+                        break
+                else:
+                    continue
+                break
+        return moved
+
+    def or_opt(self) -> bool:
+        """
+        Applies the first improving Or-opt move of each stretch of one to three stops, until
+        a full pass finds none or the deadline passes.
+        """
+        size = len(self.tour)
+        moved = False
+        improved = True
+        while improved:
+            improved = False
+            for length in SEGMENT_LENGTHS:
+                start = 1
+                while start + length <= size:
+                    if time.perf_counter() > self.deadline:
+                        return moved
+                    if self._move_segment(start, length):
+                        improved = moved = True
+                    start += 1
+        return moved
+
+    def _move_segment(self, start: int, length: int) -> bool:
+        """
+        Moves the stretch of `length` stops at `start` to its best place next to a neighbour
+        of one of its ends, if that shortens the tour.
+        """
+        tour = self.tour
+        rows = self.rows
+        position = self.position
+        size = len(tour)
+        end = start + length - 1
+        first, last = tour[start], tour[end]
+        before, after = tour[start - 1], tour[(end + 1) % size]
+        removed = rows[before][first] + rows[last][after] - rows[before][after]
+        best = EPSILON
+        best_move = None
+        for c in self.neighbours[first] + self.neighbours[last]:
+            pc = position[c]
+            if start - 1 <= pc <= end:
+                continue
+            e = tour[(pc + 1) % size]
+            forward = rows[c][first] + rows[last][e] - rows[c][e]
+            backward = rows[c][last] + rows[first][e] - rows[c][e]
+            if removed - forward > best:
+                best, best_move = removed - forward, (c, False)
+            if removed - backward > best:
+                best, best_move = removed - backward, (c, True)
+        if best_move is None:
+            return False
+        c, reverse = best_move
+        segment = tour[start:end + 1]
+        if reverse:
+            segment.reverse()
+        del tour[start:end + 1]
+        insert_at = position[c] + 1 - (length if position[c] > end else 0)
+        tour[insert_at:insert_at] = segment
+        self._reposition(min(start, insert_at), max(end + 1, insert_at + length))
+        return True
+
+
+def plan_route(
+    locations: Sequence[Point],
+    depot: Point = (0.0, 0.0),
+    time_budget: float = 0.25,
+    closed: bool = True,
+    use_numpy: Optional[bool] = None,
+) -> RoutePlan:
+    """
+    Orders the stops at `locations` to shorten the route from `depot`.
+
+    Parameters
+    ----------
+    locations : Sequence[Point]
+        The (x, y) coordinates of each stop.
+    depot : Point
+        The coordinates the truck leaves from.
+    time_budget : float
+        The time, in seconds, given to the local search after the nearest-neighbour tour.
+    closed : bool
+        When enabled, the route returns to the depot after the last stop.
+    use_numpy : Optional[bool]
+        Forces the NumPy or the pure-Python distance matrix. Defaults to NumPy when installed.
+
+    Returns
+    -------
+    RoutePlan
+        The visiting order and the length of the route.
+    """
+    if not locations:
+        return RoutePlan([], 0.0, 0.0, closed)
+    matrix = distance_matrix([depot] + list(locations), use_numpy)
+    neighbours = _nearest_neighbours(matrix, NEIGHBOURS)
+    tour = _nearest_neighbour_tour(matrix)
+    rows = matrix.tolist() if np is not None and isinstance(matrix, np.ndarray) else matrix
+    if not closed:
+        for row in rows:
+            row[0] = 0.0
+    initial_distance = _tour_length(tour, rows)
+    search = _LocalSearch(tour, rows, neighbours, time.perf_counter() + time_budget)
+    while search.two_opt() | search.or_opt():
+        if time.perf_counter() > search.deadline:
+            break
+    return RoutePlan(
+        [node - 1 for node in search.tour[1:]],
+        _tour_length(search.tour, rows),
+        initial_distance,
+        closed,
+    )
+
+
+def load_route(
+    truck: Truck, plan: RoutePlan, packages_by_stop: Sequence[Sequence[Packge]]
+) -> List[BatchResult]:
+    """
+    Loads the packages of every stop in `plan.load_order`, one `insert_packages` call per stop.
+
+    The packages of the first stop of the route end up on top of the load, so at each stop
+    `Truck.remove_packages` unloads exactly the packages of that stop.
+
+    Returns
+    -------
+    List[BatchResult]
+        The result of each stop, in visiting order.
+    """
+    results = [truck.insert_packages(packages_by_stop[stop]) for stop in plan.load_order()]
+    return results[::-1]
@@ -0,0 +1,193 @@
+import asyncio
+import json
+from typing import Dict, Optional
+
+from core.batch import (
+    FAILURE_MESSAGES,
+    BatchRunner,
+    file_error_message,
+    invalid_operation_message,
+)
+from core.manifest import write_manifest
+from core.report import write_report
+
+
+"""
+The `DepotServer` class lets many scanners drive many trucks at once over an asyncio line
+protocol on TCP or a Unix socket.
+
+Each request is one JSON object per line with the truck ID in `truck` and an operation in the
+format of `core.batch` (`start_day`, `insert`, `insert_many`, `remove`, `end_stop`,
+`begin_stop`, `rollback_stop`, `undo_stop`, `redo_stop`, `find`, `situation`, `packages`,
+`end_day`, `report`, `manifest`, `plan_route`), so a scanner can roll a failed stop back and
+retry it. An optional `id` is echoed back. Each response is one JSON object per line with the
+batch result of the operation:
+
+    -> {"id": 1, "truck": "T01", "op": "start_day", "volume": 10, "weight": 1000}
+    <- {"id": 1, "truck": "T01", "op": "start_day", "ok": true, "message": "Começando dia"}
+
+Mutations of one truck are serialised by a per-truck lock, while different trucks proceed
+concurrently. Report and manifest files are written, routes planned and the CPU-bound
+`insert_many` and `admit_pending` operations applied in a worker thread, so the event loop never
+blocks on file I/O or on a long search. Search budgets are capped at `MAX_TIME_BUDGET` seconds.
+A request longer than `max_request_size` bytes is skipped and answered with an error.
+
+Example Usage:
+    python src/main.py --serve 127.0.0.1:8765
+"""
+
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+MAX_TIME_BUDGET = 1.0
+THREADED_OPERATIONS = frozenset({"insert_many", "admit_pending"})
+
+INVALID_REQUEST_MESSAGE = "Requisição inválida"
+REQUEST_TOO_LONG_MESSAGE = "Requisição muito longa"
+
+
+class DepotServer:
+    """
+    An asyncio server that applies scanner operations to many trucks.
+
+    Args:
+        report_dir (str): The directory where the reports are written. Only the file name of
+            a client `path` is kept, so every report stays in this directory.
+        write_reports (bool): When disabled, `report` operations only return the statistics.
+        max_request_size (int): The longest request line, in bytes, the server reads.
+    """
+
+    def __init__(
+        self,
+        report_dir: str = ".",
+        write_reports: bool = True,
+        max_request_size: int = MAX_REQUEST_SIZE,
+    ) -> None:
+        self.report_dir = report_dir
+        self.write_reports = write_reports
+        self.max_request_size = max_request_size
+        self.runners: Dict[str, BatchRunner] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    def _runner(self, truck_id: str) -> BatchRunner:
+        runner = self.runners.get(truck_id)
+        if runner is None:
+            runner = BatchRunner(
+                report_dir=self.report_dir,
+                write_reports=self.write_reports,
+                report_prefix=f"relatorio_{truck_id}",
+                confine_paths=True,
+                max_time_budget=MAX_TIME_BUDGET,
+            )
+            self.runners[truck_id] = runner
+            self.locks[truck_id] = asyncio.Lock()
+        return runner
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Applies one request to its truck and returns the response.
+        """
+        truck_id = request.get("truck")
+        if not isinstance(truck_id, str):
+            return {"id": request.get("id"), "ok": False, "message": "Caminhão não informado"}
+        runner = self._runner(truck_id)
+        op = request.get("op")
+        job = None
+        if op == "plan_route":
+            # Reads no truck state, so it runs outside the lock.
+            result = await asyncio.to_thread(runner.apply, request)
+        else:
+            async with self.locks[truck_id]:
+                if op in ("report", "manifest"):
+                    prepare = runner.prepare_report if op == "report" else runner.prepare_manifest
+                    try:
+                        message, data, job = prepare(request)
+                        ok = message not in FAILURE_MESSAGES
+                    except (KeyError, TypeError, ValueError) as e:
+                        message, data, ok = invalid_operation_message(e), {}, False
+                    result = {"op": op, "ok": ok, "message": message}
+                    result.update(data)
+                elif op in THREADED_OPERATIONS:
+                    result = await asyncio.to_thread(runner.apply, request)
+                else:
+                    result = runner.apply(request)
+        if job is not None:
+            writer = write_report if op == "report" else write_manifest
+            try:
+                result["path"] = await asyncio.to_thread(writer, *job)
+            except OSError as e:
+                result.update(ok=False, message=file_error_message(e))
+        result.pop("line", None)
+        result["id"] = request.get("id")
+        result["truck"] = truck_id
+        return result
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answers the requests of one scanner connection until it closes.
+        """
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line == b"":
+                    break
+                try:
+                    request = json.loads(line) if line is not None else None
+                except json.JSONDecodeError:
+                    request = None
+                if isinstance(request, dict):
+                    response = await self.handle_request(request)
+                elif line is None:
+                    response = {"ok": False, "message": REQUEST_TOO_LONG_MESSAGE}
+                else:
+                    response = {"ok": False, "message": INVALID_REQUEST_MESSAGE}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_line(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Returns the next request line, `b""` once the connection is closed, or None when the line
+        is longer than `max_request_size` bytes. Such a line is read up to its end and dropped,
+        so the next request is read from its start.
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+        except asyncio.LimitOverrunError as e:
+            overrun = e
+        while True:
+            await reader.readexactly(overrun.consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as e:
+                overrun = e
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Starts listening on TCP, or on a Unix socket when `unix_path` is given.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, unix_path, limit=self.max_request_size)
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=self.max_request_size)
+
+    async def serve_forever(
+        self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None
+    ) -> None:
+        """
+        Starts the server and answers requests until cancelled.
+        """
+        server = await self.start(host, port, unix_path)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,120 @@
+from array import array
+from typing import Dict, Iterable, Optional, Sequence
+
+
+class SlotIndex:
+    """
+    The stable IDs of the packages in a load and the slot (position in `Truck.load_list`) of
+    each ID.
+
+    IDs are handed out in loading order, starting at 1, and never twice, except the IDs of the
+    packages discarded by a rollback or an undo. As long as every package sits in slot
+    `id - 1`, which is the case for a load that was only filled and emptied from the end
+    without loading again, no ID is stored at all. Otherwise the ID of each slot is kept in a
+    packed `array('q')`, and the slot of each ID in a dictionary built on the first lookup, so
+    finding or removing a package by ID costs O(1) amortised.
+
+    Attributes
+    ----------
+    ids : Optional[array]
+        The ID of the package in each slot, or None while the ID of slot `i` is `i + 1`.
+    slots : Optional[Dict[int, int]]
+        The slot of each ID, or None until the first lookup.
+    next_id : int
+        The ID of the next loaded package.
+    """
+
+    __slots__ = ("ids", "slots", "next_id")
+
+    def __init__(self, length: int = 0) -> None:
+        self.ids: Optional[array] = None
+        self.slots: Optional[Dict[int, int]] = None
+        self.next_id = length + 1
+
+    def id_at(self, slot: int) -> int:
+        """
+        Returns the ID of the package in `slot`.
+        """
+        return slot + 1 if self.ids is None else self.ids[slot]
+
+    def ids_between(self, start: int, end: int) -> Sequence[int]:
+        """
+        Returns the IDs of the packages in slots `start` to `end`.
+        """
+        return range(start + 1, end + 1) if self.ids is None else self.ids[start:end]
+
+    def slot(self, packge_id: int, length: int) -> Optional[int]:
+        """
+        Returns the slot of the package `packge_id` in a load of `length` packages, or None if
+        it is not loaded.
+        """
+        if self.ids is None:
+            return packge_id - 1 if 0 < packge_id <= length else None
+        if self.slots is None:
+            self.slots = {packge_id: slot for slot, packge_id in enumerate(self.ids)}
+        return self.slots.get(packge_id)
+
+    def _store_ids(self, length: int) -> array:
+        """
+        Stores the IDs of the first `length` slots, which were implicit until now.
+        """
+        if self.ids is None:
+            self.ids = array("q", range(1, length + 1))
+        return self.ids
+
+    def load(self, length: int, count: int) -> range:
+        """
+        Hands out the IDs of `count` packages loaded after the first `length` slots.
+        """
+        new_ids = range(self.next_id, self.next_id + count)
+        self.next_id += count
+        if self.ids is None and new_ids.start == length + 1:
+            return new_ids
+        self.restore(length, new_ids)
+        return new_ids
+
+    def restore(self, length: int, packge_ids: Iterable[int]) -> None:
+        """
+        Gives the given IDs to the packages loaded after the first `length` slots.
+        """
+        packge_ids = list(packge_ids)
+        implicit = range(length + 1, length + len(packge_ids) + 1)
+        if self.ids is None and packge_ids == list(implicit):
+            return
+        ids = self._store_ids(length)
+        if self.slots is not None:
+            for slot, packge_id in enumerate(packge_ids, start=length):
+                self.slots[packge_id] = slot
+        ids.extend(packge_ids)
+
+    def truncate(self, length: int, new_length: int) -> Sequence[int]:
+        """
+        Forgets the IDs of the slots from `new_length` to `length` and returns them.
+        """
+        removed = self.ids_between(new_length, length)
+        if self.ids is not None:
+            removed = removed.tolist()
+            del self.ids[new_length:]
+        if self.slots is not None:
+            for packge_id in removed:
+                del self.slots[packge_id]
+        return removed
+
+    def swap_remove(self, slot: int, length: int) -> int:
+        """
+        Forgets the ID of `slot` and gives the slot to the package of the last one, as done by
+        a swap-remove of the load. Returns the forgotten ID.
+        """
+        if slot == length - 1:
+            return self.truncate(length, slot)[0]
+        ids = self._store_ids(length)
+        packge_id = ids[slot]
+        moved_id = ids.pop()
+        ids[slot] = moved_id
+        if self.slots is not None:
+            del self.slots[packge_id]
+            self.slots[moved_id] = slot
+        return packge_id
+
+    def __repr__(self) -> str:
+        return f"SlotIndex(next_id={self.next_id}, stored={self.ids is not None})"
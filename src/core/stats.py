@@ -0,0 +1,123 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from math import ceil
+from typing import Dict, Iterable, List, Optional
+
+
+class SortedCounter:
+    """
+    A streaming order-statistics index over a multiset of numbers.
+
+    Values are kept as a count per distinct key plus the sorted list of distinct keys, so a load
+    where most packages share a handful of standard weights stays small. Adding or removing a
+    value whose key is already present costs O(1). Adding a new key or removing the last
+    occurrence of one costs an O(log k) search plus an O(k) shift of the key list, for k
+    distinct keys; the shift is a single memory move, cheap while k stays in the thousands.
+    `min` and `max` are O(1) and `percentile` is O(k), with no full sort of the loaded
+    packages. Any value can be removed, not only the last one added.
+    """
+
+    __slots__ = ("_counts", "_keys", "_size")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self._counts: Dict[float, int] = dict(Counter(values))
+        self._keys: List[float] = sorted(self._counts)
+        self._size = sum(self._counts.values())
+
+    def add(self, value: float) -> None:
+        """
+        Adds one occurrence of `value`.
+        """
+        count = self._counts.get(value)
+        if count is None:
+            self._counts[value] = 1
+            insort(self._keys, value)
+        else:
+            self._counts[value] = count + 1
+        self._size += 1
+
+    def remove(self, value: float) -> None:
+        """
+        Removes one occurrence of `value`.
+
+        Raises
+        ------
+        KeyError
+            If `value` is not in the index.
+        """
+        count = self._counts[value]
+        if count == 1:
+            del self._counts[value]
+            del self._keys[bisect_left(self._keys, value)]
+        else:
+            self._counts[value] = count - 1
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Removes every value from the index.
+        """
+        self._counts.clear()
+        self._keys.clear()
+        self._size = 0
+
+    @property
+    def min(self) -> Optional[float]:
+        """
+        The smallest value, or None when the index is empty.
+        """
+        return self._keys[0] if self._keys else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """
+        The largest value, or None when the index is empty.
+        """
+        return self._keys[-1] if self._keys else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Returns the nearest-rank percentile of the values, or None when the index is empty.
+
+        Parameters
+        ----------
+        percent : float
+            The percentile to compute, between 0 and 100.
+        """
+        if not self._size:
+            return None
+        rank = max(1, ceil(percent / 100 * self._size))
+        seen = 0
+        for key in self._keys:
+            seen += self._counts[key]
+            if seen >= rank:
+                return key
+        return self._keys[-1]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class Extremes:
+    """
+    Keeps the smallest and largest value of an append-only series in O(1).
+    """
+
+    __slots__ = ("min", "max", "count")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.count = 0
+        for value in values:
+            self.add(value)
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value to the series.
+        """
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if self.count == 0 or value > self.max:
+            self.max = value
+        self.count += 1
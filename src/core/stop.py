@@ -0,0 +1,104 @@
+import time
+from array import array
+from typing import Iterable, Optional, Tuple
+
+
+class Stop:
+    """
+    The record of one stop of the day.
+
+    The IDs (see `core.slots.SlotIndex`) of the packages loaded and unloaded during the stop
+    are kept in packed `array('q')` columns, so a day with thousands of stops stays small in
+    memory and the packages of one stop are read in O(size of the stop), without scanning the
+    whole load.
+
+    Attributes
+    ----------
+    index : int
+        The number of the stop in the day, starting at 1.
+    opened_at : float
+        The time the stop was opened, as returned by `time.time()`.
+    location : Optional[Tuple[float, float]]
+        The (x, y) coordinates of the stop, used by `core.route`, or None if unknown.
+    closed_at : Optional[float]
+        The time the stop was closed, or None while it is open.
+    added : array
+        The IDs of the packages loaded during the stop.
+    removed : array
+        The IDs of the packages unloaded during the stop.
+    weight_delta : int
+        The weight loaded minus the weight unloaded during the stop.
+    weight_at_close : int
+        The total weight in the truck when the stop was closed.
+    """
+
+    __slots__ = (
+        "index", "opened_at", "location", "closed_at", "added", "removed", "weight_delta",
+        "weight_at_close")
+
+    def __init__(
+        self,
+        index: int,
+        opened_at: Optional[float] = None,
+        location: Optional[Tuple[float, float]] = None,
+    ) -> None:
+        self.index = index
+        self.opened_at = time.time() if opened_at is None else opened_at
+        self.location = location
+        self.closed_at: Optional[float] = None
+        self.added = array("q")
+        self.removed = array("q")
+        self.weight_delta = 0
+        self.weight_at_close = 0
+
+    def record_added(self, packge_ids: Iterable[int], weight: int) -> None:
+        """
+        Records the packages `packge_ids` loaded, weighing `weight` kg in total.
+        """
+        self.added.extend(packge_ids)
+        self.weight_delta += weight
+
+    def record_removed(self, packge_ids: Iterable[int], weight: int) -> None:
+        """
+        Records the packages `packge_ids` unloaded, weighing `weight` kg in total.
+        """
+        self.removed.extend(packge_ids)
+        self.weight_delta -= weight
+
+    def close(self, weight_at_close: int, closed_at: Optional[float] = None) -> None:
+        """
+        Closes the stop with the total weight left in the truck.
+        """
+        self.closed_at = time.time() if closed_at is None else closed_at
+        self.weight_at_close = weight_at_close
+
+    @property
+    def is_open(self) -> bool:
+        return self.closed_at is None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        The time, in seconds, between opening and closing the stop.
+        """
+        if self.closed_at is None:
+            return None
+        return self.closed_at - self.opened_at
+
+    def summary(self) -> dict:
+        """
+        Returns the per-stop figures shown in the report.
+        """
+        return {
+            "stop": self.index,
+            "location": self.location,
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "weight_delta": self.weight_delta,
+            "weight_at_close": self.weight_at_close,
+            "duration": self.duration,
+        }
+
+    def __repr__(self) -> str:
+        return (f"Stop(index={self.index}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, weight_delta={self.weight_delta})")
@@ -0,0 +1,140 @@
+from array import array
+from typing import Iterable, Iterator
+
+from core.truck import Packge, packge_label
+
+
+class PackgeView:
+    """
+    A lightweight, read-only view over one row of a `ColumnarStore`.
+
+    It exposes the same attributes as `Packge` without materialising one, so code that reads
+    `weight`, `value`, `transport_cost` or `extra_insurance_cost` works unchanged. A view reads
+    its row by position: after `Truck.remove_package_by_id` moves the last package into an
+    emptied slot, it reads that package, so keep `to_packge` copies rather than views.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "ColumnarStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    @property
+    def weight(self) -> int:
+        return self._store.weights[self._index]
+
+    @property
+    def value(self) -> float:
+        return self._store.values[self._index]
+
+    @property
+    def transport_cost(self) -> float:
+        return self._store.transport_costs[self._index]
+
+    def extra_insurance_cost(self, truck_volume: int) -> float:
+        """
+        Calculates the extra insurance cost with the same rule as `Packge.extra_insurance_cost`.
+        """
+        return Packge.extra_insurance_cost(self, truck_volume)
+
+    def to_packge(self) -> Packge:
+        """
+        Materialises the row as a regular `Packge`.
+        """
+        return Packge(self.weight, self.value)
+
+    def __str__(self) -> str:
+        return packge_label(self.weight)
+
+    def __repr__(self) -> str:
+        return packge_label(self.weight)
+
+
+class ColumnarStore:
+    """
+    A list-like package store backed by packed arrays.
+
+    Weights are kept in an `array('i')`, values and the cached transport cost in `array('d')`.
+    It can replace the default `Truck.load_list` (`Truck(load_list=ColumnarStore())`) and keeps
+    the same append/pop semantics, but indexing and iteration return `PackgeView` objects instead
+    of `Packge` instances and aggregates run over the packed columns.
+
+    Attributes
+    ----------
+    weights : array
+        The weight of each package, in insertion order.
+    values : array
+        The value of each package, in insertion order.
+    transport_costs : array
+        The transport cost of each package, computed once on insertion.
+    """
+
+    __slots__ = ("weights", "values", "transport_costs")
+
+    def __init__(self, packges: Iterable[Packge] = ()) -> None:
+        self.weights = array("i")
+        self.values = array("d")
+        self.transport_costs = array("d")
+        self.extend(packges)
+
+    def append(self, packge: Packge) -> None:
+        """
+        Appends a package to the end of the store.
+        """
+        self.weights.append(packge.weight)
+        self.values.append(packge.value)
+        self.transport_costs.append(packge.transport_cost)
+
+    def extend(self, packges: Iterable[Packge]) -> None:
+        """
+        Appends every package of `packges` to the end of the store.
+        """
+        packges = list(packges)
+        self.weights.extend([packge.weight for packge in packges])
+        self.values.extend([packge.value for packge in packges])
+        self.transport_costs.extend([packge.transport_cost for packge in packges])
+
+    def pop(self, index: int = -1) -> Packge:
+        """
+        Removes the package at `index` (the last one by default) and returns it as a `Packge`.
+        """
+        weight = self.weights.pop(index)
+        value = self.values.pop(index)
+        self.transport_costs.pop(index)
+        return Packge(weight, value)
+
+    def __setitem__(self, index: int, packge: Packge) -> None:
+        self.weights[index] = packge.weight
+        self.values[index] = packge.value
+        self.transport_costs[index] = packge.transport_cost
+
+    def __delitem__(self, index) -> None:
+        del self.weights[index]
+        del self.values[index]
+        del self.transport_costs[index]
+
+    def clear(self) -> None:
+        """
+        Removes every package from the store.
+        """
+        del self.weights[:]
+        del self.values[:]
+        del self.transport_costs[:]
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def __getitem__(self, index: int) -> PackgeView:
+        if index < 0:
+            index += len(self.weights)
+        if not 0 <= index < len(self.weights):
+            raise IndexError("ColumnarStore index out of range")
+        return PackgeView(self, index)
+
+    def __iter__(self) -> Iterator[PackgeView]:
+        for index in range(len(self.weights)):
+            yield PackgeView(self, index)
+
+    def __repr__(self) -> str:
+        return f"ColumnarStore({len(self)} pacotes)"
@@ -0,0 +1,115 @@
+import os
+import re
+from typing import Dict, Iterator, List, Tuple
+
+
+PLACEHOLDER_PATTERN = re.compile(r"%\s*(.*?)\s*%", re.MULTILINE)
+
+_cache: Dict[str, Tuple[Tuple[int, int], "Template"]] = {}
+
+
+class Template:
+    """
+    A template compiled into literal and slot segments.
+
+    The `% name %` placeholders are located once by `compile_template`. Rendering copies the
+    segment list, fills each slot with `str(parameters[name])` and joins everything in a single
+    `''.join`, instead of running one full-string `str.replace` per placeholder.
+
+    Attributes
+    ----------
+    segments : List[str]
+        The literal text of the template, with an empty entry where each slot goes.
+    slots : List[Tuple[int, str]]
+        The position in `segments` and the parameter name of each placeholder.
+    """
+
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, segments: List[str], slots: List[Tuple[int, str]]) -> None:
+        self.segments = segments
+        self.slots = slots
+
+    def render(self, parameters: dict) -> str:
+        """
+        Renders the template with the given parameters.
+
+        Parameters
+        ----------
+        parameters : dict
+            The value of each placeholder, converted with `str`.
+
+        Returns
+        -------
+        str
+            The rendered text.
+
+        Raises
+        ------
+        KeyError
+            If a placeholder has no value in `parameters`.
+        """
+        parts = self.segments.copy()
+        for position, name in self.slots:
+            parts[position] = str(parameters[name])
+        return "".join(parts)
+
+    def stream(self, parameters: dict) -> Iterator[str]:
+        """
+        Renders the template chunk by chunk.
+
+        Parameters whose value is an iterator are consumed and each of their chunks is yielded
+        as is, so a large value (a chart series, a table) never has to exist as one string.
+        Other values are converted with `str`, as in `render`.
+
+        Raises
+        ------
+        KeyError
+            If a placeholder has no value in `parameters`.
+        """
+        names = dict(self.slots)
+        for position, segment in enumerate(self.segments):
+            name = names.get(position)
+            if name is None:
+                if segment:
+                    yield segment
+                continue
+            value = parameters[name]
+            if isinstance(value, Iterator):
+                yield from value
+            else:
+                yield str(value)
+
+
+def compile_template(text: str) -> Template:
+    """
+    Parses the `% name %` placeholders of `text` into a `Template`.
+    """
+    segments: List[str] = []
+    slots: List[Tuple[int, str]] = []
+    last = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        segments.append(text[last:match.start()])
+        slots.append((len(segments), match.group(1)))
+        segments.append("")
+        last = match.end()
+    segments.append(text[last:])
+    return Template(segments, slots)
+
+
+def load_template(path: str) -> Template:
+    """
+    Returns the compiled template stored at `path`.
+
+    Compiled templates are cached by path and modification time (plus size), so the file is
+    only read and parsed again after it changes on disk.
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with open(path, "r") as f:
+        template = compile_template(f.read())
+    _cache[path] = (version, template)
+    return template
@@ -0,0 +1,93 @@
+from typing import Any, Deque, List, Optional, Tuple
+
+from core.stop import Stop
+
+
+class Savepoint:
+    """
+    The state of a truck at the start of a stop transaction, and what changed since.
+
+    Packages loaded during the transaction are only appended after `mark`, so undoing them is
+    a truncation of the storage. Only the packages unloaded from below `mark` are copied, in
+    `removed`, and the running totals are restored from the saved values instead of being
+    recomputed. Rolling back therefore costs O(packages touched by the stop), whatever the
+    size of the load.
+
+    Attributes
+    ----------
+    version : int
+        The mutation counter of the truck when the transaction began.
+    end_version : Optional[int]
+        The mutation counter when the transaction was committed.
+    stop : Stop
+        The stop of the transaction.
+    opened_stop : bool
+        Indicates if the transaction opened its stop, rather than joining an open one.
+    stop_sizes : Tuple[int, int, int]
+        The added and removed counts and the weight delta of the stop when it began.
+    stops : int
+        The `Truck.stops` counter when the transaction began.
+    mark : int
+        The number of loaded packages when the transaction began.
+    low : int
+        The lowest number of loaded packages reached during the transaction.
+    removed : List
+        The packages unloaded from below `mark`, in unloading order.
+    removed_ids : List[int]
+        The IDs of the packages in `removed`.
+    next_id : int
+        The ID the truck would give to the next loaded package when the transaction began.
+    totals : Tuple[int, int, float, float]
+        `current_capacity`, `total_weight`, `total_value` and `total_transport_cost`.
+    extremes : Tuple[Optional[float], Optional[float], int]
+        The per-stop package count extremes (min, max, count).
+    pending : Deque
+        A copy of the queued packages.
+    operations : List[Tuple[str, Any]]
+        The mutations applied during the transaction, replayed by a redo: ("insert", packages),
+        ("remove", count) or ("remove_id", packge_id).
+    packages_at_stop : Optional[int]
+        The package count the stop was committed with.
+    pending_after : Optional[Deque]
+        A copy of the queued packages when the transaction was committed.
+    """
+
+    __slots__ = (
+        "version", "end_version", "stop", "opened_stop", "stop_sizes", "stops", "mark", "low",
+        "removed", "removed_ids", "next_id", "totals", "extremes", "pending", "operations",
+        "packages_at_stop", "pending_after",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        stop: Stop,
+        opened_stop: bool,
+        stops: int,
+        mark: int,
+        next_id: int,
+        totals: Tuple[int, int, float, float],
+        extremes: Tuple[Optional[float], Optional[float], int],
+        pending: Deque,
+    ) -> None:
+        self.version = version
+        self.end_version: Optional[int] = None
+        self.stop = stop
+        self.opened_stop = opened_stop
+        self.stop_sizes = (len(stop.added), len(stop.removed), stop.weight_delta)
+        self.stops = stops
+        self.mark = mark
+        self.low = mark
+        self.removed: List = []
+        self.removed_ids: List[int] = []
+        self.next_id = next_id
+        self.totals = totals
+        self.extremes = extremes
+        self.pending = pending
+        self.operations: List[Tuple[str, Any]] = []
+        self.packages_at_stop: Optional[int] = None
+        self.pending_after: Optional[Deque] = None
+
+    def __repr__(self) -> str:
+        return (f"Savepoint(stop={self.stop.index}, mark={self.mark}, low={self.low}, "
+                f"operations={len(self.operations)})")
@@ -1,9 +1,48 @@
-import re
-from datetime import datetime
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from functools import lru_cache
+from math import isclose
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from core.decorators import day_started_required, are_there_packges_in_the_truck
+from core.decorators import (
+    DAY_NOT_STARTED_MESSAGE,
+    NO_PACKAGES_MESSAGE,
+    REFUSAL_MESSAGES,
+    are_there_packges_in_the_truck,
+    day_started_required,
+    instrumented,
+)
+from core.slots import SlotIndex
+from core.stats import Extremes, SortedCounter
+from core.stop import Stop
+from core.transaction import Savepoint
+
+if TYPE_CHECKING:
+    from core.journal import Journal
+    from core.report import ReportSnapshot
+
+
+DAY_ALREADY_STARTED_MESSAGE = "Você já começou dia!"
+
+PACKAGE_REJECTED_MESSAGE = "Pacote excede o peso máximo"
+PACKAGE_QUEUED_MESSAGE = "Pacote na fila de espera"
+PACKAGE_NOT_FOUND_MESSAGE = "Pacote não encontrado"
+ADMISSION_MODES = ("allow", "reject", "queue")
+NO_TRANSACTION_MESSAGE = "Nenhuma parada em transação"
+TRANSACTION_OPEN_MESSAGE = "Já existe uma parada em transação"
+
+TRANSPORT_COST_PER_KG = 1.50
+INSURANCE_RATE = 0.8
+INSURANCE_VOLUME_FACTOR = 10
+
+
+@lru_cache(maxsize=4096)
+def packge_label(weight: int) -> str:
+    """
+    Returns the label "|{weight}Kg|" of a package, formatted once per distinct weight.
+    """
+    return f"|{weight}Kg|"
 
 
 @dataclass
@@ -11,8 +50,12 @@ class Packge:
     """
     Represents a package with weight and value attributes.
     Provides methods for calculating transport cost and extra insurance cost.
+
+    Instances are slotted, without a per-instance `__dict__`, to keep large loads small.
     """
 
+    __slots__ = ("weight", "value")
+
     weight: int
     value: float
 
@@ -20,20 +63,20 @@ class Packge:
         """
         Returns a string representation of the package in the format "|{weight}Kg|".
         """
-        return f"|{self.weight}Kg|"
+        return packge_label(self.weight)
 
     def __repr__(self) -> str:
         """
         Returns a string representation of the package in the format "|{weight}Kg|".
         """
-        return f"|{self.weight}Kg|"
+        return packge_label(self.weight)
 
     @property
     def transport_cost(self) -> float:
         """
         Calculates and returns the transport cost of the package based on its weight.
         """
-        return self.weight * 1.50
+        return self.weight * TRANSPORT_COST_PER_KG
 
     def extra_insurance_cost(self, truck_volume: int) -> float:
         """
@@ -41,10 +84,144 @@ class Packge:
         """
         return (
             (self.weight - truck_volume) *
-            0.8 if truck_volume * 10 < self.weight else 0
+            INSURANCE_RATE if truck_volume * INSURANCE_VOLUME_FACTOR < self.weight else 0
         )
 
 
+class SharedPackge(Packge):
+    """
+    An immutable and hashable `Packge`, safe to share between many loads.
+
+    Instances are handed out by `PackgeCache`, so identical weight/value pairs are stored once.
+    Assigning an attribute raises `AttributeError`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, weight: int, value: float) -> None:
+        object.__setattr__(self, "weight", weight)
+        object.__setattr__(self, "value", value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"SharedPackge é imutável: {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"SharedPackge é imutável: {name}")
+
+    def __hash__(self) -> int:
+        return hash((self.weight, self.value))
+
+
+class PackgeCache:
+    """
+    A flyweight cache of `SharedPackge` instances keyed by weight and value.
+
+    Loads where most parcels share a handful of standard weights and values hold one instance
+    per distinct pair instead of one per parcel. Once `maxsize` pairs are cached, new pairs are
+    returned uncached.
+
+    Example Usage:
+        cache = PackgeCache()
+        truck.insert_packages(cache.get(weight, value) for weight, value in rows)
+    """
+
+    __slots__ = ("maxsize", "_packges")
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._packges: Dict[Tuple[int, float], SharedPackge] = {}
+
+    def get(self, weight: int, value: float) -> SharedPackge:
+        """
+        Returns the shared package with the given weight and value.
+        """
+        key = (weight, value)
+        packge = self._packges.get(key)
+        if packge is None:
+            packge = SharedPackge(weight, value)
+            if len(self._packges) < self.maxsize:
+                self._packges[key] = packge
+        return packge
+
+    def clear(self) -> None:
+        """
+        Forgets every cached package.
+        """
+        self._packges.clear()
+
+    def __len__(self) -> int:
+        return len(self._packges)
+
+
+packge_cache = PackgeCache()
+
+
+class PackageLabels:
+    """
+    A lazy, read-only view of the labels of the packages in a load.
+
+    Labels are formatted only when read, and the view follows later changes of the load.
+    It compares equal to, and prints like, the equivalent list of strings.
+    """
+
+    __slots__ = ("_load_list",)
+
+    def __init__(self, load_list) -> None:
+        self._load_list = load_list
+
+    def __len__(self) -> int:
+        return len(self._load_list)
+
+    def __getitem__(self, index: int) -> str:
+        return packge_label(self._load_list[index].weight)
+
+    def __iter__(self) -> Iterator[str]:
+        for packge in self._load_list:
+            yield packge_label(packge.weight)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, PackageLabels)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    __str__ = __repr__
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of a bulk operation on a truck.
+
+    Attributes
+    ----------
+    ok : bool
+        Indicates if the operation was applied.
+    count : int
+        The number of packages inserted or removed.
+    total_weight : int
+        The total weight of the packages inserted or removed.
+    total_value : float
+        The total value of the packages inserted or removed.
+    message : str
+        A message describing the outcome.
+    rejected : int
+        The number of packages refused (or queued) by the weight admission.
+    first_id : int
+        The ID of the first inserted package; the others follow in order. 0 when none was.
+    """
+
+    ok: bool
+    count: int = 0
+    total_weight: int = 0
+    total_value: float = 0.0
+    message: str = ""
+    rejected: int = 0
+    first_id: int = 0
+
+
 @dataclass
 class Truck:
     """
@@ -61,11 +238,46 @@ class Truck:
     current_capacity : int
         The current capacity of the truck.
     load_list : List[Packge]
-        The list of packages loaded in the truck.
+        The list of packages loaded in the truck. A `core.store.ColumnarStore` can be passed
+        instead to keep the packages in packed arrays.
     stops : int
         The number of stops made by the truck.
     qtd_packages_by_stop : List[int]
         The list of quantities of packages at each stop.
+    stop_records : List[Stop]
+        The closed stops, with the packages loaded and unloaded at each one.
+    current_stop : Optional[Stop]
+        The stop opened by `begin_stop` and not closed yet.
+    check_consistency : bool
+        When enabled, every `situation` call recomputes the running totals from scratch
+        and raises `RuntimeError` if they diverge.
+    total_weight : int
+        Running total of the weight of the loaded packages.
+    total_value : float
+        Running total of the value of the loaded packages.
+    total_transport_cost : float
+        Running total of the transport cost of the loaded packages.
+    weight_index : SortedCounter
+        Order statistics (min, max, percentiles) of the loaded package weights.
+    transport_cost_index : SortedCounter
+        Order statistics of the loaded package transport costs.
+    stop_extremes : Extremes
+        Smallest and largest number of packages loaded at a closed stop.
+    journal : Optional[Journal]
+        The write-ahead log that records every mutation, attached with `Journal.attach`.
+    admission : str
+        What happens to a package that would exceed `max_weight_setted`: "allow" loads it
+        anyway, "reject" refuses it and "queue" keeps it in `pending`.
+    pending : Deque[Packge]
+        The packages queued by the "queue" admission, loaded later by `admit_pending`.
+    history_size : int
+        The number of committed stop transactions kept for `undo_stop`, and of undone ones
+        kept for `redo_stop`.
+    transaction : Optional[Savepoint]
+        The savepoint of the stop transaction opened by `begin_transaction`.
+    package_ids : SlotIndex
+        The stable ID of each loaded package, used by `find_package`, `remove_package_by_id`
+        and the stop records.
     """
 
     max_weight_setted: int = 0
@@ -75,6 +287,62 @@ class Truck:
     load_list: List[Packge] = field(default_factory=list)
     stops: int = 0
     qtd_packages_by_stop: List[int] = field(default_factory=list)
+    check_consistency: bool = False
+    total_weight: int = field(default=0, init=False)
+    total_value: float = field(default=0.0, init=False)
+    total_transport_cost: float = field(default=0.0, init=False)
+    weight_index: SortedCounter = field(default_factory=SortedCounter, init=False, repr=False)
+    transport_cost_index: SortedCounter = field(
+        default_factory=SortedCounter, init=False, repr=False)
+    stop_extremes: Extremes = field(default_factory=Extremes, init=False, repr=False)
+    journal: Optional["Journal"] = field(default=None, init=False, repr=False, compare=False)
+    admission: str = "allow"
+    pending: Deque[Packge] = field(default_factory=deque, init=False, repr=False)
+    stop_records: List[Stop] = field(default_factory=list, init=False, repr=False)
+    current_stop: Optional[Stop] = field(default=None, init=False, repr=False)
+    history_size: int = 20
+    transaction: Optional[Savepoint] = field(default=None, init=False, repr=False)
+    undo_history: Deque[Savepoint] = field(default_factory=deque, init=False, repr=False)
+    redo_history: Deque[Savepoint] = field(default_factory=deque, init=False, repr=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    package_ids: SlotIndex = field(default_factory=SlotIndex, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Initialises the running totals and the indexes from the packages already in `load_list`
+        and the stops already in `qtd_packages_by_stop`.
+        """
+        if self.admission not in ADMISSION_MODES:
+            raise ValueError(f"Modo de admissão inválido: {self.admission}")
+        self.total_weight = sum(self._weights())
+        self.total_value = sum(self._values())
+        self.total_transport_cost = sum(self._transport_costs())
+        self.weight_index = SortedCounter(self._weights())
+        self.transport_cost_index = SortedCounter(self._transport_costs())
+        self.stop_extremes = Extremes(self.qtd_packages_by_stop)
+        self.undo_history = deque(maxlen=self.history_size)
+        self.redo_history = deque(maxlen=self.history_size)
+        self.package_ids = SlotIndex(len(self.load_list))
+
+    def verify_totals(self) -> None:
+        """
+        Recomputes the totals from `load_list` and compares them with the running totals.
+
+        Raises
+        ------
+        RuntimeError
+            If any running total differs from the recomputed value.
+        """
+        expected = {
+            "total_weight": sum(self._weights()),
+            "total_value": sum(self._values()),
+            "total_transport_cost": sum(self._transport_costs()),
+        }
+        for name, value in expected.items():
+            current = getattr(self, name)
+            if not isclose(current, value, rel_tol=1e-9, abs_tol=1e-6):
+                raise RuntimeError(
+                    f"Total inconsistente em {name}: {current} (esperado {value})")
 
     def start_day(self, volume: int, weight: int) -> str:
         """
@@ -93,13 +361,47 @@ class Truck:
             A message indicating if the day was successfully started.
         """
         if self.current_day:
-            return "Você já começou dia!"
+            return DAY_ALREADY_STARTED_MESSAGE
         else:
             self.max_weight_setted = weight
             self.volume = volume
             self.current_day = True
+            if self.journal is not None:
+                self.journal.append("start_day", volume=volume, weight=weight)
             return "Começando dia"
 
+    def _weights(self) -> Iterable[int]:
+        """
+        Returns the weights of the loaded packages, reading the packed column when the
+        `load_list` is a columnar store.
+        """
+        column = getattr(self.load_list, "weights", None)
+        if column is not None:
+            return column
+        return (packge.weight for packge in self.load_list)
+
+    def _values(self) -> Iterable[float]:
+        """
+        Returns the values of the loaded packages.
+        """
+        column = getattr(self.load_list, "values", None)
+        if column is not None:
+            return column
+        return (packge.value for packge in self.load_list)
+
+    def _transport_costs(self) -> Iterable[float]:
+        """
+        Returns the transport costs of the loaded packages.
+        """
+        column = getattr(self.load_list, "transport_costs", None)
+        if column is not None:
+            return column
+        return (packge.transport_cost for packge in self.load_list)
+
+    @instrumented(
+        "insert_package",
+        REFUSAL_MESSAGES | {PACKAGE_REJECTED_MESSAGE, PACKAGE_QUEUED_MESSAGE},
+    )
     @day_started_required
     def insert_package(self, packge: Packge) -> str:
         """
@@ -113,38 +415,669 @@ class Truck:
         Returns
         -------
         str
-            A message indicating if the package was successfully inserted.
+            A message indicating if the package was inserted, rejected or queued.
         """
+        if not self._admits(packge.weight):
+            if self.admission == "queue":
+                self.pending.append(packge)
+                if self.journal is not None:
+                    self.journal.append(
+                        "queue_packages", packages=[[packge.weight, packge.value]])
+                return PACKAGE_QUEUED_MESSAGE
+            return PACKAGE_REJECTED_MESSAGE
+        self._record("insert", [packge])
         self.load_list.append(packge)
+        packge_ids = self.package_ids.load(len(self.load_list) - 1, 1)
+        if self.current_stop is not None:
+            self.current_stop.record_added(packge_ids, packge.weight)
         self.current_capacity += packge.weight
+        self.total_weight += packge.weight
+        self.total_value += packge.value
+        self.total_transport_cost += packge.transport_cost
+        self.weight_index.add(packge.weight)
+        self.transport_cost_index.add(packge.transport_cost)
+        if self.journal is not None:
+            self.journal.append("insert_package", weight=packge.weight, value=packge.value)
         return "Pacote inserido"
 
+    @instrumented("remove_package")
     @day_started_required
     @are_there_packges_in_the_truck
     def remove_package(self) -> str:
         """
-        Removes the last package inserted into the truck.
+        Removes the package at the end of the load, the last one inserted unless packages were
+        removed by ID since.
         
         Returns
         -------
         str
             A message indicating if the package was successfully removed.
         """
-        self.load_list.pop()
+        loaded = len(self.load_list)
+        self._record("remove", 1)
+        self._save_removed(loaded - 1, loaded)
+        packge = self.load_list.pop()
+        packge_ids = self.package_ids.truncate(loaded, loaded - 1)
+        if self.current_stop is not None:
+            self.current_stop.record_removed(packge_ids, packge.weight)
+        self.current_capacity -= packge.weight
+        self.total_weight -= packge.weight
+        self.total_value -= packge.value
+        self.total_transport_cost -= packge.transport_cost
+        self.weight_index.remove(packge.weight)
+        self.transport_cost_index.remove(packge.transport_cost)
+        if self.journal is not None:
+            self.journal.append("remove_package")
+        return "Pacote removido"
+
+    @instrumented("remove_package_by_id", REFUSAL_MESSAGES | {PACKAGE_NOT_FOUND_MESSAGE})
+    @day_started_required
+    @are_there_packges_in_the_truck
+    def remove_package_by_id(self, packge_id: int) -> str:
+        """
+        Removes the package `packge_id`, wherever it is in the load.
+
+        The last package of the load takes the emptied slot (swap-remove), so the removal costs
+        O(1) amortised whatever the size of the load. Inside a stop transaction, the packages
+        loaded before the transaction between that slot and the end of the load are copied
+        once, so `rollback` can put them back in order.
+
+        Parameters
+        ----------
+        packge_id : int
+            The ID of the package, as returned by `last_package_id` or `BatchResult.first_id`.
+
+        Returns
+        -------
+        str
+            A message indicating if the package was removed or not found.
+        """
+        load_list = self.load_list
+        loaded = len(load_list)
+        slot = self.package_ids.slot(packge_id, loaded)
+        if slot is None:
+            return PACKAGE_NOT_FOUND_MESSAGE
+        self._record("remove_id", packge_id)
+        self._save_removed(slot, loaded)
+        packge = load_list[slot]
+        weight = packge.weight
+        value = packge.value
+        transport_cost = packge.transport_cost
+        if slot != loaded - 1:
+            load_list[slot] = load_list[loaded - 1]
+        load_list.pop()
+        self.package_ids.swap_remove(slot, loaded)
+        if self.current_stop is not None:
+            self.current_stop.record_removed((packge_id,), weight)
+        self.current_capacity -= weight
+        self.total_weight -= weight
+        self.total_value -= value
+        self.total_transport_cost -= transport_cost
+        self.weight_index.remove(weight)
+        self.transport_cost_index.remove(transport_cost)
+        if self.journal is not None:
+            self.journal.append("remove_package_id", id=packge_id)
         return "Pacote removido"
 
+    def find_package(self, packge_id: int) -> Optional[Packge]:
+        """
+        Returns the loaded package `packge_id`, or None if it is not in the truck.
+
+        The package is detached from the load (see `_package_at`), so it stays the same after
+        other packages are removed by ID.
+        """
+        slot = self.package_ids.slot(packge_id, len(self.load_list))
+        return None if slot is None else self._package_at(slot)
+
+    def _package_at(self, slot: int) -> Packge:
+        """
+        Returns the package in `slot` as a `Packge`. A columnar store row is copied, as its
+        `PackgeView` follows the slot, which a swap-remove gives to another package.
+        """
+        packge = self.load_list[slot]
+        return packge if isinstance(packge, Packge) else Packge(packge.weight, packge.value)
+
     @property
+    def last_package_id(self) -> int:
+        """
+        The ID given to the last package loaded, or 0 before the first one.
+        """
+        return self.package_ids.next_id - 1
+
+    @property
+    def remaining_weight(self) -> int:
+        """
+        The weight that can still be loaded before reaching `max_weight_setted`.
+        """
+        return self.max_weight_setted - self.total_weight
+
+    def _admits(self, weight: int) -> bool:
+        """
+        Checks whether a package of `weight` kg passes the weight admission.
+        """
+        return self.admission == "allow" or weight <= self.remaining_weight
+
+    def insert_packages(self, packges: Iterable[Packge]) -> BatchResult:
+        """
+        Inserts many packages into the truck at once.
+
+        The day state is validated once, the storage is extended in bulk and the capacity,
+        running totals and indexes are updated in a single pass over the packages. With a
+        weight admission, packages are admitted in order while they fit and the others are
+        rejected or queued.
+
+        Parameters
+        ----------
+        packges : Iterable[Packge]
+            The packages to be inserted, in loading order.
+
+        Returns
+        -------
+        BatchResult
+            The number, weight and value of the inserted packages.
+        """
+        if not self.current_day:
+            return BatchResult(False, message=DAY_NOT_STARTED_MESSAGE)
+        packges = list(packges)
+        refused = 0
+        if self.admission != "allow":
+            packges, refused_packges = self._split_admitted(packges)
+            refused = len(refused_packges)
+            if self.admission == "queue" and refused_packges:
+                self.pending.extend(refused_packges)
+                if self.journal is not None:
+                    self.journal.append(
+                        "queue_packages",
+                        packages=[[packge.weight, packge.value] for packge in refused_packges],
+                    )
+        self._record("insert", packges)
+        start = len(self.load_list)
+        self.load_list.extend(packges)
+        packge_ids = self.package_ids.load(start, len(packges))
+        total_weight = 0
+        total_value = 0.0
+        total_transport_cost = 0.0
+        add_weight = self.weight_index.add
+        add_transport_cost = self.transport_cost_index.add
+        for packge in packges:
+            transport_cost = packge.transport_cost
+            total_weight += packge.weight
+            total_value += packge.value
+            total_transport_cost += transport_cost
+            add_weight(packge.weight)
+            add_transport_cost(transport_cost)
+        if self.current_stop is not None:
+            self.current_stop.record_added(packge_ids, total_weight)
+        self.current_capacity += total_weight
+        self.total_weight += total_weight
+        self.total_value += total_value
+        self.total_transport_cost += total_transport_cost
+        if self.journal is not None:
+            self.journal.append(
+                "insert_packages",
+                packages=[[packge.weight, packge.value] for packge in packges],
+            )
+        return BatchResult(
+            True, len(packges), total_weight, total_value, "Pacotes inseridos", refused,
+            packge_ids.start if packges else 0)
+
+    def _split_admitted(self, packges: List[Packge]):
+        """
+        Splits `packges` into the ones that fit the remaining weight, in order, and the others.
+        """
+        admitted = []
+        refused = []
+        remaining = self.remaining_weight
+        for packge in packges:
+            if packge.weight <= remaining:
+                admitted.append(packge)
+                remaining -= packge.weight
+            else:
+                refused.append(packge)
+        return admitted, refused
+
+    def admit_pending(self, time_budget: float = 0.05) -> BatchResult:
+        """
+        Loads the most valuable subset of the queued packages that fits the remaining weight.
+
+        The subset is chosen by `core.packing.select_packages`; the packages left out stay in
+        `pending`.
+
+        Parameters
+        ----------
+        time_budget : float
+            The maximum time, in seconds, spent searching for the subset.
+
+        Returns
+        -------
+        BatchResult
+            The number, weight and value of the loaded packages.
+        """
+        from core.packing import select_packages
+
+        if not self.current_day:
+            return BatchResult(False, message=DAY_NOT_STARTED_MESSAGE)
+        candidates = list(self.pending)
+        chosen = sorted(select_packages(candidates, self.remaining_weight, time_budget))
+        admitted = set(chosen)
+        self.pending = deque(
+            packge for index, packge in enumerate(candidates) if index not in admitted)
+        if self.journal is not None and chosen:
+            self.journal.append("admit_pending", indices=chosen)
+        return self.insert_packages(candidates[index] for index in chosen)
+
+    def remove_packages(self, count: int) -> BatchResult:
+        """
+        Removes the last `count` packages of the load at once.
+
+        Nothing is removed if the truck holds fewer than `count` packages.
+
+        Parameters
+        ----------
+        count : int
+            The number of packages to be removed.
+
+        Returns
+        -------
+        BatchResult
+            The number, weight and value of the removed packages.
+        """
+        if not self.current_day:
+            return BatchResult(False, message=DAY_NOT_STARTED_MESSAGE)
+        if count < 0:
+            return BatchResult(False, message="Quantidade de pacotes inválida")
+        loaded = len(self.load_list)
+        if loaded == 0:
+            return BatchResult(False, message=NO_PACKAGES_MESSAGE)
+        if count > loaded:
+            return BatchResult(False, message=f"Há apenas {loaded} pacotes no caminhão")
+        self._record("remove", count)
+        self._save_removed(loaded - count, loaded)
+        total_weight = 0
+        total_value = 0.0
+        total_transport_cost = 0.0
+        remove_weight = self.weight_index.remove
+        remove_transport_cost = self.transport_cost_index.remove
+        for index in range(loaded - count, loaded):
+            packge = self.load_list[index]
+            transport_cost = packge.transport_cost
+            total_weight += packge.weight
+            total_value += packge.value
+            total_transport_cost += transport_cost
+            remove_weight(packge.weight)
+            remove_transport_cost(transport_cost)
+        del self.load_list[loaded - count:]
+        packge_ids = self.package_ids.truncate(loaded, loaded - count)
+        if self.current_stop is not None:
+            self.current_stop.record_removed(packge_ids, total_weight)
+        self.current_capacity -= total_weight
+        self.total_weight -= total_weight
+        self.total_value -= total_value
+        self.total_transport_cost -= total_transport_cost
+        if self.journal is not None:
+            self.journal.append("remove_packages", count=count)
+        return BatchResult(True, count, total_weight, total_value, "Pacotes removidos")
+
+    def begin_stop(self, location: Optional[Tuple[float, float]] = None) -> Stop:
+        """
+        Opens a new stop, or returns the one already open.
+
+        `stops` is incremented once per stop, and every package loaded or unloaded until
+        `close_stop` is recorded in the returned `Stop`.
+
+        Parameters
+        ----------
+        location : Optional[Tuple[float, float]]
+            The (x, y) coordinates of the stop, as ordered by `core.route.plan_route`.
+
+        Returns
+        -------
+        Stop
+            The open stop.
+        """
+        if self.current_stop is None:
+            self.version += 1
+            self.stops += 1
+            self.current_stop = Stop(len(self.stop_records) + 1, location=location)
+            if self.journal is not None:
+                self.journal.append(
+                    "begin_stop", at=self.current_stop.opened_at, location=location)
+        return self.current_stop
+
+    def close_stop(self, packages_at_stop: Optional[int] = None) -> Stop:
+        """
+        Closes the open stop and records the number of packages loaded during it.
+
+        A stop is opened first if none is open.
+
+        Parameters
+        ----------
+        packages_at_stop : Optional[int]
+            The number of packages loaded during the stop. Defaults to the number of packages
+            recorded in the stop.
+
+        Returns
+        -------
+        Stop
+            The closed stop.
+        """
+        stop = self.begin_stop()
+        if packages_at_stop is None:
+            packages_at_stop = len(stop.added)
+        self.version += 1
+        stop.close(self.total_weight)
+        self.stop_records.append(stop)
+        self.current_stop = None
+        self.qtd_packages_by_stop.append(packages_at_stop)
+        self.stop_extremes.add(packages_at_stop)
+        if self.journal is not None:
+            self.journal.append(
+                "close_stop", packages=packages_at_stop, stops=self.stops, at=stop.closed_at)
+        return stop
+
+    def _record(self, kind: str, payload) -> None:
+        """
+        Counts a mutation and, inside a stop transaction, records it for `redo_stop`.
+
+        The version advances once per package loaded or unloaded, so a journal replay that
+        groups consecutive loads reaches the same version as the live truck. Loads are recorded
+        after the admission, with the admitted packages only: the queued ones are restored
+        through `pending` and the rejected ones change nothing.
+        """
+        if kind == "insert":
+            self.version += len(payload)
+        elif kind == "remove":
+            self.version += payload
+        else:
+            self.version += 1
+        if self.transaction is not None:
+            self.transaction.operations.append((kind, payload))
+
+    def _save_removed(self, start: int, end: int) -> None:
+        """
+        Copies the packages at positions `start` to `end` that were loaded before the open
+        transaction began, before they are unloaded.
+        """
+        transaction = self.transaction
+        if transaction is None or start >= transaction.low:
+            return
+        for position in range(min(end, transaction.low) - 1, start - 1, -1):
+            transaction.removed.append(self._package_at(position))
+            transaction.removed_ids.append(self.package_ids.id_at(position))
+        transaction.low = start
+
+    def begin_transaction(self, location: Optional[Tuple[float, float]] = None) -> Stop:
+        """
+        Opens a stop transaction, opening the stop itself if none is open.
+
+        Every package loaded or unloaded until `commit` can be discarded at once by `rollback`.
+
+        Parameters
+        ----------
+        location : Optional[Tuple[float, float]]
+            The (x, y) coordinates of the stop, if it is opened by the transaction.
+
+        Returns
+        -------
+        Stop
+            The stop of the transaction.
+
+        Raises
+        ------
+        RuntimeError
+            If a transaction is already open.
+        """
+        if self.transaction is not None:
+            raise RuntimeError(TRANSACTION_OPEN_MESSAGE)
+        version = self.version
+        stops = self.stops
+        opened_stop = self.current_stop is None
+        journal, self.journal = self.journal, None
+        try:
+            stop = self.begin_stop(location)
+        finally:
+            self.journal = journal
+        extremes = self._stop_count_extremes()
+        self.transaction = Savepoint(
+            version,
+            stop,
+            opened_stop,
+            stops,
+            len(self.load_list),
+            self.package_ids.next_id,
+            (self.current_capacity, self.total_weight, self.total_value,
+             self.total_transport_cost),
+            (extremes.min, extremes.max, extremes.count),
+            deque(self.pending),
+        )
+        if self.journal is not None:
+            self.journal.append("begin_transaction", at=stop.opened_at, location=location)
+        return stop
+
+    def commit(self, packages_at_stop: Optional[int] = None) -> Stop:
+        """
+        Closes the stop of the open transaction and keeps it in the undo history.
+
+        Parameters
+        ----------
+        packages_at_stop : Optional[int]
+            The number of packages loaded during the stop, as in `close_stop`.
+
+        Returns
+        -------
+        Stop
+            The closed stop.
+
+        Raises
+        ------
+        RuntimeError
+            If no transaction is open.
+        """
+        stop = self._commit(packages_at_stop)
+        self.redo_history.clear()
+        return stop
+
+    def _commit(self, packages_at_stop: Optional[int]) -> Stop:
+        transaction = self.transaction
+        if transaction is None:
+            raise RuntimeError(NO_TRANSACTION_MESSAGE)
+        journal, self.journal = self.journal, None
+        try:
+            stop = self.close_stop(packages_at_stop)
+        finally:
+            self.journal = journal
+        transaction.end_version = self.version
+        transaction.packages_at_stop = self.qtd_packages_by_stop[-1]
+        transaction.pending_after = deque(self.pending)
+        self.transaction = None
+        self.undo_history.append(transaction)
+        if self.journal is not None:
+            self.journal.append(
+                "commit", packages=transaction.packages_at_stop, at=stop.closed_at)
+        return stop
+
+    def rollback(self) -> None:
+        """
+        Discards every change made since `begin_transaction`, including the stop if the
+        transaction opened it.
+
+        The packages loaded during the stop are truncated from the storage and only the ones
+        unloaded from the earlier load are put back, so the cost depends on the size of the
+        stop and not on the size of the load.
+
+        Raises
+        ------
+        RuntimeError
+            If no transaction is open.
+        """
+        transaction = self.transaction
+        if transaction is None:
+            raise RuntimeError(NO_TRANSACTION_MESSAGE)
+        self.transaction = None
+        self._restore(transaction)
+        if self.journal is not None:
+            self.journal.append("rollback")
+
+    def _restore(self, savepoint: Savepoint) -> None:
+        """
+        Puts the load, the running totals, the indexes and the stop back as they were at
+        `savepoint`.
+        """
+        load_list = self.load_list
+        loaded = len(load_list)
+        remove_weight = self.weight_index.remove
+        remove_transport_cost = self.transport_cost_index.remove
+        for position in range(savepoint.low, loaded):
+            packge = load_list[position]
+            remove_weight(packge.weight)
+            remove_transport_cost(packge.transport_cost)
+        del load_list[savepoint.low:]
+        self.package_ids.truncate(loaded, savepoint.low)
+        restored = savepoint.removed[::-1]
+        load_list.extend(restored)
+        self.package_ids.restore(savepoint.low, reversed(savepoint.removed_ids))
+        self.package_ids.next_id = savepoint.next_id
+        add_weight = self.weight_index.add
+        add_transport_cost = self.transport_cost_index.add
+        for packge in restored:
+            add_weight(packge.weight)
+            add_transport_cost(packge.transport_cost)
+        (self.current_capacity, self.total_weight, self.total_value,
+         self.total_transport_cost) = savepoint.totals
+        self.pending = deque(savepoint.pending)
+        self.stops = savepoint.stops
+        stop = savepoint.stop
+        if savepoint.opened_stop:
+            self.current_stop = None
+        else:
+            added, removed, weight_delta = savepoint.stop_sizes
+            del stop.added[added:]
+            del stop.removed[removed:]
+            stop.weight_delta = weight_delta
+            stop.closed_at = None
+            self.current_stop = stop
+        self.version = savepoint.version
+
+    def undo_stop(self) -> Optional[Stop]:
+        """
+        Undoes the last committed stop transaction.
+
+        Only possible while nothing else changed the truck since that stop was committed (or
+        since the stop after it was undone).
+
+        Returns
+        -------
+        Optional[Stop]
+            The undone stop, or None if there is nothing to undo.
+        """
+        if self.transaction is not None or not self.undo_history:
+            return None
+        savepoint = self.undo_history[-1]
+        if (savepoint.end_version != self.version or not self.stop_records
+                or self.stop_records[-1] is not savepoint.stop):
+            return None
+        self.undo_history.pop()
+        self.stop_records.pop()
+        self.qtd_packages_by_stop.pop()
+        self.stop_extremes.min, self.stop_extremes.max, self.stop_extremes.count = (
+            savepoint.extremes)
+        self._restore(savepoint)
+        self.redo_history.append(savepoint)
+        if self.journal is not None:
+            self.journal.append("undo_stop")
+        return savepoint.stop
+
+    def redo_stop(self) -> Optional[Stop]:
+        """
+        Applies again the last stop transaction undone by `undo_stop`.
+
+        Returns
+        -------
+        Optional[Stop]
+            The stop committed again, or None if there is nothing to redo.
+        """
+        if self.transaction is not None or not self.redo_history:
+            return None
+        savepoint = self.redo_history[-1]
+        if savepoint.version != self.version:
+            return None
+        self.redo_history.pop()
+        journal, self.journal = self.journal, None
+        try:
+            self.begin_transaction(savepoint.stop.location)
+            for kind, payload in savepoint.operations:
+                if kind == "insert":
+                    self.insert_packages(payload)
+                elif kind == "remove":
+                    self.remove_packages(payload)
+                else:
+                    self.remove_package_by_id(payload)
+            self.pending = deque(savepoint.pending_after)
+            stop = self._commit(savepoint.packages_at_stop)
+        finally:
+            self.journal = journal
+        if self.journal is not None:
+            self.journal.append("redo_stop")
+        return stop
+
+    def stop(self, index: int) -> Stop:
+        """
+        Returns the closed stop number `index`, starting at 1.
+
+        Raises
+        ------
+        IndexError
+            If there is no closed stop with that number.
+        """
+        if not 1 <= index <= len(self.stop_records):
+            raise IndexError(f"Parada inexistente: {index}")
+        return self.stop_records[index - 1]
+
+    def stop_packages(self, index: int) -> list:
+        """
+        Returns the packages loaded at stop `index` that are still in the truck.
+
+        Only the IDs recorded in the stop are looked up, so the cost depends on the size of
+        the stop and not on the size of the load. The packages are detached from the load, as
+        returned by `find_package`.
+        """
+        loaded = len(self.load_list)
+        packges = []
+        for packge_id in self.stop(index).added:
+            slot = self.package_ids.slot(packge_id, loaded)
+            if slot is not None:
+                packges.append(self._package_at(slot))
+        return packges
+
+    def _stop_count_extremes(self) -> Extremes:
+        """
+        Returns the per-stop package count extremes, rebuilding them if stops were appended
+        to `qtd_packages_by_stop` without going through `close_stop`.
+        """
+        if self.stop_extremes.count != len(self.qtd_packages_by_stop):
+            self.stop_extremes = Extremes(self.qtd_packages_by_stop)
+        return self.stop_extremes
+
+    @property
+    @instrumented("situation")
     @day_started_required
     def situation(self) -> dict:
         """
         Retrieves information about the truck's situation.
+
+        The totals come from the running aggregates kept by `insert_package` and
+        `remove_package`, so the call does not depend on the number of loaded packages.
         
         Returns
         -------
         dict
             A dictionary containing information about the truck's situation, including the current weight, remaining weight, maximum weight, number of loaded packages, remaining packages, maximum packages, transported value, remaining/excess value, and maximum transport cost.
         """
-        current_weight = sum(packge.weight for packge in self.load_list)
+        if self.check_consistency:
+            self.verify_totals()
+        current_weight = self.total_weight
+        total_value = self.total_value
+        total_transport_cost = self.total_transport_cost
         return {
             "Peso carregado": current_weight,
             "Peso restante": self.max_weight_setted - current_weight,
@@ -152,75 +1085,148 @@ class Truck:
             "Quantidade de pacotes carregados": len(self.load_list),
             "Quantidade de pacotes restantes": self.max_weight_setted - current_weight,
             "Quantidade de pacotes máximo": self.max_weight_setted,
-            "Valor trasportado": sum(packge.value for packge in self.load_list),
-            "Valor restante ou excedente (mostrado em negativo)": sum(
-                packge.value for packge in self.load_list
-            )
-            - sum(packge.transport_cost for packge in self.load_list),
-            "Valor padrão máximo": sum(
-                packge.transport_cost for packge in self.load_list
-            ),
+            "Valor trasportado": total_value,
+            "Valor restante ou excedente (mostrado em negativo)": total_value - total_transport_cost,
+            "Valor padrão máximo": total_transport_cost,
         }
 
     @property
+    @instrumented("packages")
     @day_started_required
     @are_there_packges_in_the_truck
-    def packages(self) -> list:
+    def packages(self) -> PackageLabels:
         """
-        Retrieves the list of packages in the truck.
+        Retrieves the labels of the packages in the truck.
         
         Returns
         -------
-        list
-            A list of packages in the truck.
+        PackageLabels
+            A lazy view of the labels of the packages in the truck.
         """
-        return [f"{packge}" for packge in self.load_list]
+        return PackageLabels(self.load_list)
 
     def finish_day(self) -> None:
         """
         Finishes the current day.
         """
         self.current_day = False
+        if self.journal is not None:
+            self.journal.append("finish_day")
 
-    @day_started_required
-    @are_there_packges_in_the_truck
-    def generate_report(self) -> None:
+    def _chart_series(self) -> Tuple[array, array]:
         """
-        Generates a report with various parameters and saves it as an HTML file.
+        Returns the weights and transport costs of the loaded packages as packed arrays,
+        copying the columns of a columnar store or reading `load_list` once otherwise.
         """
-        report_parameters = {
+        weights = getattr(self.load_list, "weights", None)
+        transport_costs = getattr(self.load_list, "transport_costs", None)
+        if weights is not None and transport_costs is not None:
+            return array("q", weights), array("d", transport_costs)
+        labels = array("q")
+        data = array("d")
+        add_label = labels.append
+        add_data = data.append
+        for packge in self.load_list:
+            add_label(packge.weight)
+            add_data(packge.transport_cost)
+        return labels, data
+
+    def report_snapshot(self, max_points: Optional[int] = None) -> "ReportSnapshot":
+        """
+        Collects the data of the day's report.
+
+        The statistics come from the truck indexes and the chart series are copied into packed
+        arrays in a single pass over the load, so the snapshot can be rendered elsewhere (for
+        example in a worker process).
+
+        Parameters
+        ----------
+        max_points : Optional[int]
+            When set, the chart series are downsampled to at most this number of points.
+
+        Returns
+        -------
+        ReportSnapshot
+            The report statistics and chart series.
+        """
+        from datetime import datetime
+
+        from core.report import ReportSnapshot, downsample
+
+        stop_extremes = self._stop_count_extremes()
+        parameters = {
             "day": datetime.now().strftime("%d_%m_%Y"),
-            "smallest_packge_weight": min(packge.weight for packge in self.load_list),
-            "largest_packge_weight": max(packge.weight for packge in self.load_list),
-            "smallest_quantity_of_packages": min(
-                self.qtd_packages_by_stop
-            ),
-            "largest_quantity_of_packages": max(
-                self.qtd_packages_by_stop
-            ),
+            "smallest_packge_weight": self.weight_index.min,
+            "largest_packge_weight": self.weight_index.max,
+            "smallest_quantity_of_packages": stop_extremes.min,
+            "largest_quantity_of_packages": stop_extremes.max,
             "smallest_quantity_total_weight": self.current_capacity - self.volume,
             "largest_quantity_total_weight": self.current_capacity,
-            "smallest_excess_weight_total": max(
-                packge.transport_cost for packge in self.load_list
-            ),
-            "largest_excess_weight_total": max(
-                packge.transport_cost for packge in self.load_list
-            ),
-            "labels": [packge.weight for packge in self.load_list],
-            "data": [packge.transport_cost for packge in self.load_list],
+            "smallest_excess_weight_total": self.transport_cost_index.max,
+            "largest_excess_weight_total": self.transport_cost_index.max,
+            "weight_p50": self.weight_index.percentile(50),
+            "weight_p95": self.weight_index.percentile(95),
+            "weight_p99": self.weight_index.percentile(99),
         }
+        labels, data = self._chart_series()
+        if max_points is not None:
+            labels, data = downsample(labels, data, max_points)
+        return ReportSnapshot(
+            parameters,
+            labels,
+            data,
+            [
+                (stop.index, len(stop.added), len(stop.removed), stop.weight_delta,
+                 stop.weight_at_close)
+                for stop in self.stop_records
+            ],
+        )
 
-        with open("src/core/report_template.html", "r") as f:
-            template = f.read()
+    @instrumented("generate_report")
+    @day_started_required
+    @are_there_packges_in_the_truck
+    def generate_report(self, format: str = "html", max_points: Optional[int] = None) -> None:
+        """
+        Generates a report with various parameters and streams it to a file.
 
-        pattern = r"%\s*(.*?)\s*%"
-        matches = re.findall(pattern, template, re.MULTILINE)
-        for match in matches:
-            template = template.replace(
-                f"% {match} %", str(report_parameters[match]))
+        Parameters
+        ----------
+        format : str
+            The report format: "html", "csv" or "jsonl".
+        max_points : Optional[int]
+            When set, the chart series are downsampled to at most this number of points.
+        """
+        from core.report import write_report
 
+        snapshot = self.report_snapshot(max_points)
         try:
-            with open(f"relatorio_{report_parameters['day']}.html", "w") as f:
-                f.write(template)
+            write_report(snapshot, format=format)
         except Exception as e:
             print(e)
+
+    def export_manifest(self, path: str) -> str:
+        """
+        Archives the loaded packages, the volume and the maximum weight in a binary manifest.
+
+        See `core.manifest` for the format.
+
+        Returns
+        -------
+        str
+            The path of the written manifest.
+        """
+        from core.manifest import export_manifest
+
+        return export_manifest(self, path)
+
+    @classmethod
+    def from_manifest(cls, path: str) -> "Truck":
+        """
+        Rebuilds a truck from a manifest written by `export_manifest`.
+
+        The manifest is memory-mapped: a package is only created when it is read, and the file
+        stays open until `load_list.close()` copies the packages into memory.
+        """
+        from core.manifest import load_manifest
+
+        return load_manifest(path)
@@ -0,0 +1,118 @@
+import builtins
+import os
+import sys
+import time
+from typing import Iterable, Optional
+
+
+CLEAR_SCREEN = "\033[2J\033[H"
+
+
+class UI:
+    """
+    The presentation interface used by `RunProgram` and `Menu`.
+
+    Every output, prompt, pause and screen clear of the interactive program goes through a `UI`,
+    so the same program can run with animations (`InteractiveUI`), without any delay (`FastUI`)
+    or silently with scripted answers (`NullUI`).
+
+    Args:
+        inputs (Optional[Iterable[str]]): Scripted answers returned by `input` instead of
+            reading the keyboard.
+    """
+
+    def __init__(self, inputs: Optional[Iterable[str]] = None) -> None:
+        self._inputs = iter(inputs) if inputs is not None else None
+
+    def print(self, *args, **kwargs) -> None:
+        """
+        Prints to the standard output.
+        """
+        builtins.print(*args, **kwargs)
+
+    def input(self, prompt: str = "") -> str:
+        """
+        Returns the next scripted answer, or reads one from the keyboard.
+        """
+        if self._inputs is not None:
+            return next(self._inputs)
+        return builtins.input(prompt)
+
+    def clear(self) -> None:
+        """
+        Clears the terminal screen.
+
+        An ANSI escape sequence is written, without spawning a shell, except on Windows, where
+        the plain console (`run.bat`) does not understand it and `cls` is run instead.
+        """
+        if os.name == "nt":
+            os.system("cls")
+            return
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Pauses so the user can read the last message.
+        """
+        time.sleep(seconds)
+
+    def animated_dots(self, duration: float, interval: float) -> None:
+        """
+        Displays animated dots for `duration` seconds, one every `interval` seconds.
+        """
+        start_time = time.time()
+
+        while time.time() - start_time < duration:
+            sys.stdout.write(".")
+            sys.stdout.flush()
+            time.sleep(interval)
+
+        print()
+
+    def terminal_width(self) -> int:
+        """
+        Returns the width of the terminal in columns.
+        """
+        import shutil
+
+        return shutil.get_terminal_size().columns
+
+
+class InteractiveUI(UI):
+    """
+    The default presentation, with animations and pauses for a human operator.
+    """
+
+
+class FastUI(UI):
+    """
+    Prints and clears like `InteractiveUI`, but without animations or pauses.
+    """
+
+    def sleep(self, seconds: float) -> None:
+        pass
+
+    def animated_dots(self, duration: float, interval: float) -> None:
+        print()
+
+
+class NullUI(UI):
+    """
+    Discards every output and never waits, for tests and scripted runs.
+    """
+
+    def print(self, *args, **kwargs) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def sleep(self, seconds: float) -> None:
+        pass
+
+    def animated_dots(self, duration: float, interval: float) -> None:
+        pass
+
+    def terminal_width(self) -> int:
+        return 80
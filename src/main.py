@@ -1,4 +1,6 @@
 
+import sys
+
 from core.core import RunProgram
 from core.truck import Truck
 from menu.menu import Menu
@@ -14,13 +16,12 @@ def main():
     - None
 
     Flow:
-    1. Create an instance of the `Truck` class.
+    1. Create an instance of the `Truck` class, the main `Menu` and a `RunProgram` for the truck.
     2. Enter a while loop that continues until the user chooses to exit.
     3. Display the main menu to the user.
     4. Get the user's choice.
-    5. Create an instance of the `RunProgram` class with the `Truck` instance as a parameter.
-    6. Call the `run` method of the `RunProgram` instance with the user's choice as a parameter.
-    7. Repeat steps 3-6 until the user chooses to exit.
+    5. Call the `run` method of the `RunProgram` instance with the user's choice as a parameter.
+    6. Repeat steps 3-5 until the user chooses to exit.
 
     Outputs:
     - Truck Manager execution
@@ -38,14 +39,152 @@ def main():
     ]
 
     truck = Truck()
+    main_menu = Menu(main_menu_list)
+    program = RunProgram(truck)
 
     while True:
-        main_menu = Menu(main_menu_list)
         opt = main_menu.run()
-        program = RunProgram(truck)
         program.run(opt)
 
 
+def run_cli(argv=None) -> int:
+    """
+    Runs the non-interactive modes of the Truck Manager, or the interactive program under
+    instrumentation when only `--metrics` or `--profile` is given.
+
+    Example Usage:
+    python src/main.py --batch day1.jsonl day2.csv --output results.jsonl
+    python src/main.py --serve 127.0.0.1:8765
+    python src/main.py --reports arquivo/*.journal --report-dir relatorios --workers 8
+    python src/main.py --metrics metricas.prom --profile sessao
+
+    Outputs:
+    - `--batch`: one JSON result per operation, written to `--output` or to the standard
+      output. Exit code 1 if any operation failed.
+    - `--serve`: a depot server answering scanners until interrupted.
+    - `--reports`: the report of every archived day, and one JSON line per day with the
+      written path and the rendering time. Exit code 1 if any day had no report.
+    - `--metrics`: the call counts, latencies and errors of the operations, written on exit
+      as JSON when the path ends in `.json` and in the Prometheus text format otherwise.
+    - `--profile`: a cProfile (`<prefix>.prof`) and tracemalloc (`<prefix>.memory.txt`)
+      capture of the whole session.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Truck Manager")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", nargs="+", metavar="ARQUIVO")
+    mode.add_argument("--serve", metavar="HOST:PORTA|unix:CAMINHO")
+    mode.add_argument("--reports", nargs="+", metavar="ARQUIVO")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--report-dir", default=".")
+    parser.add_argument("--skip-reports", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", action="store_true")
+    parser.add_argument("--report-format", choices=("html", "csv", "jsonl"), default="html")
+    parser.add_argument("--metrics", metavar="ARQUIVO", default=None)
+    parser.add_argument("--profile", metavar="PREFIXO", default=None)
+    args = parser.parse_args(argv)
+    if not (args.batch or args.serve or args.reports or args.metrics or args.profile):
+        parser.error("informe --batch, --serve, --reports, --metrics ou --profile")
+
+    if not (args.metrics or args.profile):
+        return run_mode(args)
+
+    from contextlib import nullcontext
+
+    from core.metrics import metrics, profile_session
+
+    if args.metrics:
+        metrics.enable()
+    try:
+        with profile_session(args.profile) if args.profile else nullcontext():
+            return run_mode(args)
+    finally:
+        if args.metrics:
+            metrics.write(args.metrics)
+
+
+def run_mode(args) -> int:
+    """
+    Runs the mode selected on the command line, the interactive program by default.
+    """
+    if args.reports:
+        return run_reports(
+            args.reports, args.output, args.report_dir, args.workers, args.threads,
+            args.report_format)
+    if args.serve:
+        return run_server(args.serve, args.report_dir, not args.skip_reports)
+    if args.batch:
+        return run_batch(args.batch, args.output, args.report_dir, not args.skip_reports)
+    main()
+    return 0
+
+
+def run_batch(paths, output_path, report_dir, write_reports) -> int:
+    """
+    Replays recorded days from JSON Lines or CSV files without any prompt or delay.
+    """
+    from core.batch import run_files
+
+    output = open(output_path, "w") if output_path else sys.stdout
+    try:
+        failures = run_files(paths, output, report_dir, write_reports)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+def run_reports(paths, output_path, report_dir, workers, threads, report_format) -> int:
+    """
+    Renders the reports of many archived days in a worker pool.
+    """
+    import json
+
+    from core.report_batch import render_days
+
+    output = open(output_path, "w") if output_path else sys.stdout
+    failures = 0
+    try:
+        for report in render_days(paths, report_dir, workers, threads, format=report_format):
+            failures += not report.ok
+            output.write(json.dumps({
+                "file": report.dataset,
+                "ok": report.ok,
+                "path": report.path,
+                "message": report.message,
+                "seconds": round(report.seconds, 6),
+            }, ensure_ascii=False))
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+def run_server(address, report_dir, write_reports) -> int:
+    """
+    Serves the depot line protocol on `HOST:PORT` or on `unix:PATH` until interrupted.
+    """
+    import asyncio
+
+    from core.server import DepotServer
+
+    server = DepotServer(report_dir, write_reports)
+    if address.startswith("unix:"):
+        serving = server.serve_forever(unix_path=address[len("unix:"):])
+    else:
+        host, _, port = address.rpartition(":")
+        serving = server.serve_forever(host or "127.0.0.1", int(port))
+    try:
+        asyncio.run(serving)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
     main()
\ No newline at end of file
@@ -1,41 +1,47 @@
-import shutil
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.ui import UI, InteractiveUI
 
 
 @dataclass
 class Menu:
     """
     A class representing a main menu with options.
+
+    Output and prompts go through `ui`, which defaults to the interactive terminal.
     """
 
     menu_text: list
+    ui: UI = field(default_factory=InteractiveUI)
 
     def display_menu_border(self, padding):
         """
         Display the border of the main menu.
         """
         border = "╔" + "═" * (len(max(self.menu_text)) + 2) + "╗"
-        print(" " * padding + border)
+        self.ui.print(" " * padding + border)
 
     def display_option(self, option, padding):
         """
         Display a menu option with ASCII formatting.
         """
-        print(" " * padding + f"║ {option:<15} ║")
+        self.ui.print(" " * padding + f"║ {option:<15} ║")
 
     def display_menu_footer(self, padding):
         """
         Display the footer of the main menu.
         """
         footer = "╚" + "═" * (len(max(self.menu_text)) + 2) + "╝"
-        print(" "*padding + footer)
+        self.ui.print(" "*padding + footer)
 
-    def display(self):
+    def display(self, terminal_width: Optional[int] = None):
         """
         Display the main menu with ASCII graphics.
         """
-        # Get the terminal size
-        terminal_width, _ = shutil.get_terminal_size()
+        # Get the terminal size, unless the caller already did
+        if terminal_width is None:
+            terminal_width = self.ui.terminal_width()
 
         # Calculate padding to center the text
         max_length = max(len(line) for line in self.menu_text)
@@ -58,9 +64,10 @@ class Menu:
         """
         Run the main menu and handle user input.
         """
-        self.display()
-        print("\n")
-        choice = int(input(self.center_text(
-            "[*] Escolha uma opção: ", shutil.get_terminal_size().columns))
+        terminal_width = self.ui.terminal_width()
+        self.display(terminal_width)
+        self.ui.print("\n")
+        choice = int(self.ui.input(self.center_text(
+            "[*] Escolha uma opção: ", terminal_width))
         )
         return choice